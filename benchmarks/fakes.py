@@ -0,0 +1,297 @@
+"""Local stand-ins for S3 and OpenAI used by the benchmarks
+
+Both are plain HTTP servers, so the service's real clients (boto3, the
+httpx-based AsyncS3Service and the OpenAI SDK) run unmodified against them.
+
+Run one in its own process (keeps its GIL away from a load generator):
+    python -m benchmarks.fakes s3 --port 9000 --latency 0.02
+
+Usage:
+    s3 = FakeS3Server(latency=0.02).start()
+    s3.put('Novel/Timestamps/ep001.txt', b'00:00 Intro')
+    os.environ['S3_ENDPOINT'] = s3.url
+    
+    llm = FakeOpenAIServer(latency=1.0).start()
+    os.environ['OPENAI_BASE_URL'] = llm.url
+"""
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+# Completion in the format the description_system prompt asks for
+CANNED_SECTIONS = (
+    "ABOUT:\n"
+    "A farmer inherits a cursed field and learns the old magic that keeps it alive.\n\n"
+    "WHAT_TO_EXPECT:\n"
+    "- Slow-burn progression\n- Found family\n- Crafting and village building\n\n"
+    "SUBSCRIBE:\n"
+    "Subscribe for a new chapter every day!\n\n"
+    "TAGS:\n"
+    "#audiobook #fantasy #progression #litrpg #farming"
+)
+
+
+class _Server:
+    """ThreadingHTTPServer on a free local port, served from a daemon thread"""
+    
+    handler = BaseHTTPRequestHandler
+    
+    def start(self, port: int = 0):
+        """Start serving on `port` (0 = any free port); returns self"""
+        handler = type('Handler', (self.handler,), {'fake': self})
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 1024
+        threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+    
+    def stop(self):
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+
+class _S3Handler(BaseHTTPRequestHandler):
+    """Path-style S3: ListObjectsV2, GetObject (If-None-Match), HeadObject, PutObject"""
+    
+    protocol_version = 'HTTP/1.1'
+    fake = None
+    
+    def log_message(self, *args):
+        pass
+    
+    def _reply(self, status: int, body: bytes = b'', content_type: str = 'application/xml', headers: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+    
+    def _error(self, status: int, code: str):
+        self._reply(status, f"<Error><Code>{code}</Code><Message>{code}</Message></Error>".encode())
+    
+    def _key(self) -> str:
+        # /<bucket>/<key>
+        return unquote(urlsplit(self.path).path).lstrip('/').partition('/')[2]
+    
+    def _begin(self) -> bytes:
+        """Read the request body and apply the configured latency"""
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.fake.count(self.command)
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        return body
+    
+    def do_GET(self):
+        self._begin()
+        query = dict(parse_qsl(urlsplit(self.path).query))
+        if query.get('list-type') == '2':
+            return self._list(query)
+        
+        obj = self.fake.objects.get(self._key())
+        if obj is None:
+            return self._error(404, 'NoSuchKey')
+        body, etag = obj
+        if (self.headers.get('If-None-Match') or '').strip('"') == etag:
+            return self._reply(304, headers={'ETag': f'"{etag}"'})
+        self._reply(200, body, 'text/plain', {'ETag': f'"{etag}"'})
+    
+    def do_HEAD(self):
+        self._begin()
+        obj = self.fake.objects.get(self._key())
+        if obj is None:
+            return self._reply(404)
+        self._reply(200, obj[0], 'text/plain', {'ETag': f'"{obj[1]}"'})
+    
+    def do_PUT(self):
+        body = self._begin()
+        digest = hashlib.md5(body)
+        content_md5 = self.headers.get('Content-MD5')
+        if content_md5 and base64.b64decode(content_md5) != digest.digest():
+            return self._error(400, 'BadDigest')
+        self.fake.objects[self._key()] = (body, digest.hexdigest())
+        self._reply(200, headers={'ETag': f'"{digest.hexdigest()}"'})
+    
+    def _list(self, query: dict):
+        prefix = query.get('prefix', '')
+        after = query.get('continuation-token') or query.get('start-after') or ''
+        max_keys = int(query.get('max-keys') or 1000)
+        
+        keys = sorted(key for key in list(self.fake.objects) if key.startswith(prefix) and key > after)
+        page, truncated = keys[:max_keys], len(keys) > max_keys
+        
+        contents = ''.join(
+            f"<Contents><Key>{escape(key)}</Key><Size>{len(self.fake.objects[key][0])}</Size>"
+            f"<ETag>&quot;{self.fake.objects[key][1]}&quot;</ETag></Contents>"
+            for key in page
+        )
+        token = f"<NextContinuationToken>{escape(page[-1])}</NextContinuationToken>" if truncated else ''
+        self._reply(200, (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<IsTruncated>{str(truncated).lower()}</IsTruncated>{contents}{token}</ListBucketResult>"
+        ).encode())
+
+
+class FakeS3Server(_Server):
+    """
+    In-memory S3 bucket behind a local HTTP endpoint.
+    
+    Signatures are not checked; every request sleeps `latency` seconds
+    (concurrent requests overlap, like a real object store).
+    """
+    
+    handler = _S3Handler
+    
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds added to every request
+        """
+        self.latency = latency
+        self.objects = {}  # key -> (body, md5 hex)
+        self.requests = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def url(self) -> str:
+        """Endpoint for S3_ENDPOINT (path-style)"""
+        return f"http://127.0.0.1:{self.port}"
+    
+    def put(self, key: str, body: bytes):
+        """Store an object"""
+        self.objects[key] = (body, hashlib.md5(body).hexdigest())
+    
+    def count(self, method: str):
+        """Count a request by HTTP method"""
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+
+
+class _OpenAIHandler(BaseHTTPRequestHandler):
+    """POST .../chat/completions, plain or streamed (with include_usage)"""
+    
+    protocol_version = 'HTTP/1.1'
+    fake = None
+    
+    def log_message(self, *args):
+        pass
+    
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+        self.fake.count()
+        usage = {'prompt_tokens': 600, 'completion_tokens': 150, 'total_tokens': 750}
+        
+        if not request.get('stream'):
+            if self.fake.latency:
+                time.sleep(self.fake.latency)
+            body = json.dumps({
+                'id': 'chatcmpl-benchmark',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': CANNED_SECTIONS},
+                    'finish_reason': 'stop'
+                }],
+                'usage': usage
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        
+        # Stream the canned text in ~20 chunks spread over the latency
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        
+        size = max(1, len(CANNED_SECTIONS) // 20)
+        pieces = [CANNED_SECTIONS[i:i + size] for i in range(0, len(CANNED_SECTIONS), size)]
+        for piece in pieces:
+            if self.fake.latency:
+                time.sleep(self.fake.latency / len(pieces))
+            self._event({'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]}, request)
+        self._event({'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}, request)
+        if (request.get('stream_options') or {}).get('include_usage'):
+            self._event({'choices': [], 'usage': usage}, request)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+    
+    def _event(self, chunk: dict, request: dict):
+        chunk = {
+            'id': 'chatcmpl-benchmark',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': request.get('model'),
+            **chunk
+        }
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.flush()
+
+
+class FakeOpenAIServer(_Server):
+    """
+    Chat completions endpoint returning CANNED_SECTIONS.
+    
+    A completion takes `latency` seconds; streamed ones spread it over
+    their chunks.
+    """
+    
+    handler = _OpenAIHandler
+    
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds per completion
+        """
+        self.latency = latency
+        self.completions = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def url(self) -> str:
+        """Base URL for OPENAI_BASE_URL"""
+        return f"http://127.0.0.1:{self.port}/v1"
+    
+    def count(self):
+        """Count a completion request"""
+        with self._lock:
+            self.completions += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake S3 bucket or OpenAI endpoint until interrupted')
+    parser.add_argument('service', choices=('s3', 'openai'))
+    parser.add_argument('--port', type=int, default=0, help='Port to listen on (0 = any free port)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds per request (S3) or completion (OpenAI)')
+    args = parser.parse_args()
+    
+    server = (FakeS3Server if args.service == 's3' else FakeOpenAIServer)(latency=args.latency).start(args.port)
+    print(server.url, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""HTTP load test of the API under gunicorn with the Dockerfile's worker settings
+
+Starts a fake S3 server (benchmarks.fakes, in its own process) and gunicorn
+with the exact command from the Dockerfile (bound to a local port), seeds
+jobs, prompts and descriptions, then drives a weighted mix of requests from
+--concurrency client threads:
+
+- jobs:     GET /jobs/<job_id>
+- list:     GET /descriptions/<novel>
+- preview:  GET /descriptions/<novel>/<video>
+- prompts:  GET /admin/prompts and /admin/prompts/<name>
+
+Reports p50/p95/p99 latency and requests per second per endpoint and
+overall, and writes them as JSON (compare runs with --compare).
+
+Usage:
+    python -m benchmarks.http_load
+    python -m benchmarks.http_load --duration 60 --concurrency 64 --mix jobs=70,list=10,preview=15,prompts=5
+    DATABASE_URL=postgresql://... python -m benchmarks.http_load --output after.json --compare before.json
+
+Never point it at a production database: it creates tables and inserts rows.
+"""
+import argparse
+import json
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import httpx
+
+from benchmarks.job_throughput import BUCKET, PROMPTS, TIMESTAMPS, git_commit, setup_database
+from benchmarks.status_poll import percentiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ('jobs', 'list', 'preview', 'prompts')
+STATUSES = ('completed', 'completed', 'completed', 'failed', 'processing')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds before the run')
+    parser.add_argument('--concurrency', type=int, default=32, help='Client threads')
+    parser.add_argument('--mix', default='jobs=50,list=15,preview=25,prompts=10', help='Endpoint weights')
+    parser.add_argument('--jobs', type=int, default=10_000, help='Jobs in workflow_description_state')
+    parser.add_argument('--novels', type=int, default=20, help='Novels with descriptions in S3')
+    parser.add_argument('--videos', type=int, default=100, help='Descriptions per novel')
+    parser.add_argument('--s3-latency', type=float, default=0.02, help='Seconds per fake S3 request')
+    parser.add_argument('--database-url', default=None, help='Defaults to DATABASE_URL or a local SQLite file')
+    parser.add_argument('--output', default=None, help='Results file (default http_load-<commit>.json)')
+    parser.add_argument('--compare', default=None, help='Earlier results file to compare against')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    return parser.parse_args()
+
+
+def parse_mix(value):
+    """'jobs=50,list=15' -> {'jobs': 50.0, 'list': 15.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def gunicorn_command(port):
+    """The Dockerfile's CMD, run with this interpreter and bound to a local port"""
+    with open(os.path.join(ROOT, 'Dockerfile')) as dockerfile:
+        command = next(json.loads(line[4:]) for line in dockerfile if line.startswith('CMD '))
+    
+    command[command.index('--bind') + 1] = f"127.0.0.1:{port}"
+    if command[0] == 'gunicorn':
+        command[:1] = [sys.executable, '-m', 'gunicorn']
+    return command
+
+
+def start_fake_s3(latency):
+    """Fake S3 in a child process; returns (process, url)"""
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.fakes', 's3', '--latency', str(latency)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    return process, process.stdout.readline().strip()
+
+
+def seed_descriptions(s3_url, novels, videos):
+    """PUT descriptions into the fake bucket; returns [(novel, video), ...]"""
+    body = ("Full Playlist: https://youtube.com/playlist?list=benchmark\n\n" + TIMESTAMPS * 4).encode()
+    keys = [(f"Load Novel {n}", f"Episode {v + 1:05d}") for n in range(novels) for v in range(videos)]
+    
+    with httpx.Client(base_url=s3_url) as client, ThreadPoolExecutor(max_workers=32) as pool:
+        list(pool.map(
+            lambda key: client.put(f"/{BUCKET}/{quote(f'{key[0]}/Youtube/{key[1]}.txt')}", content=body).raise_for_status(),
+            keys
+        ))
+    return keys
+
+
+def seed_jobs(count):
+    """Insert `count` jobs (once; reruns reuse them); returns sample job_ids"""
+    from sqlalchemy import func, insert, select
+    
+    from src.models.database import engine
+    from src.models.description_state import WorkflowDescriptionState
+    
+    with engine.connect() as connection:
+        existing = connection.execute(select(func.count()).select_from(WorkflowDescriptionState)).scalar()
+    
+    now = datetime.now(timezone.utc)
+    for offset in range(existing, count, 5_000):
+        with engine.begin() as connection:
+            connection.execute(insert(WorkflowDescriptionState), [
+                {
+                    'job_id': str(uuid.uuid4()),
+                    'novel_name': f"Load Novel {i}",
+                    'status': STATUSES[i % len(STATUSES)],
+                    'progress_data': {'total_videos': 100, 'descriptions_generated': 100, 'percent_complete': 100},
+                    'started_at': now,
+                    'completed_at': now,
+                    'updated_at': now,
+                    'version': 5
+                }
+                for i in range(offset, min(offset + 5_000, count))
+            ])
+    
+    with engine.connect() as connection:
+        return [
+            row.job_id for row in connection.execute(
+                select(WorkflowDescriptionState.job_id).order_by(func.random()).limit(1_000)
+            )
+        ]
+
+
+def wait_until_up(base_url, process, timeout=60):
+    """Poll /health until gunicorn answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"gunicorn exited with {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit('gunicorn did not start')
+
+
+def run_load(base_url, token, mix, job_ids, descriptions, args):
+    """Drive the mix for warmup + duration seconds; returns {endpoint: [(seconds, status), ...]}"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    novels = sorted({novel for novel, _ in descriptions})
+    samples = {name: [] for name in names}
+    lock = threading.Lock()
+    
+    measure_from = time.monotonic() + args.warmup
+    stop_at = measure_from + args.duration
+    
+    def path(name, rng):
+        if name == 'jobs':
+            return f"/jobs/{rng.choice(job_ids)}"
+        if name == 'list':
+            return f"/descriptions/{quote(rng.choice(novels))}"
+        if name == 'preview':
+            novel, video = rng.choice(descriptions)
+            return f"/descriptions/{quote(novel)}/{quote(video)}"
+        name = rng.choice((None,) + tuple(prompt_name for prompt_name, _, _ in PROMPTS))
+        return f"/admin/prompts/{name}" if name else '/admin/prompts'
+    
+    def client_loop(seed):
+        rng = random.Random(seed)
+        local = {name: [] for name in names}
+        with httpx.Client(base_url=base_url, headers={'Authorization': f"Bearer {token}"}, timeout=30) as client:
+            while True:
+                now = time.monotonic()
+                if now >= stop_at:
+                    break
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    status = client.get(path(name, rng)).status_code
+                except httpx.HTTPError:
+                    status = 0
+                elapsed = time.perf_counter() - started
+                if now >= measure_from:
+                    local[name].append((elapsed, status))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+    
+    threads = [threading.Thread(target=client_loop, args=(seed,)) for seed in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def summarize(samples, duration):
+    """Latency percentiles, throughput and errors per endpoint and overall"""
+    def summary(values):
+        if not values:
+            return {'requests': 0}
+        return {
+            'requests': len(values),
+            'rps': round(len(values) / duration, 1),
+            'errors': sum(1 for _, status in values if status == 0 or status >= 400),
+            **percentiles([seconds for seconds, _ in values])
+        }
+    
+    endpoints = {name: summary(values) for name, values in samples.items()}
+    endpoints['all'] = summary([value for values in samples.values() for value in values])
+    return endpoints
+
+
+def compare(results, baseline_path):
+    """Print the RPS and p95 change per endpoint against an earlier results file"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    
+    print(f"vs {baseline_path} ({baseline.get('commit')})")
+    for name, stats in results['endpoints'].items():
+        old = baseline['endpoints'].get(name)
+        if not old or not old.get('requests') or not stats.get('requests'):
+            continue
+        print(
+            f"  {name:<8} {old['rps']:>8.1f} -> {stats['rps']:>8.1f} rps ({(stats['rps'] / old['rps'] - 1) * 100:+.1f}%)  "
+            f"p95 {old['p95_ms']:>8.2f} -> {stats['p95_ms']:>8.2f} ms"
+        )
+
+
+def main():
+    args = parse_args()
+    mix = parse_mix(args.mix)
+    
+    s3_process, s3_url = start_fake_s3(args.s3_latency)
+    database_url = args.database_url or os.getenv('DATABASE_URL') or f"sqlite:///{os.path.abspath('http_load_benchmark.db')}"
+    token = secrets.token_hex(16)
+    os.environ.update({
+        'DATABASE_URL': database_url,
+        'S3_ENDPOINT': s3_url,
+        'S3_ACCESS_KEY_ID': 'benchmark',
+        'S3_SECRET_ACCESS_KEY': 'benchmark',
+        'S3_BUCKET_NAME': BUCKET,
+        'API_TOKEN': token
+    })
+    
+    gunicorn = None
+    log_path = os.path.abspath('http_load-gunicorn.log')
+    try:
+        print('Seeding...', file=sys.stderr)
+        dialect = setup_database()
+        job_ids = seed_jobs(args.jobs)
+        descriptions = seed_descriptions(s3_url, args.novels, args.videos)
+        
+        port = free_port()
+        command = gunicorn_command(port)
+        with open(log_path, 'w') as log_file:
+            gunicorn = subprocess.Popen(
+                command,
+                cwd=ROOT,
+                env={**os.environ, 'PYTHONPATH': ROOT},
+                stdout=log_file,
+                stderr=subprocess.STDOUT
+            )
+        base_url = f"http://127.0.0.1:{port}"
+        wait_until_up(base_url, gunicorn)
+        
+        print(f"Running {args.warmup:.0f}s warmup + {args.duration:.0f}s with {args.concurrency} clients...", file=sys.stderr)
+        samples = run_load(base_url, token, mix, job_ids, descriptions, args)
+    finally:
+        if gunicorn:
+            gunicorn.terminate()
+            gunicorn.wait(timeout=30)
+        s3_process.terminate()
+    
+    commit = git_commit()
+    results = {
+        'benchmark': 'http_load',
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'dialect': dialect,
+        'gunicorn': command[command.index('gunicorn') + 1:],
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'mix': mix,
+        's3_latency': args.s3_latency,
+        'endpoints': summarize(samples, args.duration)
+    }
+    
+    output = args.output or f"http_load-{commit or 'local'}.json"
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.concurrency} clients for {args.duration:.0f}s on {dialect}, S3 {args.s3_latency * 1000:.0f} ms/request")
+        for name, stats in results['endpoints'].items():
+            if not stats['requests']:
+                continue
+            print(
+                f"  {name:<8} {stats['rps']:>8.1f} rps  p50 {stats['p50_ms']:>8.2f} ms  "
+                f"p95 {stats['p95_ms']:>8.2f} ms  p99 {stats['p99_ms']:>8.2f} ms  errors {stats['errors']}"
+            )
+        print(f"Results written to {output} (gunicorn log: {log_path})")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""End-to-end job throughput against local S3 and OpenAI stand-ins
+
+For each novel size the benchmark uploads timestamp files to a fake S3
+bucket (benchmarks.fakes), creates jobs and runs generate_descriptions_task
+for --novels novels, --concurrency at a time (like worker slots), with the
+real S3, OpenAI and database code paths. It reports novels per minute and
+videos per second and writes the results as JSON, so runs can be compared
+between commits with --compare.
+
+Usage:
+    python -m benchmarks.job_throughput
+    python -m benchmarks.job_throughput --episodes 10,100 --engine asyncio --s3-latency 0.03
+    DATABASE_URL=postgresql://... python -m benchmarks.job_throughput --output after.json --compare before.json
+
+Never point it at a production database: it creates tables and inserts rows.
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from benchmarks.fakes import FakeOpenAIServer, FakeS3Server
+
+BUCKET = 'benchmark'
+TIMESTAMPS = '\n'.join(f"{minute // 60:02d}:{minute % 60:02d}:00 Chapter {minute + 1}" for minute in range(0, 240, 12))
+PROMPTS = (
+    ('description_system', 'system', 'Answer with ABOUT:, WHAT_TO_EXPECT:, SUBSCRIBE: and TAGS: sections.'),
+    ('full_description', 'user', 'Write the description sections for {novel_name}. Context: {novel_context}')
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--episodes', default='10,100,1000,5000', help='Comma-separated episodes per novel')
+    parser.add_argument('--novels', type=int, default=3, help='Novels (jobs) per size')
+    parser.add_argument('--concurrency', type=int, default=1, help='Jobs run at once')
+    parser.add_argument('--engine', choices=('threads', 'asyncio'), default='threads', help='JOB_ENGINE')
+    parser.add_argument('--s3-latency', type=float, default=0.02, help='Seconds per fake S3 request')
+    parser.add_argument('--llm-latency', type=float, default=1.0, help='Seconds per fake completion')
+    parser.add_argument('--database-url', default=None, help='Defaults to DATABASE_URL or a local SQLite file')
+    parser.add_argument('--output', default=None, help='Results file (default job_throughput-<commit>.json)')
+    parser.add_argument('--compare', default=None, help='Earlier results file to compare against')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    return parser.parse_args()
+
+
+def git_commit():
+    """Short commit of the checkout (suffixed -dirty if src/ has changes), if it is a git checkout"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--', 'src'], cwd=root, capture_output=True, text=True
+        ).stdout
+        return f"{commit}-dirty" if dirty.strip() else commit
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure(args, s3, llm):
+    """Point the service at the stand-ins (before src.config is imported)"""
+    os.environ.update({
+        'DATABASE_URL': args.database_url or os.getenv('DATABASE_URL') or 'sqlite:///job_throughput_benchmark.db',
+        'S3_ENDPOINT': s3.url,
+        'S3_ACCESS_KEY_ID': 'benchmark',
+        'S3_SECRET_ACCESS_KEY': 'benchmark',
+        'S3_BUCKET_NAME': BUCKET,
+        'USE_AZURE_OPENAI': 'false',
+        'OPENAI_API_KEY': 'benchmark',
+        'OPENAI_BASE_URL': llm.url,
+        'OPENAI_RATE_LIMIT_BACKEND': 'local',
+        'JOB_ENGINE': args.engine
+    })
+
+
+def setup_database():
+    """Create all tables and the prompts and template a job needs"""
+    import src.models
+    from src.models.ai_prompt import AIPrompt
+    from src.models.database import Base, engine, get_db_session
+    from src.services.template_service import DEFAULT_TEMPLATE, DEFAULT_TEMPLATE_NAME, TEMPLATE_PROMPT_TYPE
+    
+    for module in pkgutil.iter_modules(src.models.__path__):
+        importlib.import_module(f"src.models.{module.name}")
+    Base.metadata.create_all(engine)
+    
+    with get_db_session() as session:
+        for name, prompt_type, text in PROMPTS + ((DEFAULT_TEMPLATE_NAME, TEMPLATE_PROMPT_TYPE, DEFAULT_TEMPLATE),):
+            if not session.query(AIPrompt.id).filter_by(name=name, prompt_type=prompt_type).first():
+                session.add(AIPrompt(
+                    name=name,
+                    prompt_type=prompt_type,
+                    prompt_text=text,
+                    updated_at=datetime.now(timezone.utc)
+                ))
+    
+    return engine.dialect.name
+
+
+def run_size(episodes, args, s3, llm):
+    """Generate descriptions for --novels novels of `episodes` videos; returns the size's results"""
+    from src.models.database import get_db_session
+    from src.models.description_state import WorkflowDescriptionState
+    from src.services.job_service import generate_descriptions_task
+    
+    run_id = uuid.uuid4().hex[:8]
+    novels = [f"Benchmark {run_id} {episodes}x{i}" for i in range(args.novels)]
+    for novel in novels:
+        for episode in range(episodes):
+            s3.put(f"{novel}/Timestamps/Episode {episode + 1:05d}.txt", TIMESTAMPS.encode())
+    
+    jobs = {}
+    with get_db_session() as session:
+        for novel in novels:
+            jobs[novel] = str(uuid.uuid4())
+            session.add(WorkflowDescriptionState(
+                job_id=jobs[novel],
+                novel_name=novel,
+                status='pending',
+                novel_context='A cozy farming fantasy',
+                playlist_url='https://youtube.com/playlist?list=benchmark',
+                subscribe_text='Subscribe!',
+                started_at=datetime.now(timezone.utc)
+            ))
+    
+    s3_requests = sum(s3.requests.values())
+    completions = llm.completions
+    
+    def run(novel):
+        try:
+            generate_descriptions_task(
+                jobs[novel],
+                novel,
+                'A cozy farming fantasy',
+                'https://youtube.com/playlist?list=benchmark',
+                'Subscribe!'
+            )
+        except Exception:
+            # Recorded in the job's error_message; there is no queue to retry it
+            pass
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        list(pool.map(run, novels))
+    seconds = time.perf_counter() - started
+    
+    with get_db_session() as session:
+        states = session.query(
+            WorkflowDescriptionState.status,
+            WorkflowDescriptionState.progress_data,
+            WorkflowDescriptionState.job_timings,
+            WorkflowDescriptionState.error_message
+        ).filter(WorkflowDescriptionState.job_id.in_(jobs.values())).all()
+    
+    failed = [state.error_message for state in states if state.status != 'completed']
+    videos = sum((state.progress_data or {}).get('descriptions_generated', 0) for state in states)
+    timings = [state.job_timings for state in states if state.job_timings]
+    
+    def mean_of(get):
+        values = [get(timing) for timing in timings]
+        return round(statistics.fmean(values), 3) if values else None
+    
+    return {
+        'episodes': episodes,
+        'novels': len(novels),
+        'seconds': round(seconds, 3),
+        'novels_per_minute': round(len(novels) * 60 / seconds, 2),
+        'videos_per_second': round(videos / seconds, 2),
+        'videos': videos,
+        'failed_jobs': len(failed),
+        'errors': failed[:3],
+        's3_requests_per_video': round((sum(s3.requests.values()) - s3_requests) / max(1, videos), 2),
+        'completions': llm.completions - completions,
+        # Means over the jobs' job_timings
+        'job_seconds': mean_of(lambda timing: timing['total_seconds']),
+        'llm_seconds': mean_of(lambda timing: timing['stages'].get('llm', 0)),
+        'listing_seconds': mean_of(lambda timing: timing['stages'].get('listing', 0)),
+        'video_p50_seconds': mean_of(lambda timing: timing['videos']['video']['p50']),
+        'video_p95_seconds': mean_of(lambda timing: timing['videos']['video']['p95'])
+    }
+
+
+def compare(results, baseline_path):
+    """Print the videos/s change per size against an earlier results file"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    before = {size['episodes']: size for size in baseline['sizes']}
+    
+    print(f"vs {baseline_path} ({baseline.get('commit')})")
+    for size in results['sizes']:
+        old = before.get(size['episodes'])
+        if not old or not old['videos_per_second']:
+            continue
+        change = (size['videos_per_second'] / old['videos_per_second'] - 1) * 100
+        print(
+            f"  {size['episodes']:>6} episodes  {old['videos_per_second']:>9.2f} -> "
+            f"{size['videos_per_second']:>9.2f} videos/s  ({change:+.1f}%)"
+        )
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    s3 = FakeS3Server(latency=args.s3_latency).start()
+    llm = FakeOpenAIServer(latency=args.llm_latency).start()
+    configure(args, s3, llm)
+    
+    dialect = setup_database()
+    commit = git_commit()
+    results = {
+        'benchmark': 'job_throughput',
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'dialect': dialect,
+        'engine': args.engine,
+        'novels': args.novels,
+        'concurrency': args.concurrency,
+        's3_latency': args.s3_latency,
+        'llm_latency': args.llm_latency,
+        'sizes': []
+    }
+    
+    for episodes in (int(value) for value in args.episodes.split(',')):
+        print(f"{args.novels} novels x {episodes} episodes...", file=sys.stderr)
+        results['sizes'].append(run_size(episodes, args, s3, llm))
+    
+    output = args.output or f"job_throughput-{commit or 'local'}.json"
+    with open(output, 'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{results['engine']} engine on {dialect}, S3 {args.s3_latency * 1000:.0f} ms/request, "
+            f"LLM {args.llm_latency:.1f} s/completion, {args.concurrency} job(s) at a time"
+        )
+        for size in results['sizes']:
+            print(
+                f"  {size['episodes']:>6} episodes  {size['novels_per_minute']:>8.2f} novels/min  "
+                f"{size['videos_per_second']:>9.2f} videos/s  video p95 {size['video_p95_seconds']} s  "
+                f"failed {size['failed_jobs']}"
+            )
+        print(f"Results written to {output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+    
+    s3.stop()
+    llm.stop()
+
+
+if __name__ == '__main__':
+    main()
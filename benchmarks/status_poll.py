@@ -0,0 +1,189 @@
+"""Status-poll latency against a large workflow_description_state table
+
+Seeds the table with historical jobs (once; reruns reuse the rows) and times:
+
+- GET /jobs/<id> reads: the old full-row load vs the column-projected query
+- GET /novel-context/<novel>: without and with idx_description_state_novel_status_id
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.status_poll [--rows 1000000]
+    python -m benchmarks.status_poll --rows 100000   # SQLite file in the working directory
+
+Never point it at a production database: it creates tables and inserts rows.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+STATUSES = ('completed', 'completed', 'completed', 'failed', 'processing')
+INDEX_NAME = 'idx_description_state_novel_status_id'
+INDEX_DDL = (
+    f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+    "ON workflow_description_state(novel_name, status, id DESC)"
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Historical jobs in the table')
+    parser.add_argument('--novels', type=int, default=5_000, help='Distinct novel names')
+    parser.add_argument('--text-bytes', type=int, default=1_000, help='Size of each large Text column')
+    parser.add_argument('--polls', type=int, default=2_000, help='Timed requests per scenario')
+    parser.add_argument('--database-url', default=None, help='Defaults to DATABASE_URL or a local SQLite file')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    return parser.parse_args()
+
+
+def percentiles(samples):
+    """p50/p95/p99/mean in milliseconds"""
+    ordered = sorted(samples)
+    
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+    
+    return {
+        'p50_ms': round(pick(0.50), 3),
+        'p95_ms': round(pick(0.95), 3),
+        'p99_ms': round(pick(0.99), 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3)
+    }
+
+
+def timed(calls, func):
+    """Run func(arg) for every arg and return per-call seconds"""
+    samples = []
+    for arg in calls:
+        start = time.perf_counter()
+        func(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def seed(engine, WorkflowDescriptionState, rows, novels, text_bytes):
+    """Insert historical jobs until the table holds `rows`; returns sample job_ids"""
+    from sqlalchemy import func, insert, select
+    
+    with engine.connect() as connection:
+        existing = connection.execute(select(func.count()).select_from(WorkflowDescriptionState)).scalar()
+    
+    filler = 'x' * text_bytes
+    now = datetime.now(timezone.utc)
+    chunk = 5_000
+    
+    if existing < rows:
+        print(f"Seeding {rows - existing} jobs ({existing} present)...", file=sys.stderr)
+        started = time.perf_counter()
+        for offset in range(existing, rows, chunk):
+            batch = [
+                {
+                    'job_id': str(uuid.uuid4()),
+                    'novel_name': f"Novel {i % novels}",
+                    'status': STATUSES[i % len(STATUSES)],
+                    'progress_data': {'total_videos': 120, 'descriptions_generated': 120, 'percent_complete': 100},
+                    'novel_context': filler,
+                    'playlist_url': 'https://youtube.com/playlist?list=benchmark',
+                    'subscribe_text': filler[:200],
+                    'generated_about': filler,
+                    'generated_what_to_expect': filler,
+                    'generated_subscribe': filler,
+                    'generated_tags': filler[:300],
+                    'started_at': now,
+                    'completed_at': now,
+                    'updated_at': now,
+                    'version': 5
+                }
+                for i in range(offset, min(offset + chunk, rows))
+            ]
+            with engine.begin() as connection:
+                connection.execute(insert(WorkflowDescriptionState), batch)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    
+    with engine.connect() as connection:
+        return [
+            row.job_id for row in connection.execute(
+                select(WorkflowDescriptionState.job_id).order_by(func.random()).limit(1_000)
+            )
+        ]
+
+
+def main():
+    args = parse_args()
+    url = args.database_url or os.getenv('DATABASE_URL') or 'sqlite:///status_poll_benchmark.db'
+    # Must be set before src.models.database creates the engine
+    os.environ['DATABASE_URL'] = url
+    
+    from sqlalchemy import text
+    
+    from src.app import app
+    from src.config import config
+    from src.models.database import Base, SessionLocal, engine
+    from src.models.description_state import WorkflowDescriptionState
+    from src.routes.descriptions import _job_status, _load_job_status
+    
+    Base.metadata.create_all(engine, tables=[WorkflowDescriptionState.__table__])
+    job_ids = seed(engine, WorkflowDescriptionState, args.rows, args.novels, args.text_bytes)
+    with engine.begin() as connection:
+        connection.execute(text('ANALYZE workflow_description_state'))
+    
+    rng = random.Random(42)
+    poll_ids = [rng.choice(job_ids) for _ in range(args.polls)]
+    novel_names = [f"Novel {rng.randrange(args.novels)}" for _ in range(args.polls)]
+    
+    def load_full_row(job_id):
+        # Status read before column projection: every Text column is loaded
+        session = SessionLocal()
+        try:
+            state = session.query(WorkflowDescriptionState).filter_by(job_id=job_id).first()
+            return _job_status(state)
+        finally:
+            session.close()
+    
+    client = app.test_client()
+    headers = {'Authorization': f"Bearer {config.API_TOKEN}"}
+    
+    def novel_context(novel_name):
+        response = client.get(f"/novel-context/{novel_name}", headers=headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+    
+    results = {'rows': args.rows, 'polls': args.polls, 'dialect': engine.dialect.name}
+    
+    # Warm caches and connections before each measured run
+    timed(poll_ids[:100], load_full_row)
+    results['status_full_row'] = percentiles(timed(poll_ids, load_full_row))
+    timed(poll_ids[:100], _load_job_status)
+    results['status_projected'] = percentiles(timed(poll_ids, _load_job_status))
+    
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+    # Full scans are slow; fewer samples are enough
+    unindexed = novel_names[:max(20, args.polls // 50)]
+    timed(unindexed[:2], novel_context)
+    results['novel_context_no_index'] = percentiles(timed(unindexed, novel_context))
+    
+    with engine.begin() as connection:
+        connection.execute(text(INDEX_DDL))
+        connection.execute(text('ANALYZE workflow_description_state'))
+    timed(novel_names[:100], novel_context)
+    results['novel_context_indexed'] = percentiles(timed(novel_names, novel_context))
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{args.rows} jobs on {results['dialect']}")
+    for name in ('status_full_row', 'status_projected', 'novel_context_no_index', 'novel_context_indexed'):
+        stats = results[name]
+        print(
+            f"  {name:<24} p50 {stats['p50_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms  "
+            f"p99 {stats['p99_ms']:>9.3f} ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
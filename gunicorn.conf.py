@@ -0,0 +1,25 @@
+"""Gunicorn settings (loaded by the Dockerfile command)"""
+import os
+import shutil
+import tempfile
+
+# Prometheus multiprocess mode: each worker writes its samples to files in
+# this directory and /metrics sums them, whichever worker serves the scrape.
+# Set here so workers inherit it before they import prometheus_client.
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'description-service-metrics')
+)
+
+
+def on_starting(server):
+    """Start with an empty metrics directory (files from a previous run would be summed in)"""
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauge samples"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,23 @@
+-- Migration 012: Add AI section cache
+-- Created: 2026-10-16
+-- Description: Content-addressed cache of parsed AI sections so reruns with
+--              identical novel inputs, prompts and model skip the LLM call
+
+CREATE TABLE IF NOT EXISTS ai_section_cache (
+    id SERIAL PRIMARY KEY,
+    cache_key VARCHAR(64) UNIQUE NOT NULL,  -- sha256 of name, context, prompts, model
+    novel_name VARCHAR(255),
+    model VARCHAR(100),
+    
+    -- Parsed sections
+    about TEXT,
+    what_to_expect TEXT,
+    subscribe TEXT,
+    tags TEXT,
+    
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_ai_section_cache_novel ON ai_section_cache(novel_name);
+
+SELECT 'Migration 012 completed - ai_section_cache table added' AS status;
@@ -0,0 +1,31 @@
+-- Migration 013: Add durable job queue
+-- Created: 2026-10-16
+-- Description: Jobs are enqueued by the API and claimed by worker processes
+--              (python -m src.worker) with SELECT ... FOR UPDATE SKIP LOCKED
+
+CREATE TABLE IF NOT EXISTS description_job_queue (
+    id SERIAL PRIMARY KEY,
+    job_id VARCHAR(255) UNIQUE NOT NULL,  -- workflow_description_state.job_id
+    payload JSONB,  -- { force: bool, bypass_cache: bool }
+    status VARCHAR(50) NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+    
+    -- Retries
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_error TEXT,
+    
+    -- Lease held by the worker running the job
+    locked_by VARCHAR(255),
+    locked_at TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Claim scan: queued jobs by availability, running jobs by heartbeat age
+CREATE INDEX IF NOT EXISTS idx_job_queue_claim ON description_job_queue(status, available_at, id);
+CREATE INDEX IF NOT EXISTS idx_job_queue_heartbeat ON description_job_queue(status, heartbeat_at);
+
+SELECT 'Migration 013 completed - description_job_queue table added' AS status;
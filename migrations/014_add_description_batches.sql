@@ -0,0 +1,21 @@
+-- Migration 014: Add description batches
+-- Created: 2026-10-17
+-- Description: POST /generate-descriptions/batch groups jobs under a batch_id;
+--              workers run at most max_concurrency jobs of a batch at once
+
+CREATE TABLE IF NOT EXISTS description_batches (
+    id SERIAL PRIMARY KEY,
+    batch_id VARCHAR(255) UNIQUE NOT NULL,
+    total_jobs INTEGER NOT NULL DEFAULT 0,
+    max_concurrency INTEGER NOT NULL,  -- Jobs of this batch running at once
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE workflow_description_state ADD COLUMN IF NOT EXISTS batch_id VARCHAR(255);
+ALTER TABLE description_job_queue ADD COLUMN IF NOT EXISTS batch_id VARCHAR(255);
+
+-- Batch progress aggregation and the per-batch running count at claim time
+CREATE INDEX IF NOT EXISTS idx_description_state_batch ON workflow_description_state(batch_id);
+CREATE INDEX IF NOT EXISTS idx_job_queue_batch ON description_job_queue(batch_id, status);
+
+SELECT 'Migration 014 completed - description batches added' AS status;
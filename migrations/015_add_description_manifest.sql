@@ -0,0 +1,16 @@
+-- Migration 015: Add description manifest
+-- Created: 2026-10-17
+-- Description: Records the timestamp file ETag and novel-level sections hash each
+--              description was rendered from, so jobs only re-render changed videos
+
+CREATE TABLE IF NOT EXISTS description_manifest (
+    id SERIAL PRIMARY KEY,
+    novel_name VARCHAR(255) NOT NULL,
+    video_name VARCHAR(512) NOT NULL,
+    timestamp_etag VARCHAR(255),  -- ETag of <novel>/Timestamps/<video>.txt when rendered
+    sections_hash VARCHAR(64),  -- sha256 of the novel-level content the description was rendered with
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_description_manifest_video UNIQUE (novel_name, video_name)
+);
+
+SELECT 'Migration 015 completed - description_manifest table added' AS status;
@@ -0,0 +1,11 @@
+-- Migration 016: Add novel/status index on workflow_description_state
+-- Created: 2026-10-17
+-- Description: Supports GET /novel-context/<novel_name> (latest completed job of a
+--              novel) without scanning every historical job. Built CONCURRENTLY so
+--              job writes are not blocked; run outside a transaction (psql default,
+--              not with --single-transaction)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_description_state_novel_status_id
+    ON workflow_description_state(novel_name, status, id DESC);
+
+SELECT 'Migration 016 completed - novel/status index added' AS status;
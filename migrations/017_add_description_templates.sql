@@ -0,0 +1,34 @@
+-- Migration 017: Add description templates
+-- Created: 2026-10-17
+-- Description: Description templates are ai_prompts rows with prompt_type 'template'
+--              ({placeholders}, {timestamps} exactly once). Jobs choose one by name
+--              (e.g. per channel); template_name NULL uses description_template
+
+ALTER TABLE workflow_description_state ADD COLUMN IF NOT EXISTS template_name VARCHAR(100);
+
+-- Default template (same text as the built-in fallback in TemplateService)
+INSERT INTO ai_prompts (name, prompt_type, description, prompt_text) VALUES
+('description_template', 'template', 'Default YouTube description layout',
+'Full Playlist: {playlist_url}
+
+📚 About "{novel_name}"
+
+{about}
+
+⭐ What to Expect
+
+{what_to_expect}
+
+🔔 Subscribe for More
+
+{subscribe}
+
+⏰ Timestamps:
+
+{timestamps}
+
+Tags:
+{seo_tags}')
+ON CONFLICT (name) DO NOTHING;
+
+SELECT 'Migration 017 completed - description templates added' AS status;
@@ -0,0 +1,13 @@
+-- Migration 018: Add LLM rate limit buckets
+-- Created: 2026-10-17
+-- Description: Token buckets for requests and tokens per minute, shared by every
+--              worker and replica calling the same OpenAI model deployment
+
+CREATE TABLE IF NOT EXISTS llm_rate_limits (
+    name VARCHAR(255) PRIMARY KEY,  -- e.g. 'openai:gpt-5-nano'
+    requests DOUBLE PRECISION NOT NULL,  -- Requests available now
+    tokens DOUBLE PRECISION NOT NULL,  -- Tokens available now (negative after under-estimated calls)
+    refilled_at DOUBLE PRECISION NOT NULL  -- Unix time the buckets were last refilled
+);
+
+SELECT 'Migration 018 completed - llm_rate_limits table added' AS status;
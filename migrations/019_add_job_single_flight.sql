@@ -0,0 +1,45 @@
+-- Migration 019: Single-flight jobs per novel and idempotency keys
+-- Created: 2026-10-17
+-- Description: At most one pending/processing job per novel, enforced by a partial
+--              unique index, plus the Idempotency-Key of the submitting request.
+--              Older duplicate in-flight jobs are marked failed first so the index
+--              can be built. Indexes are built CONCURRENTLY; run outside a
+--              transaction (psql default, not with --single-transaction)
+
+ALTER TABLE workflow_description_state ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(255);
+
+-- Keep the newest in-flight job of each novel
+WITH superseded AS (
+    SELECT job_id FROM (
+        SELECT job_id, ROW_NUMBER() OVER (PARTITION BY novel_name ORDER BY id DESC) AS position
+        FROM workflow_description_state
+        WHERE status IN ('pending', 'processing')
+    ) ranked
+    WHERE position > 1
+)
+UPDATE workflow_description_state
+SET status = 'failed',
+    error_message = 'Superseded by a newer job for the same novel',
+    completed_at = NOW(),
+    updated_at = NOW()
+WHERE job_id IN (SELECT job_id FROM superseded);
+
+UPDATE description_job_queue q
+SET status = 'failed',
+    last_error = 'Superseded by a newer job for the same novel',
+    locked_by = NULL,
+    updated_at = NOW()
+FROM workflow_description_state s
+WHERE s.job_id = q.job_id
+  AND s.error_message = 'Superseded by a newer job for the same novel'
+  AND q.status IN ('queued', 'running');
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_description_state_novel_in_flight
+    ON workflow_description_state(novel_name)
+    WHERE status IN ('pending', 'processing');
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_description_state_idempotency_key
+    ON workflow_description_state(idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+SELECT 'Migration 019 completed - single-flight jobs and idempotency keys added' AS status;
@@ -0,0 +1,9 @@
+-- Migration 020: Add per-job timing breakdown
+-- Created: 2026-10-17
+-- Description: Where each job spent its time (LLM call, listings, per-video read /
+--              render / write percentiles, outcome counts), written with the job's
+--              final status and returned by GET /jobs/<job_id>?detail=timings
+
+ALTER TABLE workflow_description_state ADD COLUMN IF NOT EXISTS job_timings JSONB;
+
+SELECT 'Migration 020 completed - job_timings column added' AS status;
@@ -1,12 +1,14 @@
 """YouTube Description Service - Main Flask Application"""
 import logging
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 from functools import wraps
 
 from src.config import config
 from src.routes.descriptions import descriptions_bp
 from src.routes.admin import admin_bp
+from src.services import metrics
+from src.utils.event_tokens import verify_events_token
 
 # Configure logging
 logging.basicConfig(
@@ -19,13 +21,14 @@ logger = logging.getLogger(__name__)
 # Create Flask app
 app = Flask(__name__)
 
-# Configure CORS properly for frontend requests
+# Configure CORS properly for frontend requests. Flask-CORS also adds the
+# headers to error responses (401s from check_auth, 404s, 500s).
 CORS(
     app,
     resources={r"/*": {
         "origins": config.CORS_ORIGINS,
-        "methods": ["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "Accept"],
+        "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Authorization", "Accept", "Last-Event-ID", "Idempotency-Key"],
         "expose_headers": ["Content-Type"],
         "supports_credentials": True,
         "max_age": 3600
@@ -60,10 +63,10 @@ def require_auth(f):
     return decorated_function
 
 
-# Apply authentication to all routes except health check
+# Apply authentication to all routes except health check and metrics
 @app.before_request
 def check_auth():
-    """Check authentication for all requests except health check and preflight"""
+    """Check authentication for all requests except health check, metrics and preflight"""
     # Allow preflight OPTIONS requests through without auth
     if request.method == 'OPTIONS':
         return None
@@ -72,6 +75,16 @@ def check_auth():
     if request.path == '/health':
         return None
     
+    # Prometheus scrapes without credentials
+    if request.path == '/metrics':
+        return None
+    
+    # EventSource cannot send headers; the job's event stream accepts a signed ?token=
+    if request.endpoint == 'descriptions.job_events' and 'token' in request.args:
+        if verify_events_token(request.args['token'], request.view_args['job_id']):
+            return None
+        return jsonify({'success': False, 'error': 'Invalid or expired events token'}), 401
+    
     auth_header = request.headers.get('Authorization')
     
     if not auth_header:
@@ -86,23 +99,6 @@ def check_auth():
         return jsonify({'success': False, 'error': 'Invalid API token'}), 401
 
 
-@app.after_request
-def after_request(response):
-    """Ensure CORS headers are set on all responses including errors"""
-    origin = request.headers.get('Origin')
-    
-    # Check if origin is in allowed origins
-    if origin and origin in config.CORS_ORIGINS:
-        response.headers['Access-Control-Allow-Origin'] = origin
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PATCH, DELETE, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, Accept'
-        response.headers['Access-Control-Expose-Headers'] = 'Content-Type'
-        response.headers['Access-Control-Allow-Credentials'] = 'true'
-        response.headers['Access-Control-Max-Age'] = '3600'
-    
-    return response
-
-
 @app.route('/health', methods=['GET', 'OPTIONS'])
 def health_check():
     """Health check endpoint"""
@@ -115,6 +111,13 @@ def health_check():
     }), 200
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics, summed over all gunicorn workers"""
+    body, content_type = metrics.render()
+    return Response(body, content_type=content_type)
+
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
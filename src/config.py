@@ -24,8 +24,8 @@ class Config:
     
     @property
     def DATABASE_URL(self):
-        """Build database connection URL"""
-        return (
+        """Build database connection URL (DATABASE_URL overrides the POSTGRES_* settings)"""
+        return os.getenv('DATABASE_URL') or (
             f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
@@ -36,6 +36,14 @@ class Config:
     S3_SECRET_ACCESS_KEY = os.getenv('S3_SECRET_ACCESS_KEY')
     S3_BUCKET_NAME = os.getenv('S3_BUCKET_NAME', 'audio-novels-7x1e4')
     S3_REGION = os.getenv('S3_REGION', 'auto')
+    # Shared per-process client pool (covers pipeline threads of concurrent jobs)
+    S3_MAX_POOL_CONNECTIONS = int(os.getenv('S3_MAX_POOL_CONNECTIONS', 50))
+    # List existing descriptions once per job instead of one HEAD per video
+    S3_BULK_EXISTENCE_CHECK = os.getenv('S3_BULK_EXISTENCE_CHECK', 'true').lower() == 'true'
+    # Compare each rendered description's MD5 with the stored ETag and skip identical uploads
+    S3_SKIP_UNCHANGED_WRITES = os.getenv('S3_SKIP_UNCHANGED_WRITES', 'true').lower() == 'true'
+    # Process-wide cap on in-flight S3 requests from the asyncio job engine
+    S3_ASYNC_MAX_CONNECTIONS = int(os.getenv('S3_ASYNC_MAX_CONNECTIONS', 256))
     
     # Azure OpenAI Configuration
     AZURE_OPENAI_ENDPOINT = os.getenv('AZURE_OPENAI_ENDPOINT')
@@ -46,6 +54,90 @@ class Config:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
     
+    # Shared per-process OpenAI HTTP pool
+    OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', 20))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', 60))
+    
+    # Streaming completions: sections are saved as they arrive, stalls fail fast
+    OPENAI_STREAM = os.getenv('OPENAI_STREAM', 'true').lower() == 'true'
+    OPENAI_FIRST_TOKEN_TIMEOUT = float(os.getenv('OPENAI_FIRST_TOKEN_TIMEOUT', 120))
+    OPENAI_STREAM_IDLE_TIMEOUT = float(os.getenv('OPENAI_STREAM_IDLE_TIMEOUT', 30))
+    
+    # Cluster-wide rate limits per model deployment (0 = unlimited). Every
+    # completion reserves one request and its estimated tokens (prompt plus
+    # OPENAI_COMPLETION_TOKENS_ESTIMATE), reconciled with response.usage.
+    # Buckets live in Postgres ('postgres') or in the process ('local').
+    OPENAI_RPM_LIMIT = int(os.getenv('OPENAI_RPM_LIMIT', 0))
+    OPENAI_TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', 0))
+    OPENAI_RATE_LIMIT_BACKEND = os.getenv('OPENAI_RATE_LIMIT_BACKEND', 'postgres').lower()
+    OPENAI_RATE_LIMIT_MAX_WAIT = float(os.getenv('OPENAI_RATE_LIMIT_MAX_WAIT', 300))
+    OPENAI_COMPLETION_TOKENS_ESTIMATE = int(os.getenv('OPENAI_COMPLETION_TOKENS_ESTIMATE', 2000))
+    
+    # Retries of transient OpenAI/S3 errors (429, 5xx, connection errors):
+    # full-jitter exponential backoff, or the server's Retry-After (capped
+    # at RETRY_MAX_DELAY)
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', 4))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', 0.5))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 30))
+    
+    # Circuit breakers: consecutive failures that make calls fail fast, and
+    # seconds before a trial call is let through
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 10))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+    
+    # Prompt cache: seconds between revalidations while LISTEN/NOTIFY is live
+    PROMPT_CACHE_TTL = float(os.getenv('PROMPT_CACHE_TTL', 300))
+    
+    # AI section cache: in-memory LRU entries in front of ai_section_cache
+    SECTION_CACHE_SIZE = int(os.getenv('SECTION_CACHE_SIZE', 256))
+    
+    # Description preview cache (revalidated against S3 with conditional GETs)
+    DESCRIPTION_CACHE_SIZE = int(os.getenv('DESCRIPTION_CACHE_SIZE', 1024))
+    DESCRIPTION_CACHE_MAX_BYTES = int(os.getenv('DESCRIPTION_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    
+    # Description pipeline (per-video reads, renders and uploads)
+    PIPELINE_READ_WORKERS = int(os.getenv('PIPELINE_READ_WORKERS', 8))
+    PIPELINE_WRITE_WORKERS = int(os.getenv('PIPELINE_WRITE_WORKERS', 8))
+    PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 32))
+    
+    # Parallel S3 downloads per description export request
+    EXPORT_CONCURRENCY = int(os.getenv('EXPORT_CONCURRENCY', 16))
+    
+    # Job execution engine: 'threads' (DescriptionPipeline) or 'asyncio'
+    # (AsyncDescriptionPipeline on one event loop per process)
+    JOB_ENGINE = os.getenv('JOB_ENGINE', 'threads').lower()
+    ASYNC_JOB_CONCURRENCY = int(os.getenv('ASYNC_JOB_CONCURRENCY', 128))
+    
+    # Job progress writes (coalesced: whichever limit is reached first)
+    PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', 1.0))
+    PROGRESS_FLUSH_EVERY = int(os.getenv('PROGRESS_FLUSH_EVERY', 50))
+    
+    # Description manifest writes (videos per upsert)
+    MANIFEST_BATCH_SIZE = int(os.getenv('MANIFEST_BATCH_SIZE', 200))
+    
+    # Job queue and worker process (python -m src.worker)
+    WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', 2))
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 2.0))
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', 15))
+    JOB_VISIBILITY_TIMEOUT = float(os.getenv('JOB_VISIBILITY_TIMEOUT', 120))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', 30))
+    # Port for the worker's Prometheus metrics (0 = off). Job metrics (LLM, per-video,
+    # job counts) are only recorded in worker processes, so this is their scrape target.
+    WORKER_METRICS_PORT = int(os.getenv('WORKER_METRICS_PORT', 9102))
+    
+    # Batch submission (POST /generate-descriptions/batch)
+    BATCH_MAX_JOBS = int(os.getenv('BATCH_MAX_JOBS', 500))
+    BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', 4))
+    
+    # Job status long-poll (GET /jobs/<id>?wait=) and SSE (GET /jobs/<id>/events)
+    JOB_WAIT_MAX = float(os.getenv('JOB_WAIT_MAX', 30))
+    JOB_WAIT_POLL_INTERVAL = float(os.getenv('JOB_WAIT_POLL_INTERVAL', 1.0))
+    JOB_EVENTS_KEEPALIVE = float(os.getenv('JOB_EVENTS_KEEPALIVE', 15))
+    JOB_EVENTS_MAX_DURATION = float(os.getenv('JOB_EVENTS_MAX_DURATION', 600))
+    # Lifetime of ?token= credentials for the SSE stream (EventSource cannot send headers)
+    JOB_EVENTS_TOKEN_TTL = int(os.getenv('JOB_EVENTS_TOKEN_TTL', 3600))
+    
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
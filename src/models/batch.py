@@ -0,0 +1,26 @@
+"""Description batch model"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP
+from sqlalchemy.sql import func
+
+from src.models.database import Base
+
+
+class DescriptionBatch(Base):
+    """Group of description jobs submitted together and run under one concurrency budget"""
+    
+    __tablename__ = 'description_batches'
+    
+    id = Column(Integer, primary_key=True)
+    batch_id = Column(String(255), unique=True, nullable=False)
+    total_jobs = Column(Integer, nullable=False, default=0)
+    max_concurrency = Column(Integer, nullable=False)  # Jobs of this batch running at once
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            'batch_id': self.batch_id,
+            'total_jobs': self.total_jobs,
+            'max_concurrency': self.max_concurrency,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
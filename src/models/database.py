@@ -1,24 +1,51 @@
 """Database connection and session management"""
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 from contextlib import contextmanager
 import logging
 
 from src.config import config
+from src.services.metrics import DB_CONNECTION_SECONDS
 
 logger = logging.getLogger(__name__)
 
+
+def _engine_options(url: str) -> dict:
+    """Pool and isolation settings for the configured database"""
+    if url.startswith('sqlite'):
+        # Local runs and benchmarks: SQLite has no READ COMMITTED level and
+        # its connections are shared across request and pipeline threads
+        return {'connect_args': {'check_same_thread': False}}
+    
+    return {
+        'pool_size': 10,
+        'max_overflow': 20,
+        'pool_pre_ping': True,
+        'pool_recycle': 3600,
+        'isolation_level': "READ COMMITTED"  # Use READ COMMITTED to avoid blocking other services
+    }
+
+
 # Create database engine with proper isolation level
-engine = create_engine(
-    config.DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False,
-    isolation_level="READ COMMITTED"  # Use READ COMMITTED to avoid blocking other services
-)
+engine = create_engine(config.DATABASE_URL, echo=False, **_engine_options(config.DATABASE_URL))
+
+
+@event.listens_for(engine, 'checkout')
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    """Stamp pool checkouts for DB_CONNECTION_SECONDS"""
+    connection_record.info['checked_out_at'] = time.perf_counter()
+
+
+@event.listens_for(engine, 'checkin')
+def _on_checkin(dbapi_connection, connection_record):
+    """Observe how long the connection was held"""
+    checked_out_at = connection_record.info.pop('checked_out_at', None)
+    if checked_out_at is not None:
+        DB_CONNECTION_SECONDS.observe(time.perf_counter() - checked_out_at)
+
 
 # Create session factory
 SessionLocal = scoped_session(
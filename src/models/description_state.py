@@ -5,6 +5,9 @@ from datetime import datetime, timezone
 
 from src.models.database import Base
 
+# Jobs that have not finished; at most one per novel (migration 019)
+IN_FLIGHT_STATUSES = ('pending', 'processing')
+
 
 class WorkflowDescriptionState(Base):
     """Tracks description generation jobs per workflow"""
@@ -15,13 +18,17 @@ class WorkflowDescriptionState(Base):
     workflow_id = Column(Integer, nullable=True)  # Optional: for future workflow integration
     novel_name = Column(String(255))  # Novel name for Phase 1
     job_id = Column(String(255), unique=True, nullable=False)
+    batch_id = Column(String(255))  # description_batches.batch_id, if submitted in a batch
     status = Column(String(50), nullable=False)  # pending, processing, completed, failed
     progress_data = Column(JSON)  # {descriptions_generated: X, total_videos: Y}
+    job_timings = Column(JSON)  # JobTimings.to_dict(), written with the final status
     
     # User inputs
     novel_context = Column(Text)
     playlist_url = Column(Text)
     subscribe_text = Column(Text)
+    template_name = Column(String(100))  # ai_prompts template (prompt_type 'template'); NULL = default
+    idempotency_key = Column(String(255))  # Idempotency-Key header of the submission (unique)
     
     # AI-generated content (novel-level)
     generated_about = Column(Text)
@@ -46,11 +53,13 @@ class WorkflowDescriptionState(Base):
             'id': self.id,
             'workflow_id': self.workflow_id,
             'job_id': self.job_id,
+            'batch_id': self.batch_id,
             'status': self.status,
             'progress': self.progress_data or {},
             'novel_context': self.novel_context,
             'playlist_url': self.playlist_url,
             'subscribe_text': self.subscribe_text,
+            'template_name': self.template_name,
             'generated_what_to_expect': self.generated_what_to_expect,
             'generated_tags': self.generated_tags,
             'started_at': self.started_at.isoformat() if self.started_at else None,
@@ -0,0 +1,47 @@
+"""Description job queue model"""
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON
+from sqlalchemy.sql import func
+
+from src.models.database import Base
+
+
+class DescriptionJobQueue(Base):
+    """Durable queue of description jobs, claimed by worker processes"""
+    
+    __tablename__ = 'description_job_queue'
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(255), unique=True, nullable=False)  # workflow_description_state.job_id
+    batch_id = Column(String(255))  # description_batches.batch_id; shares the batch's concurrency budget
+    payload = Column(JSON)  # {force: bool, bypass_cache: bool}
+    status = Column(String(50), nullable=False, default='queued')  # queued, running, done, failed
+    
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    last_error = Column(Text)
+    
+    # Lease held by the worker running the job
+    locked_by = Column(String(255))
+    locked_at = Column(TIMESTAMP(timezone=True))
+    heartbeat_at = Column(TIMESTAMP(timezone=True))
+    
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    updated_at = Column(TIMESTAMP(timezone=True), default=func.now(), onupdate=func.now())
+    
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            'id': self.id,
+            'job_id': self.job_id,
+            'batch_id': self.batch_id,
+            'payload': self.payload or {},
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'available_at': self.available_at.isoformat() if self.available_at else None,
+            'last_error': self.last_error,
+            'locked_by': self.locked_by,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None
+        }
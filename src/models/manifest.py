@@ -0,0 +1,21 @@
+"""Description manifest model"""
+from sqlalchemy import Column, Integer, String, TIMESTAMP, UniqueConstraint
+from sqlalchemy.sql import func
+
+from src.models.database import Base
+
+
+class DescriptionManifest(Base):
+    """What each video's current description was rendered from"""
+    
+    __tablename__ = 'description_manifest'
+    __table_args__ = (
+        UniqueConstraint('novel_name', 'video_name', name='uq_description_manifest_video'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    novel_name = Column(String(255), nullable=False)
+    video_name = Column(String(512), nullable=False)
+    timestamp_etag = Column(String(255))  # ETag of <novel>/Timestamps/<video>.txt when rendered
+    sections_hash = Column(String(64))  # sha256 of the novel-level content the description was rendered with
+    updated_at = Column(TIMESTAMP(timezone=True), default=func.now(), onupdate=func.now())
@@ -0,0 +1,15 @@
+"""LLM rate limit bucket model"""
+from sqlalchemy import Column, Float, String
+
+from src.models.database import Base
+
+
+class LLMRateLimit(Base):
+    """Request and token buckets shared by every process calling one model deployment"""
+    
+    __tablename__ = 'llm_rate_limits'
+    
+    name = Column(String(255), primary_key=True)  # e.g. 'openai:gpt-5-nano'
+    requests = Column(Float, nullable=False)  # Requests available now
+    tokens = Column(Float, nullable=False)  # Tokens available now (negative after under-estimated calls)
+    refilled_at = Column(Float, nullable=False)  # Unix time the buckets were last refilled
@@ -0,0 +1,33 @@
+"""AI section cache model"""
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP
+from sqlalchemy.sql import func
+
+from src.models.database import Base
+
+
+class AISectionCache(Base):
+    """Parsed AI-generated novel sections, keyed by a hash of their inputs"""
+    
+    __tablename__ = 'ai_section_cache'
+    
+    id = Column(Integer, primary_key=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256 of name, context, prompts, model
+    novel_name = Column(String(255))
+    model = Column(String(100))
+    
+    # Parsed sections
+    about = Column(Text)
+    what_to_expect = Column(Text)
+    subscribe = Column(Text)
+    tags = Column(Text)
+    
+    created_at = Column(TIMESTAMP(timezone=True), default=func.now())
+    
+    def to_sections(self):
+        """Convert to the dict returned by OpenAIService.generate_all_sections"""
+        return {
+            'about': self.about,
+            'what_to_expect': self.what_to_expect,
+            'subscribe': self.subscribe,
+            'tags': self.tags
+        }
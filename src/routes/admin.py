@@ -1,10 +1,13 @@
-"""Admin API routes for managing AI prompts"""
+"""Admin API routes for managing AI prompts and description templates"""
 import logging
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify
 
 from src.models.database import get_db
 from src.models.ai_prompt import AIPrompt
+from src.services.prompt_cache import prompt_cache
+from src.services.resilience import dependencies
+from src.services.template_service import TEMPLATE_PROMPT_TYPE, TemplateService
 from src.utils.validators import validate_prompt_update
 
 logger = logging.getLogger(__name__)
@@ -82,6 +85,11 @@ def update_prompt(prompt_name):
                     'error': f'Prompt "{prompt_name}" not found'
                 }), 404
             
+            if prompt.prompt_type == TEMPLATE_PROMPT_TYPE:
+                template_error = TemplateService.check_template(data['prompt_text'])
+                if template_error:
+                    return jsonify({'success': False, 'error': template_error}), 400
+            
             # Update prompt content
             prompt.prompt_text = data['prompt_text']
             prompt.updated_at = datetime.now(timezone.utc)
@@ -90,6 +98,9 @@ def update_prompt(prompt_name):
             if 'description' in data:
                 prompt.description = data['description']
             
+            # Drop cached copies here and, once committed, in every other worker
+            prompt_cache.publish_change(session, prompt_name)
+            
             session.commit()
             
             logger.info(f"Updated prompt: {prompt_name}")
@@ -107,3 +118,77 @@ def update_prompt(prompt_name):
         logger.error(f"Error updating prompt: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@admin_bp.route('/templates/<template_name>', methods=['PUT'])
+def put_template(template_name):
+    """
+    Create or replace a description template.
+    
+    Body: {"prompt_text": "...{timestamps}...", "description": "..."}
+    
+    Jobs pick a template with the "template" field of their request, e.g.
+    one template per channel.
+    """
+    try:
+        data = request.json or {}
+        
+        is_valid, error = validate_prompt_update(data)
+        if not is_valid:
+            return jsonify({'success': False, 'error': error}), 400
+        
+        template_error = TemplateService.check_template(data['prompt_text'])
+        if template_error:
+            return jsonify({'success': False, 'error': template_error}), 400
+        
+        session = get_db()
+        try:
+            prompt = session.query(AIPrompt).filter_by(name=template_name).first()
+            
+            if prompt and prompt.prompt_type != TEMPLATE_PROMPT_TYPE:
+                return jsonify({
+                    'success': False,
+                    'error': f'Prompt "{template_name}" exists and is not a template'
+                }), 409
+            
+            created = prompt is None
+            if created:
+                prompt = AIPrompt(name=template_name, prompt_type=TEMPLATE_PROMPT_TYPE)
+                session.add(prompt)
+            
+            prompt.prompt_text = data['prompt_text']
+            prompt.updated_at = datetime.now(timezone.utc)
+            if 'description' in data:
+                prompt.description = data['description']
+            
+            # Drop cached copies here and, once committed, in every other worker
+            prompt_cache.publish_change(session, template_name)
+            
+            session.commit()
+            
+            logger.info(f"{'Created' if created else 'Updated'} template: {template_name}")
+            
+            return jsonify({
+                'success': True,
+                'message': f'Template "{template_name}" {"created" if created else "updated"} successfully',
+                'prompt': prompt.to_dict()
+            }), 201 if created else 200
+        
+        finally:
+            session.close()
+    
+    except Exception as e:
+        logger.error(f"Error saving template: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@admin_bp.route('/dependencies', methods=['GET'])
+def list_dependencies():
+    """
+    Circuit breaker state and error/retry counters of OpenAI and S3.
+    
+    Counters are per process (the worker answering this request).
+    """
+    return jsonify({
+        'success': True,
+        'dependencies': {name: dependency.snapshot() for name, dependency in dependencies.items()}
+    }), 200
@@ -1,195 +1,153 @@
 """Description generation API routes"""
+import itertools
+import json
 import logging
+import time
 import uuid
 from datetime import datetime, timezone
-from threading import Thread
-from flask import Blueprint, request, jsonify
+from typing import Optional
+from flask import Blueprint, Response, request, jsonify
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
 
+from src.config import config
+from src.models.ai_prompt import AIPrompt
+from src.models.batch import DescriptionBatch
 from src.models.database import get_db
-from src.models.description_state import WorkflowDescriptionState
-from src.services.openai_service import OpenAIService
+from src.models.description_state import IN_FLIGHT_STATUSES, WorkflowDescriptionState
+from src.services.description_cache import description_cache
+from src.services.export_service import DescriptionExporter
+from src.services.job_events import job_update_waiter
+from src.services.job_queue import JobQueue
 from src.services.s3_service import S3Service
-from src.services.template_service import TemplateService
-from src.utils.validators import validate_generate_request
+from src.services.template_service import DEFAULT_TEMPLATE_NAME, TEMPLATE_PROMPT_TYPE
+from src.utils.event_tokens import issue_events_token
+from src.utils.validators import validate_batch_request, validate_generate_request, validate_idempotency_key
 
 logger = logging.getLogger(__name__)
 
 descriptions_bp = Blueprint('descriptions', __name__)
 
 
-def generate_descriptions_task(
-    job_id: str,
-    novel_name: str,
-    novel_context: str,
-    playlist_url: str,
-    subscribe_text: str,
-    force: bool = False
-):
+def _create_job(session, data: dict, batch_id: str = None, idempotency_key: str = None) -> str:
     """
-    Background task to generate descriptions for all videos.
-    Uses short-lived database transactions to avoid blocking other services.
+    Add a job's state row and queue entry to the session (caller commits).
+    
+    The commit fails with IntegrityError if the novel already has an
+    in-flight job or the idempotency key was used before (unique indexes
+    from migration 019).
     
     Args:
-        job_id: Unique job identifier
-        novel_name: Name of the novel
-        novel_context: User-provided context
-        playlist_url: Full playlist URL
-        subscribe_text: Subscribe call-to-action
-        force: Force regeneration even if descriptions exist
+        session: Open database session
+        data: Validated generate-descriptions request data
+        batch_id: Batch the job belongs to, if any
+        idempotency_key: Idempotency-Key header of the request, if any
+    
+    Returns:
+        New job ID
     """
-    def update_job_status(status, **kwargs):
-        """Helper to update job status with short-lived transaction"""
-        session = get_db()
-        try:
-            state = session.query(WorkflowDescriptionState).filter_by(job_id=job_id).first()
-            if state:
-                state.status = status
-                for key, value in kwargs.items():
-                    setattr(state, key, value)
-                session.commit()
-        finally:
-            session.close()
+    job_id = str(uuid.uuid4())
     
-    try:
-        # Step 0: Update status to processing (short transaction)
-        update_job_status('processing')
-        
-        # Initialize services (no database connection)
-        openai_service = OpenAIService()
-        s3_service = S3Service()
-        
-        # Step 1: Generate ALL content in one API call (no database connection during API call)
-        logger.info(f"Generating AI content for novel: {novel_name}")
-        
-        # Single unified API call for all four sections
-        sections = openai_service.generate_all_sections(novel_name, novel_context)
-        about = sections['about']
-        what_to_expect = sections['what_to_expect']
-        subscribe = sections['subscribe']
-        seo_tags = sections['tags']
-        
-        # Save AI-generated content to database (short transaction)
-        update_job_status(
-            'processing',
-            generated_about=about,
-            generated_what_to_expect=what_to_expect,
-            generated_subscribe=subscribe,
-            generated_tags=seo_tags
-        )
-        
-        # Step 2: Fetch all timestamp files (no database connection)
-        timestamp_files = s3_service.fetch_timestamp_files(novel_name)
-        
-        if not timestamp_files:
-            # Short transaction to mark as failed
-            update_job_status(
-                'failed',
-                error_message=f"No timestamp files found for novel: {novel_name}",
-                completed_at=datetime.now(timezone.utc)
-            )
-            return
-        
-        total_videos = len(timestamp_files)
-        descriptions_generated = 0
-        
-        # Update progress (short transaction)
-        update_job_status(
-            'processing',
-            progress_data={
-                'total_videos': total_videos,
-                'descriptions_generated': 0,
-                'percent_complete': 0
-            }
-        )
-        
-        # Step 3: Generate description for each video (no database connection during I/O)
-        for file_info in timestamp_files:
-            video_name = file_info['video_name']
-            
-            try:
-                # Check if description already exists (unless force=True)
-                if not force and s3_service.description_exists(novel_name, video_name):
-                    logger.info(f"Description already exists for {video_name}, skipping")
-                    descriptions_generated += 1
-                    
-                    # Update progress (short transaction)
-                    update_job_status(
-                        'processing',
-                        progress_data={
-                            'total_videos': total_videos,
-                            'descriptions_generated': descriptions_generated,
-                            'percent_complete': (descriptions_generated / total_videos) * 100
-                        }
-                    )
-                    continue
-                
-                # Read timestamp file (no database connection)
-                timestamps = s3_service.read_timestamp_file(novel_name, video_name)
-                
-                # Build description (no database connection)
-                description = TemplateService.build_description(
-                    playlist_url=playlist_url,
-                    novel_name=novel_name,
-                    about=about,
-                    what_to_expect=what_to_expect,
-                    subscribe=subscribe,
-                    timestamps=timestamps,
-                    seo_tags=seo_tags
-                )
-                
-                # Validate description
-                is_valid, error = TemplateService.validate_description(description)
-                if not is_valid:
-                    logger.error(f"Invalid description for {video_name}: {error}")
-                    continue
-                
-                # Save to S3 (no database connection)
-                s3_service.save_description(novel_name, video_name, description)
-                
-                descriptions_generated += 1
-                
-                # Update progress (short transaction)
-                update_job_status(
-                    'processing',
-                    progress_data={
-                        'total_videos': total_videos,
-                        'descriptions_generated': descriptions_generated,
-                        'percent_complete': (descriptions_generated / total_videos) * 100
-                    }
-                )
-                
-                logger.info(f"Generated description {descriptions_generated}/{total_videos}")
-                
-            except Exception as e:
-                logger.error(f"Error processing video {video_name}: {e}")
-                continue
-        
-        # Mark as completed (short transaction)
-        update_job_status(
-            'completed',
-            completed_at=datetime.now(timezone.utc),
-            progress_data={
-                'total_videos': total_videos,
-                'descriptions_generated': descriptions_generated,
-                'percent_complete': 100
-            }
-        )
-        
-        logger.info(f"Job {job_id} completed: {descriptions_generated}/{total_videos} descriptions generated")
-        
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {e}")
-        # Short transaction to mark as failed
-        update_job_status(
-            'failed',
-            error_message=str(e),
-            completed_at=datetime.now(timezone.utc)
-        )
+    session.add(WorkflowDescriptionState(
+        job_id=job_id,
+        batch_id=batch_id,
+        novel_name=data['novel_name'],
+        status='pending',
+        novel_context=data['novel_context'],
+        playlist_url=data['playlist_url'],
+        subscribe_text=data.get('subscribe_text', ''),  # Optional now (AI generates it)
+        template_name=data.get('template'),
+        idempotency_key=idempotency_key,
+        started_at=datetime.now(timezone.utc),
+        progress_data={'total_videos': 0, 'descriptions_generated': 0, 'percent_complete': 0}
+    ))
+    
+    # Enqueued in the same transaction; a worker process picks it up
+    JobQueue.enqueue(
+        session,
+        job_id,
+        {'force': data.get('force', False), 'bypass_cache': data.get('bypass_cache', False)},
+        batch_id=batch_id
+    )
+    return job_id
+
+
+def _existing_job(session, novel_name: str, idempotency_key: Optional[str] = None):
+    """
+    Find the job a submission duplicates.
+    
+    Args:
+        session: Open database session
+        novel_name: Novel of the submission
+        idempotency_key: Idempotency-Key header of the submission, if any
+    
+    Returns:
+        Row with job_id, novel_name and status: the job submitted with the
+        same idempotency key (whatever its status), else the novel's
+        in-flight job; None if there is neither
+    """
+    columns = (
+        WorkflowDescriptionState.job_id,
+        WorkflowDescriptionState.novel_name,
+        WorkflowDescriptionState.status
+    )
+    
+    if idempotency_key:
+        job = session.query(*columns).filter_by(idempotency_key=idempotency_key).first()
+        if job:
+            return job
+    
+    return session.query(*columns)\
+        .filter(
+            WorkflowDescriptionState.novel_name == novel_name,
+            WorkflowDescriptionState.status.in_(IN_FLIGHT_STATUSES)
+        )\
+        .order_by(WorkflowDescriptionState.id.desc())\
+        .first()
+
+
+def _duplicate_response(job, novel_name: str):
+    """Response for a submission answered with an existing job"""
+    if job.novel_name != novel_name:
+        return jsonify({
+            'success': False,
+            'error': 'Idempotency-Key was already used for a different novel'
+        }), 422
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.job_id,
+        'status': job.status,
+        'duplicate': True,
+        'message': f'Description generation for {novel_name} was already submitted',
+        'poll_url': f'/jobs/{job.job_id}'
+    }), 200
+
+
+def _unknown_template(session, template_names) -> Optional[str]:
+    """Return the first requested template that does not exist (None if all do)"""
+    requested = {name for name in template_names if name and name != DEFAULT_TEMPLATE_NAME}
+    if not requested:
+        return None
+    
+    existing = {
+        row.name for row in session.query(AIPrompt.name)
+        .filter(AIPrompt.prompt_type == TEMPLATE_PROMPT_TYPE, AIPrompt.name.in_(requested))
+    }
+    missing = sorted(requested - existing)
+    return missing[0] if missing else None
 
 
 @descriptions_bp.route('/generate-descriptions', methods=['POST'])
 def generate_descriptions():
-    """Generate descriptions for a novel"""
+    """
+    Generate descriptions for a novel.
+    
+    A novel has at most one pending/processing job: submitting it again
+    (e.g. a client retry or a second operator) returns the existing job_id
+    with "duplicate": true. An Idempotency-Key header makes repeats of the
+    same request return its job even after the job has finished.
+    """
     try:
         data = request.json
         
@@ -198,48 +156,40 @@ def generate_descriptions():
         if not is_valid:
             return jsonify({'success': False, 'error': error}), 400
         
-        novel_name = data['novel_name']
-        novel_context = data['novel_context']
-        playlist_url = data['playlist_url']
-        subscribe_text = data.get('subscribe_text', '')  # Optional now (AI generates it)
-        force = data.get('force', False)
+        idempotency_key = request.headers.get('Idempotency-Key')
+        is_valid, error = validate_idempotency_key(idempotency_key)
+        if not is_valid:
+            return jsonify({'success': False, 'error': error}), 400
         
-        # Generate unique job ID
-        job_id = str(uuid.uuid4())
+        novel_name = data['novel_name']
         
         # Create job state in database
         session = get_db()
         try:
-            # Check if there's already a processing job for this novel
-            # Note: This assumes workflow_id exists. For now, we'll skip this check
-            # since we don't have workflow_id in the request
-            
-            state = WorkflowDescriptionState(
-                job_id=job_id,
-                novel_name=novel_name,
-                status='pending',
-                novel_context=novel_context,
-                playlist_url=playlist_url,
-                subscribe_text=subscribe_text,
-                started_at=datetime.now(timezone.utc),
-                progress_data={'total_videos': 0, 'descriptions_generated': 0, 'percent_complete': 0}
-            )
+            existing = _existing_job(session, novel_name, idempotency_key)
+            if existing:
+                return _duplicate_response(existing, novel_name)
             
-            session.add(state)
-            session.commit()
+            template_name = _unknown_template(session, [data.get('template')])
+            if template_name:
+                return jsonify({'success': False, 'error': f'Template "{template_name}" not found'}), 400
             
-            # Start background task
-            thread = Thread(
-                target=generate_descriptions_task,
-                args=(job_id, novel_name, novel_context, playlist_url, subscribe_text, force)
-            )
-            thread.start()
+            job_id = _create_job(session, data, idempotency_key=idempotency_key)
+            try:
+                session.commit()
+            except IntegrityError:
+                # A concurrent submission for the novel (or with the same key) won
+                session.rollback()
+                existing = _existing_job(session, novel_name, idempotency_key)
+                if not existing:
+                    raise
+                return _duplicate_response(existing, novel_name)
             
             return jsonify({
                 'success': True,
                 'job_id': job_id,
-                'status': 'processing',
-                'message': f'Description generation started for {novel_name}',
+                'status': 'pending',
+                'message': f'Description generation queued for {novel_name}',
                 'poll_url': f'/jobs/{job_id}'
             }), 200
             
@@ -251,42 +201,371 @@ def generate_descriptions():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-@descriptions_bp.route('/jobs/<job_id>', methods=['GET'])
-def get_job_status(job_id):
-    """Get status of a description generation job"""
+@descriptions_bp.route('/generate-descriptions/batch', methods=['POST'])
+def generate_descriptions_batch():
+    """
+    Queue description generation for many novels at once.
+    
+    Body: {"jobs": [<generate-descriptions request>, ...], "max_concurrency": N}
+    
+    All jobs are created in one transaction. Workers run at most
+    max_concurrency (default BATCH_MAX_CONCURRENCY) jobs of the batch at a
+    time, so a backfill cannot take over every worker slot. Novels that
+    already have a pending/processing job keep it: their entry in "jobs"
+    carries that job_id with "duplicate": true and is not part of the batch.
+    """
     try:
+        data = request.json or {}
+        
+        is_valid, error = validate_batch_request(data, config.BATCH_MAX_JOBS)
+        if not is_valid:
+            return jsonify({'success': False, 'error': error}), 400
+        
+        batch_id = str(uuid.uuid4())
+        
         session = get_db()
         try:
-            state = session.query(WorkflowDescriptionState).filter_by(job_id=job_id).first()
+            template_name = _unknown_template(session, [job.get('template') for job in data['jobs']])
+            if template_name:
+                return jsonify({'success': False, 'error': f'Template "{template_name}" not found'}), 400
             
-            if not state:
-                return jsonify({'success': False, 'error': 'Job not found'}), 404
-            
-            response = {
-                'job_id': state.job_id,
-                'status': state.status,
-                'progress': state.progress_data or {},
-                'started_at': state.started_at.isoformat() if state.started_at else None,
-                'completed_at': state.completed_at.isoformat() if state.completed_at else None,
-                'updated_at': state.updated_at.isoformat() if state.updated_at else None
+            in_flight = {
+                row.novel_name: row.job_id for row in session.query(
+                    WorkflowDescriptionState.novel_name,
+                    WorkflowDescriptionState.job_id
+                )
+                .filter(
+                    WorkflowDescriptionState.novel_name.in_([job['novel_name'] for job in data['jobs']]),
+                    WorkflowDescriptionState.status.in_(IN_FLIGHT_STATUSES)
+                )
             }
             
-            if state.status == 'failed':
-                response['error_message'] = state.error_message
+            jobs = []
+            for job in data['jobs']:
+                existing_job_id = in_flight.get(job['novel_name'])
+                if existing_job_id:
+                    jobs.append({'novel_name': job['novel_name'], 'job_id': existing_job_id, 'duplicate': True})
+                else:
+                    jobs.append({'novel_name': job['novel_name'], 'job_id': _create_job(session, job, batch_id=batch_id)})
+            created = sum(1 for job in jobs if not job.get('duplicate'))
+            
+            session.add(DescriptionBatch(
+                batch_id=batch_id,
+                total_jobs=created,
+                max_concurrency=data.get('max_concurrency', config.BATCH_MAX_CONCURRENCY)
+            ))
+            try:
+                session.commit()
+            except IntegrityError:
+                session.rollback()
+                return jsonify({
+                    'success': False,
+                    'error': 'A job for one of these novels was submitted concurrently; retry the request'
+                }), 409
+            
+            return jsonify({
+                'success': True,
+                'batch_id': batch_id,
+                'status': 'pending',
+                'total_jobs': created,
+                'jobs': jobs,
+                'message': f'Description generation queued for {created} novels',
+                'poll_url': f'/batches/{batch_id}'
+            }), 200
+        
+        finally:
+            session.close()
+        
+    except Exception as e:
+        logger.error(f"Error starting batch description generation: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@descriptions_bp.route('/batches/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """Get aggregated status and progress of a batch"""
+    try:
+        session = get_db()
+        try:
+            batch = session.query(DescriptionBatch).filter_by(batch_id=batch_id).first()
+            if not batch:
+                return jsonify({'success': False, 'error': 'Batch not found'}), 404
+            
+            rows = session.query(
+                WorkflowDescriptionState.job_id,
+                WorkflowDescriptionState.novel_name,
+                WorkflowDescriptionState.status,
+                WorkflowDescriptionState.progress_data
+            )\
+                .filter_by(batch_id=batch_id)\
+                .order_by(WorkflowDescriptionState.id)\
+                .all()
+            
+            jobs_by_status = {}
+            total_videos = 0
+            descriptions_generated = 0
+            jobs = []
             
-            if state.status == 'completed':
-                response['message'] = f"All {state.progress_data.get('descriptions_generated', 0)} descriptions generated successfully"
+            for row in rows:
+                progress = row.progress_data or {}
+                jobs_by_status[row.status] = jobs_by_status.get(row.status, 0) + 1
+                total_videos += progress.get('total_videos', 0)
+                descriptions_generated += progress.get('descriptions_generated', 0)
+                jobs.append({
+                    'job_id': row.job_id,
+                    'novel_name': row.novel_name,
+                    'status': row.status,
+                    'percent_complete': progress.get('percent_complete', 0)
+                })
             
-            return jsonify(response), 200
+            finished = jobs_by_status.get('completed', 0) + jobs_by_status.get('failed', 0)
+            if finished == len(rows):
+                status = 'completed_with_failures' if jobs_by_status.get('failed') else 'completed'
+            elif finished or jobs_by_status.get('processing'):
+                status = 'processing'
+            else:
+                status = 'pending'
             
+            return jsonify({
+                'success': True,
+                **batch.to_dict(),
+                'status': status,
+                'jobs_by_status': jobs_by_status,
+                'progress': {
+                    'jobs_finished': finished,
+                    'total_videos': total_videos,
+                    'descriptions_generated': descriptions_generated,
+                    'percent_complete': round(finished * 100 / len(rows), 2) if rows else 0
+                },
+                'jobs': jobs
+            }), 200
+        
         finally:
             session.close()
+    
+    except Exception as e:
+        logger.error(f"Error getting batch status: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# Columns read by _job_status(); polls never load the large Text columns
+_JOB_STATUS_COLUMNS = (
+    WorkflowDescriptionState.job_id,
+    WorkflowDescriptionState.status,
+    WorkflowDescriptionState.version,
+    WorkflowDescriptionState.progress_data,
+    WorkflowDescriptionState.started_at,
+    WorkflowDescriptionState.completed_at,
+    WorkflowDescriptionState.updated_at,
+    WorkflowDescriptionState.error_message
+)
+
+
+def _job_status(state) -> dict:
+    """Build the job status payload shared by polling and event clients"""
+    response = {
+        'job_id': state.job_id,
+        'status': state.status,
+        'version': state.version or 1,
+        'progress': state.progress_data or {},
+        'started_at': state.started_at.isoformat() if state.started_at else None,
+        'completed_at': state.completed_at.isoformat() if state.completed_at else None,
+        'updated_at': state.updated_at.isoformat() if state.updated_at else None
+    }
+    
+    if state.status == 'failed':
+        response['error_message'] = state.error_message
+    
+    if state.status == 'completed':
+        response['message'] = f"All {(state.progress_data or {}).get('descriptions_generated', 0)} descriptions generated successfully"
+    
+    return response
+
+
+def _load_job_status(job_id: str, with_timings: bool = False):
+    """
+    Load a job's status payload.
+    
+    Args:
+        job_id: Job ID
+        with_timings: Add the job's timing breakdown as 'timings' (None until
+            the job has finished)
+    
+    Returns:
+        Status payload, or None if the job does not exist
+    """
+    session = get_db()
+    try:
+        columns = _JOB_STATUS_COLUMNS
+        if with_timings:
+            columns += (WorkflowDescriptionState.job_timings,)
+        state = session.query(*columns).filter_by(job_id=job_id).first()
+        if not state:
+            return None
         
+        response = _job_status(state)
+        if with_timings:
+            response['timings'] = state.job_timings
+        return response
+    finally:
+        session.close()
+
+
+def _optional_int(value):
+    """Parse an optional integer query value (raises ValueError if malformed)"""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+@descriptions_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """
+    Get status of a description generation job.
+    
+    With ?wait=<seconds>&since_version=<n> this is a long-poll: the request
+    returns as soon as the job's version differs from n, or after the wait
+    (capped at JOB_WAIT_MAX) with the unchanged status.
+    
+    ?detail=timings adds the job's timing breakdown (LLM and listing time,
+    per-video read/render/write percentiles, outcome counts).
+    """
+    try:
+        try:
+            wait = float(request.args.get('wait') or 0)
+            since_version = _optional_int(request.args.get('since_version'))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'wait and since_version must be numbers'}), 400
+        
+        detail = request.args.get('detail')
+        if detail not in (None, 'timings'):
+            return jsonify({'success': False, 'error': 'detail must be "timings"'}), 400
+        
+        if wait > 0 and since_version is not None:
+            # No session is held while waiting
+            version = job_update_waiter.wait_for_change(job_id, since_version, min(wait, config.JOB_WAIT_MAX))
+            if version is None:
+                return jsonify({'success': False, 'error': 'Job not found'}), 404
+        
+        response = _load_job_status(job_id, with_timings=detail == 'timings')
+        if response is None:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        
+        return jsonify(response), 200
+    
     except Exception as e:
         logger.error(f"Error getting job status: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@descriptions_bp.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Stream job updates as Server-Sent Events.
+    
+    Events are 'status' (status changed), 'progress' (counters changed) and
+    'complete' (job completed or failed; the stream then ends). Each event id
+    is the job version, so a reconnecting EventSource resumes via
+    Last-Event-ID. Streams end after JOB_EVENTS_MAX_DURATION seconds and the
+    client reconnects. Besides the Authorization header, the stream accepts
+    ?token= from POST /jobs/<job_id>/events/token (checked in check_auth).
+    """
+    try:
+        since_version = _optional_int(
+            request.headers.get('Last-Event-ID') or request.args.get('since_version')
+        )
+    except ValueError:
+        return jsonify({'success': False, 'error': 'since_version must be a number'}), 400
+    
+    try:
+        initial = _load_job_status(job_id)
+    except Exception as e:
+        logger.error(f"Error getting job status: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    if initial is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    def format_event(event: str, payload: dict) -> str:
+        return f"id: {payload['version']}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    def stream():
+        deadline = time.monotonic() + config.JOB_EVENTS_MAX_DURATION
+        status = initial
+        seen_version = since_version
+        last_status = None
+        
+        yield f"retry: {int(config.JOB_WAIT_POLL_INTERVAL * 1000)}\n\n"
+        
+        while True:
+            if status['version'] != seen_version:
+                if status['status'] in ('completed', 'failed'):
+                    yield format_event('complete', status)
+                    return
+                yield format_event('status' if status['status'] != last_status else 'progress', status)
+                seen_version = status['version']
+                last_status = status['status']
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            
+            try:
+                version = job_update_waiter.wait_for_change(
+                    job_id, seen_version, min(remaining, config.JOB_EVENTS_KEEPALIVE)
+                )
+                if version is None:
+                    return
+                if version == seen_version:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                
+                status = _load_job_status(job_id)
+                if status is None:
+                    return
+            except Exception as e:
+                logger.error(f"Error streaming events for job {job_id}: {e}")
+                return
+    
+    return Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@descriptions_bp.route('/jobs/<job_id>/events/token', methods=['POST'])
+def job_events_token(job_id):
+    """
+    Issue a short-lived token for the job's event stream.
+    
+    Browsers' EventSource cannot send the Authorization header; open
+    GET /jobs/<job_id>/events?token=<token> instead. The token only grants
+    that stream and stays valid for reconnects until it expires.
+    """
+    try:
+        session = get_db()
+        try:
+            exists = session.query(WorkflowDescriptionState.id).filter_by(job_id=job_id).first() is not None
+        finally:
+            session.close()
+    except Exception as e:
+        logger.error(f"Error issuing events token: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    if not exists:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    token, expires = issue_events_token(job_id)
+    return jsonify({
+        'success': True,
+        'token': token,
+        'expires_at': datetime.fromtimestamp(expires, timezone.utc).isoformat(),
+        'events_url': f"/jobs/{job_id}/events?token={token}"
+    }), 200
+
+
 @descriptions_bp.route('/descriptions/<novel_name>', methods=['GET'])
 def list_descriptions(novel_name):
     """List all description files for a novel"""
@@ -306,26 +585,83 @@ def list_descriptions(novel_name):
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@descriptions_bp.route('/exports/<novel_name>', methods=['GET'])
+def export_descriptions(novel_name):
+    """
+    Stream every description of a novel in one response.
+    
+    Served outside /descriptions/<novel_name>/ so it cannot shadow the
+    preview of a video named 'export'.
+    
+    Query parameters:
+        format: 'ndjson' (default; one {"video_name", "description"} object
+            per line) or 'zip' (one '<video_name>.txt' file per description)
+    
+    Descriptions that cannot be downloaded are reported per video (an
+    {"video_name", "error"} line, or a line in the zip's _export_errors.txt)
+    and the export continues.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'zip'):
+        return jsonify({'success': False, 'error': "format must be 'ndjson' or 'zip'"}), 400
+    
+    exporter = DescriptionExporter()
+    descriptions = exporter.iter_descriptions(novel_name)
+    
+    try:
+        # Fetch the first description before committing to a 200 response
+        first = next(descriptions, None)
+    except Exception as e:
+        descriptions.close()
+        logger.error(f"Error exporting descriptions: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    if first is None:
+        return jsonify({'success': False, 'error': 'No descriptions found'}), 404
+    
+    descriptions = itertools.chain([first], descriptions)
+    
+    if export_format == 'zip':
+        filename = secure_filename(novel_name) or 'descriptions'
+        return Response(
+            exporter.zip(descriptions),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename="{filename}.zip"'}
+        )
+    
+    return Response(exporter.ndjson(descriptions), mimetype='application/x-ndjson')
+
+
 @descriptions_bp.route('/descriptions/<novel_name>/<video_name>', methods=['GET'])
 def get_description(novel_name, video_name):
-    """Get a specific description for preview"""
+    """
+    Get a specific description for preview.
+    
+    The response carries the S3 object's ETag; a request whose
+    If-None-Match still matches gets an empty 304.
+    """
     try:
         s3_service = S3Service()
-        description = s3_service.get_description(novel_name, video_name)
+        stored = description_cache.fetch(s3_service, novel_name, video_name)
         
-        if description is None:
+        if stored is None:
             return jsonify({
                 'success': False,
                 'error': 'Description not found'
             }), 404
         
-        return jsonify({
+        etag, description = stored
+        response = jsonify({
             'success': True,
             'novel_name': novel_name,
             'video_name': video_name,
             'description': description
-        }), 200
-        
+        })
+        response.set_etag(etag)
+        # Let browsers keep the body but revalidate on every use
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    
     except Exception as e:
         logger.error(f"Error getting description: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -337,8 +673,12 @@ def get_novel_context(novel_name):
     try:
         session = get_db()
         try:
-            # Query for most recent completed state by ID
-            state = session.query(WorkflowDescriptionState)\
+            # Most recent completed state by ID (idx_description_state_novel_status_id)
+            state = session.query(
+                WorkflowDescriptionState.novel_context,
+                WorkflowDescriptionState.playlist_url,
+                WorkflowDescriptionState.subscribe_text
+            )\
                 .filter_by(novel_name=novel_name, status='completed')\
                 .order_by(WorkflowDescriptionState.id.desc())\
                 .first()
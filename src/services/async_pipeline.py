@@ -0,0 +1,210 @@
+"""asyncio pipeline for per-video description work"""
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.config import config
+from src.services.async_s3_service import AsyncS3Service
+from src.services.job_timings import JobTimings
+from src.services.metrics import VIDEO_SECONDS
+from src.services.progress_service import JobProgressWriter
+from src.services.template_service import TemplateService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDescriptionPipeline:
+    """
+    Read -> render -> write for the videos of one novel, as asyncio tasks.
+    
+    Each video is one task on the engine's event loop; a semaphore keeps at
+    most `concurrency` of them in flight per job, and the shared async S3
+    pool caps in-flight requests across all jobs of the process. Progress
+    counters are flushed from a worker thread so the loop never blocks on
+    the database.
+    """
+    
+    def __init__(
+        self,
+        s3_service: AsyncS3Service,
+        novel_name: str,
+        render: Callable[[str], str],
+        validate: Callable[[str], Tuple[bool, str]] = TemplateService.validate_description,
+        should_skip: Optional[Callable[[Dict[str, str]], Awaitable[bool]]] = None,
+        on_saved: Optional[Callable[[Dict[str, str]], Awaitable[None]]] = None,
+        existing_etag: Optional[Callable[[Dict[str, str]], Awaitable[Optional[str]]]] = None,
+        progress: Optional[JobProgressWriter] = None,
+        timings: Optional[JobTimings] = None,
+        concurrency: Optional[int] = None
+    ):
+        """
+        Args:
+            s3_service: Async S3 service
+            novel_name: Name of the novel
+            render: Builds a description from timestamp file content
+            validate: Returns (is_valid, error) for a rendered description
+            should_skip: Async predicate returning True for files that need no work
+            on_saved: Awaited with the file info after its description was saved
+            existing_etag: Async lookup of the stored description's ETag (None if
+                absent) so identical descriptions are not uploaded again
+            progress: Progress writer created with auto_flush=False
+            timings: Receives per-video read, render, write and end-to-end durations
+            concurrency: Videos in flight (defaults to ASYNC_JOB_CONCURRENCY)
+        """
+        self.s3_service = s3_service
+        self.novel_name = novel_name
+        self.render = render
+        self.validate = validate
+        self.should_skip = should_skip
+        self.on_saved = on_saved
+        self.existing_etag = existing_etag
+        self.progress = progress
+        self.timings = timings
+        self.concurrency = max(1, concurrency or config.ASYNC_JOB_CONCURRENCY)
+        
+        self._flush_wanted = None
+        self._counts = {
+            'total_videos': 0,
+            'descriptions_generated': 0,
+            'written': 0,
+            'unchanged': 0,
+            'skipped': 0,
+            'failed': 0,
+            'listing_complete': False
+        }
+    
+    async def run(self, timestamp_files: AsyncIterable[Dict[str, str]]) -> Dict[str, int]:
+        """
+        Process every timestamp file and wait for all videos to finish.
+        
+        Args:
+            timestamp_files: Async iterable of dicts with 'key' and 'video_name',
+                consumed lazily so processing starts with the first listing page
+        
+        Returns:
+            Final counters: total_videos, descriptions_generated (written, unchanged
+            and skipped), failed and listing_complete
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        self._flush_wanted = asyncio.Event()
+        flusher = asyncio.create_task(self._flush_progress()) if self.progress else None
+        
+        try:
+            async for file_info in timestamp_files:
+                self._record(total_videos=1)
+                # Wait for a free slot before listing further ahead
+                await semaphore.acquire()
+                task = asyncio.create_task(self._process(file_info, semaphore))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            
+            self._counts['listing_complete'] = True
+            if self.progress:
+                self.progress.set(listing_complete=True)
+            
+            if tasks:
+                await asyncio.gather(*tasks)
+        
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        finally:
+            if flusher:
+                flusher.cancel()
+        
+        return dict(self._counts)
+    
+    def _record(self, started: Optional[float] = None, **increments):
+        """
+        Update counters and report progress.
+        
+        Args:
+            started: perf_counter() when the video was picked up; given once
+                per video, with the increments of its outcome
+            **increments: Counter increments
+        """
+        if started is not None:
+            outcome = next(name for name in ('failed', 'skipped', 'written', 'unchanged') if name in increments)
+            elapsed = time.perf_counter() - started
+            VIDEO_SECONDS.labels(outcome).observe(elapsed)
+            if self.timings:
+                self.timings.observe('video', elapsed)
+        
+        for name, value in increments.items():
+            self._counts[name] += value
+        
+        if self.progress:
+            self.progress.increment(**increments)
+            if self.progress.is_due():
+                self._flush_wanted.set()
+    
+    def _observe(self, step: str, since: float):
+        """Record a per-video step that began at `since` (perf_counter())"""
+        if self.timings:
+            self.timings.observe(step, time.perf_counter() - since)
+    
+    async def _process(self, file_info: Dict[str, str], semaphore: asyncio.Semaphore):
+        """Skip check, download, render, validate and upload one video"""
+        video_name = file_info['video_name']
+        started = time.perf_counter()
+        try:
+            if self.should_skip and await self.should_skip(file_info):
+                logger.info(f"Description already exists for {video_name}, skipping")
+                self._record(started, descriptions_generated=1, skipped=1)
+                return
+            
+            step_started = time.perf_counter()
+            timestamps = await self.s3_service.read_timestamp_file(self.novel_name, video_name)
+            self._observe('read', step_started)
+            
+            step_started = time.perf_counter()
+            description = self.render(timestamps)
+            
+            is_valid, error = self.validate(description)
+            self._observe('render', step_started)
+            if not is_valid:
+                logger.error(f"Invalid description for {video_name}: {error}")
+                self._record(started, failed=1)
+                return
+            
+            step_started = time.perf_counter()
+            existing_etag = await self.existing_etag(file_info) if self.existing_etag else None
+            written = await self.s3_service.save_description(self.novel_name, video_name, description, existing_etag)
+            self._observe('write', step_started)
+            if written:
+                self._record(started, descriptions_generated=1, written=1)
+            else:
+                self._record(started, descriptions_generated=1, unchanged=1)
+        
+        except Exception as e:
+            logger.error(f"Error processing video {video_name}: {e}")
+            self._record(started, failed=1)
+            return
+        
+        finally:
+            semaphore.release()
+        
+        if self.on_saved:
+            try:
+                await self.on_saved(file_info)
+            except Exception as e:
+                logger.error(f"Error recording saved description for {video_name}: {e}")
+    
+    async def _flush_progress(self):
+        """Flush progress from a worker thread whenever a flush is due"""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wanted.wait(), timeout=self.progress.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wanted.clear()
+            
+            try:
+                await asyncio.to_thread(self.progress.flush)
+            except Exception:
+                # Already logged; the writer keeps the updates for the next flush
+                pass
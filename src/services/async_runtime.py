@@ -0,0 +1,52 @@
+"""Process-wide asyncio event loop for the asyncio job engine"""
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Coroutine
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loop = None
+_pid = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get this process's engine event loop, starting it on first use.
+    
+    The loop runs forever in a daemon thread. Every job of the process
+    shares it, together with the async clients bound to it, so any number of
+    jobs adds tasks rather than threads.
+    
+    Returns:
+        Running event loop
+    """
+    global _loop, _pid
+    
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            # First use in this process (a forked child cannot reuse the parent's loop thread)
+            _loop = asyncio.new_event_loop()
+            _pid = os.getpid()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="async-engine-loop",
+                daemon=True
+            ).start()
+            logger.info("Started asyncio job engine event loop")
+        return _loop
+
+
+def run(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on the engine loop and block the calling thread until it finishes.
+    
+    Args:
+        coro: Coroutine to run
+    
+    Returns:
+        The coroutine's result (its exception is re-raised here)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
@@ -0,0 +1,282 @@
+"""Async S3/R2 storage service for the asyncio job engine"""
+import base64
+import hashlib
+import logging
+import xml.etree.ElementTree as ElementTree
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import quote
+
+from botocore.auth import S3SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.credentials import Credentials
+from botocore.exceptions import ClientError
+
+from src.config import config
+from src.services.clients import get_async_s3_http_client
+from src.services.description_cache import description_cache
+from src.services.metrics import S3_OPERATION_SECONDS
+from src.services.resilience import s3_dependency
+
+logger = logging.getLogger(__name__)
+
+# Namespace of ListObjectsV2 responses
+_S3_NS = '{http://s3.amazonaws.com/doc/2006-03-01/}'
+
+
+class AsyncS3Service:
+    """
+    Async counterpart of S3Service for the operations a job needs.
+    
+    Requests are signed with botocore's SigV4 signer and sent over the shared
+    httpx.AsyncClient, so no extra S3 dependency is needed. Errors are raised
+    as botocore ClientError with the same codes S3Service callers see, and
+    requests share S3Service's retries and circuit breaker (s3_dependency).
+    """
+    
+    def __init__(self):
+        """Initialize with the shared per-process async HTTP client"""
+        self.client = get_async_s3_http_client()
+        self.bucket = config.S3_BUCKET_NAME
+        self.endpoint = (config.S3_ENDPOINT or f"https://s3.{config.S3_REGION}.amazonaws.com").rstrip('/')
+        self._signer = S3SigV4Auth(
+            Credentials(config.S3_ACCESS_KEY_ID, config.S3_SECRET_ACCESS_KEY),
+            's3',
+            config.S3_REGION
+        )
+    
+    async def iter_timestamp_files(self, novel_name: str, start_after: Optional[str] = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Lazily list timestamp files for a novel, one listing page at a time.
+        
+        Args:
+            novel_name: Name of the novel
+            start_after: Only yield videos listed after this video name
+        
+        Yields:
+            Dicts with 'key', 'video_name', 'size' and 'etag' for each timestamp file
+        """
+        prefix = f"{novel_name}/Timestamps/"
+        logger.info(f"Fetching timestamp files from: {prefix}")
+        
+        async for info in self._iter_files(prefix, start_after):
+            yield info
+    
+    async def iter_descriptions(self, novel_name: str, start_after: Optional[str] = None) -> AsyncIterator[Dict[str, str]]:
+        """
+        Lazily list description files for a novel, one listing page at a time.
+        
+        Args:
+            novel_name: Name of the novel
+            start_after: Only yield videos listed after this video name
+        
+        Yields:
+            Dicts with 'key', 'video_name', 'size' and 'etag' for each description
+        """
+        async for info in self._iter_files(f"{novel_name}/Youtube/", start_after):
+            yield info
+    
+    async def snapshot_descriptions(self, novel_name: str) -> Dict[str, Dict]:
+        """
+        Snapshot all existing descriptions for a novel.
+        
+        Args:
+            novel_name: Name of the novel
+        
+        Returns:
+            Dict of video name -> {'key', 'video_name', 'size', 'etag'}
+        """
+        snapshot = {info['video_name']: info async for info in self.iter_descriptions(novel_name)}
+        
+        logger.info(f"Found {len(snapshot)} existing descriptions for novel: {novel_name}")
+        return snapshot
+    
+    async def read_timestamp_file(self, novel_name: str, video_name: str) -> str:
+        """
+        Read timestamp file content from S3.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        
+        Returns:
+            Timestamp file content as string
+        """
+        key = f"{novel_name}/Timestamps/{video_name}.txt"
+        response = await self._request('GET', key, operation='GetObject')
+        return response.content.decode('utf-8')
+    
+    async def save_description(
+        self,
+        novel_name: str,
+        video_name: str,
+        description: str,
+        existing_etag: Optional[str] = None
+    ) -> bool:
+        """
+        Save description to S3, skipping the upload if it is already stored.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+            description: Description content to save
+            existing_etag: ETag of the stored description (from a listing or
+                description_etag()); None uploads unconditionally
+        
+        Returns:
+            True if the description was uploaded, False if the stored object
+            already had identical content
+        """
+        key = f"{novel_name}/Youtube/{video_name}.txt"
+        body = description.encode('utf-8')
+        digest = hashlib.md5(body)
+        
+        # Single-part uploads have the hex MD5 of the body as their ETag
+        if existing_etag and existing_etag.strip('"') == digest.hexdigest():
+            return False
+        
+        await self._request(
+            'PUT',
+            key,
+            body=body,
+            headers={
+                'Content-Type': 'text/plain',
+                'Content-MD5': base64.b64encode(digest.digest()).decode('ascii')
+            },
+            operation='PutObject'
+        )
+        description_cache.invalidate(novel_name, video_name)
+        return True
+    
+    async def description_etag(self, novel_name: str, video_name: str) -> Optional[str]:
+        """
+        Get the ETag of a description file with a HEAD request.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        
+        Returns:
+            ETag without quotes, or None if the description does not exist
+        """
+        key = f"{novel_name}/Youtube/{video_name}.txt"
+        try:
+            response = await self._request('HEAD', key, operation='HeadObject')
+            return response.headers.get('ETag', '').strip('"')
+        except ClientError as e:
+            if e.response['Error']['Code'] == '404':
+                return None
+            raise
+    
+    async def description_exists(self, novel_name: str, video_name: str) -> bool:
+        """
+        Check if a description file already exists.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        
+        Returns:
+            True if description exists
+        """
+        key = f"{novel_name}/Youtube/{video_name}.txt"
+        try:
+            await self._request('HEAD', key, operation='HeadObject')
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == '404':
+                return False
+            raise
+    
+    async def _iter_files(self, prefix: str, start_after: Optional[str]) -> AsyncIterator[Dict[str, str]]:
+        """List '<prefix><video>.txt' objects as file info dicts, following continuation tokens"""
+        params = {'list-type': '2', 'prefix': prefix}
+        if start_after:
+            params['start-after'] = f"{prefix}{start_after}.txt"
+        
+        while True:
+            response = await self._request('GET', params=params, operation='ListObjectsV2')
+            root = ElementTree.fromstring(response.content)
+            
+            for entry in root.iter(f'{_S3_NS}Contents'):
+                key = entry.findtext(f'{_S3_NS}Key')
+                video_name = key.replace(prefix, '').replace('.txt', '')
+                if video_name:
+                    size = entry.findtext(f'{_S3_NS}Size')
+                    yield {
+                        'key': key,
+                        'video_name': video_name,
+                        'size': int(size) if size is not None else None,
+                        'etag': (entry.findtext(f'{_S3_NS}ETag') or '').strip('"')
+                    }
+            
+            if root.findtext(f'{_S3_NS}IsTruncated') != 'true':
+                return
+            
+            params['continuation-token'] = root.findtext(f'{_S3_NS}NextContinuationToken')
+            # start-after is ignored once a continuation token is sent
+            params.pop('start-after', None)
+    
+    async def _request(
+        self,
+        method: str,
+        key: str = '',
+        params: Optional[Dict[str, str]] = None,
+        body: bytes = b'',
+        headers: Optional[Dict[str, str]] = None,
+        operation: str = ''
+    ):
+        """
+        Send a signed path-style request for the bucket (or one of its keys),
+        retrying transient errors.
+        
+        Raises:
+            ClientError: On any non-2xx response
+            CircuitOpenError: If S3 is failing fast
+        """
+        url = f"{self.endpoint}/{self.bucket}/{quote(key, safe='/~')}"
+        if params:
+            # Sorted and fully encoded so the signed canonical query matches the sent one
+            query = '&'.join(
+                f"{quote(name, safe='~')}={quote(value, safe='~')}"
+                for name, value in sorted(params.items())
+            )
+            url = f"{url}?{query}"
+        
+        with S3_OPERATION_SECONDS.labels(operation).time():
+            return await s3_dependency.acall(lambda: self._send(method, url, body, headers, operation))
+    
+    async def _send(self, method: str, url: str, body: bytes, headers: Optional[Dict[str, str]], operation: str):
+        """Sign (afresh for every attempt) and send one request"""
+        aws_request = AWSRequest(method=method, url=url, data=body, headers=headers or {})
+        self._signer.add_auth(aws_request)
+        
+        response = await self.client.request(
+            method,
+            url,
+            content=body or None,
+            headers=dict(aws_request.headers.items())
+        )
+        
+        if response.status_code >= 300:
+            code = str(response.status_code)
+            message = response.reason_phrase
+            if response.content:
+                try:
+                    error = ElementTree.fromstring(response.content)
+                    code = error.findtext('Code') or code
+                    message = error.findtext('Message') or message
+                except ElementTree.ParseError:
+                    pass
+            raise ClientError(
+                {
+                    'Error': {'Code': code, 'Message': message},
+                    # Read by resilience.classify_error() and retry_after()
+                    'ResponseMetadata': {
+                        'HTTPStatusCode': response.status_code,
+                        'HTTPHeaders': {name.lower(): value for name, value in response.headers.items()}
+                    }
+                },
+                operation or method
+            )
+        
+        return response
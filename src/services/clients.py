@@ -0,0 +1,169 @@
+"""Process-scoped S3 and OpenAI clients"""
+import logging
+import os
+import threading
+
+import boto3
+import httpx
+from botocore.config import Config as BotoConfig
+from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
+
+from src.config import config
+from src.utils.async_http import ShardedAsyncClient
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_clients = {}
+_pid = os.getpid()
+
+
+def _get_or_create(name, factory):
+    """Return the named client for this process, creating it once"""
+    global _pid
+    
+    client = _clients.get(name)
+    if client is not None and _pid == os.getpid():
+        return client
+    
+    with _lock:
+        if _pid != os.getpid():
+            # Defensive: the at-fork hook did not run in this child
+            _clients.clear()
+            _pid = os.getpid()
+        
+        client = _clients.get(name)
+        if client is None:
+            client = factory()
+            _clients[name] = client
+        return client
+
+
+def get_s3_client():
+    """
+    Get the shared boto3 S3 client for this process.
+    
+    boto3 clients are thread-safe, so routes, pipeline threads and jobs all
+    share one connection pool instead of paying TLS setup per request.
+    
+    Returns:
+        boto3 S3 client
+    """
+    def create():
+        logger.info(f"Creating S3 client (max_pool_connections={config.S3_MAX_POOL_CONNECTIONS})")
+        return boto3.client(
+            's3',
+            endpoint_url=config.S3_ENDPOINT,
+            aws_access_key_id=config.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=config.S3_SECRET_ACCESS_KEY,
+            region_name=config.S3_REGION,
+            config=BotoConfig(
+                max_pool_connections=config.S3_MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True,
+                # Retried by s3_dependency (see resilience), not by botocore
+                retries={'mode': 'standard', 'total_max_attempts': 1}
+            )
+        )
+    
+    return _get_or_create('s3', create)
+
+
+def get_openai_client():
+    """
+    Get the shared Azure OpenAI / OpenAI client for this process.
+    
+    Returns:
+        AzureOpenAI or OpenAI client, depending on USE_AZURE_OPENAI
+    """
+    def create():
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=config.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS,
+                keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        )
+        
+        if config.USE_AZURE_OPENAI:
+            return AzureOpenAI(
+                api_key=config.OPENAI_API_KEY,
+                api_version="2024-10-21",  # Updated API version for newer features
+                azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
+                http_client=http_client,
+                # Retried by openai_dependency (see resilience), not by the SDK
+                max_retries=0
+            )
+        return OpenAI(api_key=config.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+    
+    return _get_or_create('openai', create)
+
+
+def get_async_openai_client():
+    """
+    Get the shared async Azure OpenAI / OpenAI client for this process.
+    
+    Only use it from the asyncio engine's event loop (see async_runtime);
+    its connections belong to that loop.
+    
+    Returns:
+        AsyncAzureOpenAI or AsyncOpenAI client, depending on USE_AZURE_OPENAI
+    """
+    def create():
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS,
+                keepalive_expiry=config.OPENAI_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        )
+        
+        if config.USE_AZURE_OPENAI:
+            return AsyncAzureOpenAI(
+                api_key=config.OPENAI_API_KEY,
+                api_version="2024-10-21",
+                azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
+                http_client=http_client,
+                max_retries=0
+            )
+        return AsyncOpenAI(api_key=config.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+    
+    return _get_or_create('async_openai', create)
+
+
+def get_async_s3_http_client():
+    """
+    Get the shared async HTTP client used by AsyncS3Service.
+    
+    It is the process-wide cap on in-flight S3 requests from the asyncio
+    engine; requests beyond S3_ASYNC_MAX_CONNECTIONS wait for a free
+    connection instead of failing.
+    
+    Returns:
+        ShardedAsyncClient
+    """
+    def create():
+        logger.info(f"Creating async S3 HTTP client (max_connections={config.S3_ASYNC_MAX_CONNECTIONS})")
+        return ShardedAsyncClient(
+            max_connections=config.S3_ASYNC_MAX_CONNECTIONS,
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    
+    return _get_or_create('async_s3_http', create)
+
+
+def reset_clients():
+    """
+    Forget all clients (runs in the child after fork).
+    
+    Pools inherited from the parent share sockets with it and must not be
+    reused, so the child simply builds fresh clients on first use.
+    """
+    global _lock, _pid
+    _lock = threading.Lock()
+    _clients.clear()
+    _pid = os.getpid()
+
+
+os.register_at_fork(after_in_child=reset_clients)
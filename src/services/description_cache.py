@@ -0,0 +1,78 @@
+"""In-process cache for description previews"""
+import logging
+from typing import Optional, Tuple
+
+from src.config import config
+from src.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class DescriptionCache:
+    """
+    Recently read descriptions with the S3 ETag they were read at.
+    
+    Entries are never trusted blindly: fetch() revalidates them with a
+    conditional GET, which costs a body-less 304 while the object is
+    unchanged and picks up writes from other processes. Saves from this
+    process drop the entry right away.
+    """
+    
+    def __init__(self, maxsize: int = None, max_bytes: int = None):
+        """
+        Args:
+            maxsize: Max entries (defaults to DESCRIPTION_CACHE_SIZE)
+            max_bytes: Max total description bytes (defaults to DESCRIPTION_CACHE_MAX_BYTES)
+        """
+        self._memory = LRUCache(
+            maxsize=config.DESCRIPTION_CACHE_SIZE if maxsize is None else maxsize,
+            max_bytes=config.DESCRIPTION_CACHE_MAX_BYTES if max_bytes is None else max_bytes,
+            sizeof=lambda entry: len(entry[1].encode('utf-8'))
+        )
+    
+    def fetch(self, s3_service, novel_name: str, video_name: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the current description, from memory when S3 confirms it is unchanged.
+        
+        Args:
+            s3_service: S3Service used for the (conditional) GET
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        
+        Returns:
+            (etag, description), or None if the description does not exist
+        """
+        key = (novel_name, video_name)
+        cached = self._memory.get(key)
+        
+        stored = s3_service.get_description_object(
+            novel_name,
+            video_name,
+            if_none_match=cached[0] if cached else None
+        )
+        
+        if stored is None:
+            self._memory.pop(key)
+            return None
+        
+        if stored['description'] is None:
+            # 304: the cached copy is current
+            return cached
+        
+        entry = (stored['etag'], stored['description'])
+        self._memory.set(key, entry)
+        return entry
+    
+    def invalidate(self, novel_name: str, video_name: str):
+        """
+        Drop a description after it was written.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        """
+        self._memory.pop((novel_name, video_name))
+
+
+# Process-wide cache shared by all request threads
+description_cache = DescriptionCache()
@@ -0,0 +1,193 @@
+"""Streaming bulk export of a novel's descriptions"""
+import json
+import logging
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from src.config import config
+from src.services.s3_service import S3Service
+
+logger = logging.getLogger(__name__)
+
+# Zip member listing the descriptions that could not be exported
+ZIP_ERRORS_MEMBER = '_export_errors.txt'
+
+
+class _ChunkBuffer:
+    """
+    Write-only, unseekable file object collecting zip output between yields.
+    
+    ZipFile detects that tell()/seek() are unavailable and writes data
+    descriptors after each member instead of seeking back to patch headers.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written so far"""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class DescriptionExporter:
+    """
+    Streams every description of a novel in listing order.
+    
+    Descriptions are downloaded by a small thread pool while earlier ones
+    are being written to the response. At most EXPORT_CONCURRENCY * 2
+    downloads are queued ahead of the client, so memory stays bounded no
+    matter how many episodes the novel has or how slowly the client reads.
+    A description that cannot be downloaded is reported in place and the
+    export carries on with the next one.
+    """
+    
+    def __init__(self, s3_service: S3Service = None, concurrency: int = None):
+        """
+        Args:
+            s3_service: S3 service (defaults to a new S3Service)
+            concurrency: Parallel S3 downloads (defaults to EXPORT_CONCURRENCY)
+        """
+        self.s3_service = s3_service or S3Service()
+        self.concurrency = max(1, concurrency or config.EXPORT_CONCURRENCY)
+    
+    def iter_descriptions(self, novel_name: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Lazily download all descriptions of a novel.
+        
+        Args:
+            novel_name: Name of the novel
+        
+        Yields:
+            (video_name, description, error) in listing order; error is the
+            download error (description None) for descriptions that could not
+            be read. Descriptions deleted after the listing are left out
+        
+        Raises:
+            Exception: If listing fails, after the descriptions listed so far
+        """
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="export")
+        window = deque()
+        
+        listing_error = None
+        
+        try:
+            try:
+                for info in self.s3_service.iter_descriptions(novel_name):
+                    window.append((
+                        info['video_name'],
+                        executor.submit(self.s3_service.get_description, novel_name, info['video_name'])
+                    ))
+                    if len(window) >= self.concurrency * 2:
+                        yield from self._ready(window.popleft())
+            except Exception as e:
+                # Deliver what was listed before the listing broke off
+                listing_error = e
+            
+            while window:
+                yield from self._ready(window.popleft())
+            
+            if listing_error is not None:
+                raise listing_error
+        
+        finally:
+            # Runs when the client disconnects too: drop queued downloads
+            for _, future in window:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _ready(item) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Wait for one queued download"""
+        video_name, future = item
+        try:
+            description = future.result()
+        except Exception as e:
+            # One unreadable description must not end the whole export
+            logger.error(f"Error exporting description {video_name}: {e}")
+            yield video_name, None, str(e)
+            return
+        
+        if description is not None:
+            yield video_name, description, None
+    
+    @staticmethod
+    def ndjson(descriptions: Iterator[Tuple[str, Optional[str], Optional[str]]]) -> Iterator[str]:
+        """
+        Format descriptions as newline-delimited JSON.
+        
+        A description that could not be downloaded is a
+        {"video_name": ..., "error": ...} line. A listing failure after
+        streaming has started is reported as a final {"error": ...} line,
+        since the status code has already been sent.
+        
+        Args:
+            descriptions: Items from iter_descriptions()
+        
+        Yields:
+            One JSON object per line
+        """
+        try:
+            for video_name, description, error in descriptions:
+                if error is not None:
+                    yield json.dumps({'video_name': video_name, 'error': error}) + '\n'
+                else:
+                    yield json.dumps({'video_name': video_name, 'description': description}) + '\n'
+        except Exception as e:
+            logger.error(f"Error exporting descriptions: {e}")
+            yield json.dumps({'error': str(e)}) + '\n'
+    
+    @staticmethod
+    def zip(descriptions: Iterator[Tuple[str, Optional[str], Optional[str]]]) -> Iterator[bytes]:
+        """
+        Format descriptions as a zip archive of '<video_name>.txt' files.
+        
+        Each member is yielded as soon as it is compressed. Descriptions that
+        could not be downloaded, and a listing failure after streaming has
+        started, are listed in a final ZIP_ERRORS_MEMBER file; the archive is
+        always finished with its central directory, so it stays readable.
+        
+        Args:
+            descriptions: Items from iter_descriptions()
+        
+        Yields:
+            Chunks of the archive
+        """
+        buffer = _ChunkBuffer()
+        date_time = time.localtime()[:6]
+        archive = zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED)
+        errors = []
+        
+        try:
+            for video_name, description, error in descriptions:
+                if error is not None:
+                    errors.append(f"{video_name}: {error}")
+                    continue
+                
+                member = zipfile.ZipInfo(f"{video_name}.txt", date_time=date_time)
+                member.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(member, description.encode('utf-8'))
+                yield buffer.drain()
+        except Exception as e:
+            logger.error(f"Error exporting descriptions: {e}")
+            errors.append(f"Export stopped early: {e}")
+        
+        if errors:
+            member = zipfile.ZipInfo(ZIP_ERRORS_MEMBER, date_time=date_time)
+            member.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(member, ('\n'.join(errors) + '\n').encode('utf-8'))
+        
+        # Central directory
+        archive.close()
+        yield buffer.drain()
@@ -0,0 +1,132 @@
+"""Job update notifications for long-poll and Server-Sent Events clients"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from src.config import config
+from src.models.database import get_db
+from src.models.description_state import WorkflowDescriptionState
+from src.services.notification_service import notification_listener, notify
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel carrying the job_id of every changed job
+JOB_UPDATES_CHANNEL = 'job_updates'
+
+
+def publish_job_update(session, job_id: str):
+    """
+    Announce a job change to waiting clients in every process.
+    
+    Call inside the transaction that bumps the job's version; PostgreSQL
+    delivers the notification when it commits.
+    
+    Args:
+        session: Session of the transaction that changes the job
+        job_id: Changed job
+    """
+    notify(session, JOB_UPDATES_CHANNEL, job_id)
+
+
+class JobUpdateWaiter:
+    """
+    Blocks request threads until a job's version changes.
+    
+    Waiters are woken by NOTIFYs on JOB_UPDATES_CHANNEL and then confirm the
+    change with a single-column version query. While the LISTEN connection
+    is down (or not on PostgreSQL) they fall back to checking the version
+    every JOB_WAIT_POLL_INTERVAL seconds, which is still far cheaper than
+    clients reloading the full row.
+    """
+    
+    def __init__(self, poll_interval: float = None):
+        """
+        Args:
+            poll_interval: Seconds between version checks without notifications
+        """
+        self.poll_interval = config.JOB_WAIT_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._lock = threading.Lock()
+        self._waiters: Dict[str, Set[threading.Event]] = {}
+        self._subscribed_pid = None
+    
+    def wait_for_change(self, job_id: str, since_version: Optional[int], timeout: float) -> Optional[int]:
+        """
+        Wait until the job's version differs from since_version.
+        
+        Args:
+            job_id: Job to watch
+            since_version: Version the client already has (None returns at once)
+            timeout: Max seconds to wait
+        
+        Returns:
+            Current version (equal to since_version on timeout), or None if
+            the job does not exist
+        """
+        self._ensure_subscribed()
+        deadline = time.monotonic() + timeout
+        
+        # Register before the first check so a change in between is not missed
+        event = threading.Event()
+        with self._lock:
+            self._waiters.setdefault(job_id, set()).add(event)
+        
+        try:
+            while True:
+                version = self._current_version(job_id)
+                if version is None or since_version is None or version != since_version:
+                    return version
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return version
+                
+                if not notification_listener.is_listening(JOB_UPDATES_CHANNEL):
+                    remaining = min(remaining, self.poll_interval)
+                event.wait(remaining)
+                event.clear()
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(job_id)
+                if waiters is not None:
+                    waiters.discard(event)
+                    if not waiters:
+                        del self._waiters[job_id]
+    
+    def _on_update(self, job_id: Optional[str]):
+        """Wake waiters for a job; None (listener reconnect) wakes everyone"""
+        with self._lock:
+            if job_id is None:
+                events = [event for waiters in self._waiters.values() for event in waiters]
+            else:
+                events = list(self._waiters.get(job_id, ()))
+        
+        for event in events:
+            event.set()
+    
+    def _ensure_subscribed(self):
+        """Subscribe to job updates once per process"""
+        if self._subscribed_pid != os.getpid():
+            self._subscribed_pid = os.getpid()
+            with self._lock:
+                self._waiters = {}
+            notification_listener.subscribe(JOB_UPDATES_CHANNEL, self._on_update)
+    
+    @staticmethod
+    def _current_version(job_id: str) -> Optional[int]:
+        """Fetch only the version of a job (None if it does not exist)"""
+        session = get_db()
+        try:
+            row = session.query(WorkflowDescriptionState.version)\
+                .filter_by(job_id=job_id)\
+                .first()
+            if row is None:
+                return None
+            return row.version or 1
+        finally:
+            session.close()
+
+
+# Process-wide waiter shared by all request threads
+job_update_waiter = JobUpdateWaiter()
@@ -0,0 +1,276 @@
+"""Durable Postgres-backed job queue"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, or_
+
+from src.config import config
+from src.models.batch import DescriptionBatch
+from src.models.database import get_db_session
+from src.models.description_state import WorkflowDescriptionState
+from src.models.job_queue import DescriptionJobQueue
+from src.services.job_events import publish_job_update
+from src.services.metrics import JOBS
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Queue of description jobs shared by every worker process.
+    
+    Workers claim entries with SELECT ... FOR UPDATE SKIP LOCKED, so any
+    number of workers on any number of nodes can poll concurrently without
+    handing the same job out twice. A claimed entry is leased to its worker;
+    the worker renews the lease with heartbeats, and an entry whose
+    heartbeat is older than JOB_VISIBILITY_TIMEOUT is handed out again.
+    """
+    
+    @staticmethod
+    def enqueue(session, job_id: str, payload: dict, batch_id: Optional[str] = None):
+        """
+        Add a job to the queue (committed together with the caller's transaction).
+        
+        Args:
+            session: Open database session
+            job_id: workflow_description_state.job_id
+            payload: Run options for the worker
+            batch_id: Batch whose concurrency budget the job shares, if any
+        """
+        session.add(DescriptionJobQueue(
+            job_id=job_id,
+            batch_id=batch_id,
+            payload=payload,
+            status='queued',
+            attempts=0,
+            max_attempts=config.JOB_MAX_ATTEMPTS,
+            available_at=datetime.now(timezone.utc)
+        ))
+    
+    @staticmethod
+    def claim(worker_id: str) -> Optional[dict]:
+        """
+        Lease the next available job.
+        
+        Args:
+            worker_id: Identifier of the claiming worker
+        
+        Returns:
+            Claimed entry as a dict, or None if nothing is available
+        """
+        full_batches = set()
+        
+        while True:
+            now = datetime.now(timezone.utc)
+            stale_before = now - timedelta(seconds=config.JOB_VISIBILITY_TIMEOUT)
+            
+            with get_db_session() as session:
+                query = session.query(DescriptionJobQueue)\
+                    .filter(or_(
+                        and_(
+                            DescriptionJobQueue.status == 'queued',
+                            DescriptionJobQueue.available_at <= now
+                        ),
+                        and_(
+                            DescriptionJobQueue.status == 'running',
+                            DescriptionJobQueue.heartbeat_at < stale_before
+                        )
+                    ))
+                if full_batches:
+                    query = query.filter(or_(
+                        DescriptionJobQueue.batch_id.is_(None),
+                        DescriptionJobQueue.batch_id.notin_(full_batches)
+                    ))
+                
+                entry = query\
+                    .order_by(DescriptionJobQueue.id)\
+                    .with_for_update(skip_locked=True)\
+                    .first()
+                
+                if not entry:
+                    return None
+                
+                if entry.batch_id and not JobQueue._batch_has_capacity(session, entry.batch_id, stale_before):
+                    # Leave the batch's other jobs for later; look for unrelated work
+                    full_batches.add(entry.batch_id)
+                    session.rollback()
+                    continue
+                
+                if entry.status == 'running':
+                    logger.warning(
+                        f"Reclaiming job {entry.job_id} from {entry.locked_by} "
+                        f"(no heartbeat since {entry.heartbeat_at})"
+                    )
+                    if entry.attempts >= entry.max_attempts:
+                        error = f"Worker lost after {entry.attempts} attempts"
+                        entry.status = 'failed'
+                        entry.last_error = error
+                        JobQueue._mark_state_failed(session, entry.job_id, error, now)
+                        # Committed on exit; look for another entry
+                        continue
+                
+                entry.status = 'running'
+                entry.attempts += 1
+                entry.locked_by = worker_id
+                entry.locked_at = now
+                entry.heartbeat_at = now
+                
+                return entry.to_dict()
+    
+    @staticmethod
+    def _batch_has_capacity(session, batch_id: str, stale_before: datetime) -> bool:
+        """
+        Whether a batch is below its concurrency budget.
+        
+        The batch row is locked for the rest of the claiming transaction, so
+        concurrent claims for the same batch are counted one after another
+        and cannot overshoot the budget.
+        """
+        batch = session.query(DescriptionBatch)\
+            .filter_by(batch_id=batch_id)\
+            .with_for_update()\
+            .first()
+        if batch is None:
+            return True
+        
+        running = session.query(func.count(DescriptionJobQueue.id))\
+            .filter(
+                DescriptionJobQueue.batch_id == batch_id,
+                DescriptionJobQueue.status == 'running',
+                DescriptionJobQueue.heartbeat_at >= stale_before
+            )\
+            .scalar()
+        return running < batch.max_concurrency
+    
+    @staticmethod
+    def heartbeat(worker_id: str, entry_ids: Iterable[int]):
+        """
+        Renew the lease on running entries.
+        
+        Args:
+            worker_id: Identifier of the worker holding the leases
+            entry_ids: Queue entry ids
+        """
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return
+        
+        with get_db_session() as session:
+            session.query(DescriptionJobQueue)\
+                .filter(
+                    DescriptionJobQueue.id.in_(entry_ids),
+                    DescriptionJobQueue.locked_by == worker_id,
+                    DescriptionJobQueue.status == 'running'
+                )\
+                .update({'heartbeat_at': datetime.now(timezone.utc)}, synchronize_session=False)
+    
+    @staticmethod
+    def complete(entry_id: int, worker_id: str) -> bool:
+        """
+        Mark an entry done.
+        
+        Args:
+            entry_id: Queue entry id
+            worker_id: Identifier of the worker holding the lease
+        
+        Returns:
+            False if the lease was lost (the entry was reclaimed by another worker)
+        """
+        with get_db_session() as session:
+            updated = session.query(DescriptionJobQueue)\
+                .filter(
+                    DescriptionJobQueue.id == entry_id,
+                    DescriptionJobQueue.locked_by == worker_id,
+                    DescriptionJobQueue.status == 'running'
+                )\
+                .update({'status': 'done'}, synchronize_session=False)
+        
+        if not updated:
+            logger.warning(f"Lost the lease on queue entry {entry_id}; not marking it done")
+        return bool(updated)
+    
+    @staticmethod
+    def defer(entry_id: int, worker_id: str):
+        """
+        Put a claimed entry back without counting the attempt.
+        
+        Used when another worker still runs a job for the same novel (e.g.
+        the entry was reclaimed from a worker that missed heartbeats but is
+        still alive).
+        
+        Args:
+            entry_id: Queue entry id
+            worker_id: Identifier of the worker holding the lease
+        """
+        with get_db_session() as session:
+            session.query(DescriptionJobQueue)\
+                .filter(
+                    DescriptionJobQueue.id == entry_id,
+                    DescriptionJobQueue.locked_by == worker_id,
+                    DescriptionJobQueue.status == 'running'
+                )\
+                .update({
+                    'status': 'queued',
+                    # claim() counted this attempt
+                    'attempts': DescriptionJobQueue.attempts - 1,
+                    'locked_by': None,
+                    'available_at': datetime.now(timezone.utc) + timedelta(seconds=config.JOB_RETRY_DELAY)
+                }, synchronize_session=False)
+    
+    @staticmethod
+    def fail(entry_id: int, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt; requeue with backoff unless attempts are exhausted.
+        
+        Args:
+            entry_id: Queue entry id
+            worker_id: Identifier of the worker holding the lease
+            error: Error message
+        
+        Returns:
+            False if the lease was lost (the entry was reclaimed by another worker)
+        """
+        now = datetime.now(timezone.utc)
+        
+        with get_db_session() as session:
+            entry = session.query(DescriptionJobQueue)\
+                .filter(
+                    DescriptionJobQueue.id == entry_id,
+                    DescriptionJobQueue.locked_by == worker_id,
+                    DescriptionJobQueue.status == 'running'
+                )\
+                .with_for_update()\
+                .first()
+            if not entry:
+                # The new holder's attempt decides the outcome
+                logger.warning(f"Lost the lease on queue entry {entry_id}; not recording failure: {error}")
+                return False
+            
+            entry.last_error = error
+            entry.locked_by = None
+            
+            if entry.attempts < entry.max_attempts:
+                entry.status = 'queued'
+                entry.available_at = now + timedelta(seconds=config.JOB_RETRY_DELAY * entry.attempts)
+                logger.warning(f"Job {entry.job_id} attempt {entry.attempts} failed, retrying: {error}")
+            else:
+                entry.status = 'failed'
+                JobQueue._mark_state_failed(session, entry.job_id, error, now)
+                logger.error(f"Job {entry.job_id} failed after {entry.attempts} attempts: {error}")
+        
+        return True
+    
+    @staticmethod
+    def _mark_state_failed(session, job_id: str, error: str, now: datetime):
+        """Mark the job's state row failed and notify waiting clients"""
+        session.query(WorkflowDescriptionState)\
+            .filter_by(job_id=job_id)\
+            .update({
+                'status': 'failed',
+                'error_message': error,
+                'completed_at': now,
+                'version': func.coalesce(WorkflowDescriptionState.version, 1) + 1
+            }, synchronize_session=False)
+        publish_job_update(session, job_id)
+        JOBS.labels('failed').inc()
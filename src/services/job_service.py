@@ -0,0 +1,366 @@
+"""Description generation jobs"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+
+from src.config import config
+from src.models.database import get_db
+from src.models.description_state import WorkflowDescriptionState
+from src.services import async_runtime
+from src.services.async_pipeline import AsyncDescriptionPipeline
+from src.services.async_s3_service import AsyncS3Service
+from src.services.job_events import publish_job_update
+from src.services.job_timings import JobTimings
+from src.services.manifest_service import SECTIONS_HASH_PLACEHOLDER, NovelManifest, compute_sections_hash
+from src.services.metrics import ACTIVE_JOBS, JOBS
+from src.services.novel_lock import novel_lock
+from src.services.openai_service import OpenAIService
+from src.services.pipeline_service import DescriptionPipeline
+from src.services.progress_service import JobProgressWriter
+from src.services.s3_service import S3Service
+from src.services.template_service import CompiledTemplate, TemplateService
+
+logger = logging.getLogger(__name__)
+
+# WorkflowDescriptionState column for each generated section
+SECTION_COLUMNS = {
+    'about': 'generated_about',
+    'what_to_expect': 'generated_what_to_expect',
+    'subscribe': 'generated_subscribe',
+    'tags': 'generated_tags'
+}
+
+
+@ACTIVE_JOBS.track_inprogress()
+def generate_descriptions_task(
+    job_id: str,
+    novel_name: str,
+    novel_context: str,
+    playlist_url: str,
+    subscribe_text: str,
+    force: bool = False,
+    bypass_cache: bool = False,
+    template_name: str = None
+):
+    """
+    Background task to generate descriptions for all videos.
+    Uses short-lived database transactions to avoid blocking other services.
+    
+    Args:
+        job_id: Unique job identifier
+        novel_name: Name of the novel
+        novel_context: User-provided context
+        playlist_url: Full playlist URL
+        subscribe_text: Subscribe call-to-action
+        force: Force regeneration even if descriptions exist
+        bypass_cache: Regenerate AI sections even if identical inputs are cached
+        template_name: Description template (defaults to DEFAULT_TEMPLATE_NAME)
+    
+    Raises:
+        Exception: Whatever failed the attempt (OpenAI, S3, database); the
+            job stays 'processing' so the queue can retry it. A novel without
+            timestamp files fails the job without raising.
+    """
+    def update_job_status(status, **kwargs):
+        """Helper to update job status with short-lived transaction (one UPDATE, no row load)"""
+        session = get_db()
+        try:
+            updated = session.query(WorkflowDescriptionState)\
+                .filter_by(job_id=job_id)\
+                .update({
+                    'status': status,
+                    **kwargs,
+                    'version': func.coalesce(WorkflowDescriptionState.version, 1) + 1
+                }, synchronize_session=False)
+            if updated:
+                publish_job_update(session, job_id)
+            session.commit()
+            # 'processing' updates also save sections; jobs are counted once, at start
+            if updated and status != 'processing':
+                JOBS.labels(status).inc()
+        finally:
+            session.close()
+    
+    # Where the job's time went, stored with its final status
+    timings = JobTimings()
+    counts = None
+    
+    try:
+        # A retried (or reclaimed) attempt finds the job already 'processing';
+        # JOBS counts jobs, not attempts
+        session = get_db()
+        try:
+            first_attempt = session.query(WorkflowDescriptionState.status)\
+                .filter_by(job_id=job_id)\
+                .scalar() != 'processing'
+        finally:
+            session.close()
+        
+        # Step 0: Update status to processing (short transaction); progress,
+        # timings and the previous attempt's error are reset so a retried job
+        # starts from zero
+        update_job_status(
+            'processing',
+            progress_data={'total_videos': 0, 'descriptions_generated': 0, 'percent_complete': 0},
+            job_timings=None,
+            error_message=None
+        )
+        if first_attempt:
+            JOBS.labels('processing').inc()
+        
+        # Initialize services (no database connection)
+        openai_service = OpenAIService()
+        s3_service = S3Service()
+        use_asyncio = config.JOB_ENGINE == 'asyncio'
+        
+        # Load the template before spending tokens on sections it cannot use
+        template_text = TemplateService.load_template(template_name)
+        
+        # Step 1: Generate ALL content in one API call (no database connection during API call)
+        logger.info(f"Generating AI content for novel: {novel_name}")
+        
+        def save_section(name, text):
+            """Save a streamed section as soon as it completes (short transaction)"""
+            update_job_status('processing', **{SECTION_COLUMNS[name]: text})
+        
+        # Single unified API call for all four sections
+        with timings.stage('llm'):
+            if use_asyncio:
+                sections = async_runtime.run(openai_service.agenerate_all_sections(
+                    novel_name,
+                    novel_context,
+                    use_cache=not bypass_cache,
+                    on_section=save_section
+                ))
+            else:
+                sections = openai_service.generate_all_sections(
+                    novel_name,
+                    novel_context,
+                    use_cache=not bypass_cache,
+                    on_section=save_section
+                )
+        about = sections['about']
+        what_to_expect = sections['what_to_expect']
+        subscribe = sections['subscribe']
+        seo_tags = sections['tags']
+        
+        # Save AI-generated content to database (short transaction)
+        update_job_status(
+            'processing',
+            generated_about=about,
+            generated_what_to_expect=what_to_expect,
+            generated_subscribe=subscribe,
+            generated_tags=seo_tags
+        )
+        
+        # Fill in the novel-level fields once; each video then only adds its
+        # timestamps (no database connection)
+        template = TemplateService.compile(
+            template_text,
+            playlist_url=playlist_url,
+            novel_name=novel_name,
+            about=about,
+            what_to_expect=what_to_expect,
+            subscribe=subscribe,
+            seo_tags=seo_tags
+        )
+        
+        # The manifest records which timestamp file, sections and template each
+        # existing description was rendered from, so only changed videos are re-rendered
+        sections_hash = compute_sections_hash(template.render(SECTIONS_HASH_PLACEHOLDER))
+        
+        # Step 2: Stream timestamp files page by page into the read/render/upload
+        # pipeline (no database connection during I/O). Progress is coalesced
+        # into at most one short transaction per PROGRESS_FLUSH_INTERVAL.
+        with JobProgressWriter(job_id, auto_flush=not use_asyncio) as progress, \
+                NovelManifest(novel_name, sections_hash, load=not force, auto_flush=not use_asyncio) as manifest:
+            if use_asyncio:
+                counts = async_runtime.run(_run_async_pipeline(novel_name, template, force, progress, manifest, timings))
+            else:
+                # Snapshot existing descriptions (and their ETags) with one listing
+                # instead of a HEAD per video
+                existing_descriptions = None
+                if config.S3_BULK_EXISTENCE_CHECK:
+                    with timings.stage('listing'):
+                        existing_descriptions = s3_service.snapshot_descriptions(novel_name)
+                
+                def should_skip(file_info):
+                    """Check if an up-to-date description exists (unless force=True)"""
+                    if force or manifest.is_stale(file_info):
+                        return False
+                    if existing_descriptions is not None:
+                        exists = file_info['video_name'] in existing_descriptions
+                    else:
+                        exists = s3_service.description_exists(novel_name, file_info['video_name'])
+                    return manifest.keep_existing(file_info, exists)
+                
+                def existing_etag(file_info):
+                    """ETag of the stored description, compared before uploading"""
+                    if existing_descriptions is not None:
+                        return existing_descriptions.get(file_info['video_name'], {}).get('etag')
+                    return s3_service.description_etag(novel_name, file_info['video_name'])
+                
+                pipeline = DescriptionPipeline(
+                    s3_service,
+                    novel_name,
+                    render=template.render,
+                    validate=template.validate,
+                    should_skip=should_skip,
+                    on_saved=lambda file_info: manifest.record(file_info['video_name'], file_info['etag']),
+                    existing_etag=existing_etag if config.S3_SKIP_UNCHANGED_WRITES else None,
+                    progress=progress,
+                    timings=timings
+                )
+                counts = pipeline.run(timings.timed_iter('listing', s3_service.iter_timestamp_files(novel_name)))
+            
+            if counts['total_videos']:
+                progress.set(percent_complete=100)
+        
+        total_videos = counts['total_videos']
+        descriptions_generated = counts['descriptions_generated']
+        
+        if not total_videos:
+            # Short transaction to mark as failed
+            update_job_status(
+                'failed',
+                error_message=f"No timestamp files found for novel: {novel_name}",
+                completed_at=datetime.now(timezone.utc),
+                job_timings=timings.to_dict(counts)
+            )
+            return
+        
+        # Mark as completed (short transaction)
+        update_job_status(
+            'completed',
+            completed_at=datetime.now(timezone.utc),
+            job_timings=timings.to_dict(counts)
+        )
+        
+        logger.info(f"Job {job_id} completed: {descriptions_generated}/{total_videos} descriptions generated")
+    
+    except Exception as e:
+        logger.error(f"Job {job_id} attempt failed: {e}")
+        # Record the error but leave the job 'processing': the worker hands the
+        # exception to JobQueue.fail, which retries the job with backoff and
+        # marks it failed once its attempts are exhausted
+        update_job_status(
+            'processing',
+            error_message=str(e),
+            job_timings=timings.to_dict(counts)
+        )
+        raise
+
+
+async def _run_async_pipeline(
+    novel_name: str,
+    template: CompiledTemplate,
+    force: bool,
+    progress: JobProgressWriter,
+    manifest: NovelManifest,
+    timings: JobTimings
+) -> dict:
+    """
+    Skip check, listing and per-video work on the asyncio engine loop.
+    
+    Args:
+        novel_name: Name of the novel
+        template: The job's compiled description template
+        force: Regenerate even if descriptions exist
+        progress: Progress writer created with auto_flush=False
+        manifest: Novel manifest created with auto_flush=False
+        timings: The job's timing breakdown
+    
+    Returns:
+        Pipeline counters
+    """
+    s3_service = AsyncS3Service()
+    
+    # Snapshot existing descriptions (and their ETags) with one listing instead
+    # of a HEAD per video
+    existing_descriptions = None
+    if config.S3_BULK_EXISTENCE_CHECK:
+        with timings.stage('listing'):
+            existing_descriptions = await s3_service.snapshot_descriptions(novel_name)
+    
+    async def should_skip(file_info):
+        """Check if an up-to-date description exists (unless force=True)"""
+        if force or manifest.is_stale(file_info):
+            return False
+        if existing_descriptions is not None:
+            exists = file_info['video_name'] in existing_descriptions
+        else:
+            exists = await s3_service.description_exists(novel_name, file_info['video_name'])
+        return manifest.keep_existing(file_info, exists)
+    
+    async def existing_etag(file_info):
+        """ETag of the stored description, compared before uploading"""
+        if existing_descriptions is not None:
+            return existing_descriptions.get(file_info['video_name'], {}).get('etag')
+        return await s3_service.description_etag(novel_name, file_info['video_name'])
+    
+    async def on_saved(file_info):
+        """Record the saved video; full batches are written from a worker thread"""
+        manifest.record(file_info['video_name'], file_info['etag'])
+        if manifest.is_due():
+            await asyncio.to_thread(manifest.flush)
+    
+    pipeline = AsyncDescriptionPipeline(
+        s3_service,
+        novel_name,
+        render=template.render,
+        validate=template.validate,
+        should_skip=should_skip,
+        on_saved=on_saved,
+        existing_etag=existing_etag if config.S3_SKIP_UNCHANGED_WRITES else None,
+        progress=progress,
+        timings=timings
+    )
+    return await pipeline.run(timings.atimed_iter('listing', s3_service.iter_timestamp_files(novel_name)))
+
+
+def run_queued_job(job_id: str, payload: dict):
+    """
+    Run a job claimed from the job queue.
+    
+    Novel inputs are read from the job's WorkflowDescriptionState row; the
+    queue payload only carries run options. The job runs under the novel's
+    advisory lock, so a novel's descriptions are generated by at most one
+    worker across all replicas at a time.
+    
+    Args:
+        job_id: Unique job identifier
+        payload: Queue payload ({'force': bool, 'bypass_cache': bool})
+    
+    Raises:
+        NovelBusyError: If another worker is running a job for the novel
+        Exception: If the attempt failed (the worker records it with JobQueue.fail)
+    """
+    session = get_db()
+    try:
+        state = session.query(
+            WorkflowDescriptionState.novel_name,
+            WorkflowDescriptionState.novel_context,
+            WorkflowDescriptionState.playlist_url,
+            WorkflowDescriptionState.subscribe_text,
+            WorkflowDescriptionState.template_name
+        )\
+            .filter_by(job_id=job_id)\
+            .first()
+        if not state:
+            raise ValueError(f"Job {job_id} not found")
+        
+        args = (state.novel_name, state.novel_context, state.playlist_url, state.subscribe_text or '')
+        template_name = state.template_name
+    finally:
+        session.close()
+    
+    with novel_lock(args[0]):
+        generate_descriptions_task(
+            job_id,
+            *args,
+            force=payload.get('force', False),
+            bypass_cache=payload.get('bypass_cache', False),
+            template_name=template_name
+        )
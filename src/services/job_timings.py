@@ -0,0 +1,151 @@
+"""Per-job timing breakdown (workflow_description_state.job_timings)"""
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Per-video steps: read (timestamp file download), render (render + validate),
+# write (ETag lookup + upload) and video (pickup to outcome, end to end)
+VIDEO_STEPS = ('read', 'render', 'write', 'video')
+
+# Pipeline counters copied into the breakdown
+OUTCOME_COUNTERS = ('total_videos', 'written', 'unchanged', 'skipped', 'failed')
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize step durations.
+    
+    Args:
+        values: Durations in seconds
+    
+    Returns:
+        Dict with count, total, p50, p95 and max (seconds, rounded to 0.1 ms)
+    """
+    if not values:
+        return {'count': 0, 'total': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'total': round(sum(ordered), 4),
+        'p50': round(_percentile(ordered, 50), 4),
+        'p95': round(_percentile(ordered, 95), 4),
+        'max': round(ordered[-1], 4)
+    }
+
+
+class JobTimings:
+    """
+    Collects where one job spent its time, for post-mortems.
+    
+    Job-level stages (LLM call, listings) accumulate wall time; per-video
+    steps keep every duration so the stored breakdown can report
+    percentiles. Safe to use from pipeline threads; the asyncio pipeline
+    only calls it from the event loop.
+    
+    Usage:
+        timings = JobTimings()
+        with timings.stage('llm'):
+            ...
+        timings.observe('read', seconds)
+        state.job_timings = timings.to_dict(counts)
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._stages: Dict[str, float] = {}
+        self._steps: Dict[str, List[float]] = {step: [] for step in VIDEO_STEPS}
+    
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to a job-level stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started)
+    
+    def add_stage(self, name: str, seconds: float):
+        """
+        Add time to a job-level stage.
+        
+        Args:
+            name: Stage name (e.g. 'llm', 'listing')
+            seconds: Duration to add
+        """
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + seconds
+    
+    def observe(self, step: str, seconds: float):
+        """
+        Record one video's duration for a step.
+        
+        Args:
+            step: One of VIDEO_STEPS
+            seconds: Duration
+        """
+        with self._lock:
+            self._steps[step].append(seconds)
+    
+    def timed_iter(self, name: str, iterable: Iterable[T]) -> Iterator[T]:
+        """
+        Yield from iterable, adding the time spent producing items to a stage.
+        
+        Time the consumer spends between items is not counted, so a lazy
+        listing is measured without the work it feeds.
+        """
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.add_stage(name, time.perf_counter() - started)
+            yield item
+    
+    async def atimed_iter(self, name: str, iterable: AsyncIterable[T]) -> AsyncIterator[T]:
+        """Async timed_iter()"""
+        iterator = iterable.__aiter__()
+        while True:
+            started = time.perf_counter()
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+            finally:
+                self.add_stage(name, time.perf_counter() - started)
+            yield item
+    
+    def to_dict(self, counts: Optional[Dict] = None) -> Dict:
+        """
+        Build the stored breakdown.
+        
+        Args:
+            counts: Pipeline counters, if the pipeline ran
+        
+        Returns:
+            Dict with total_seconds, stages (seconds per job-level stage),
+            videos (summarize() per step) and counts
+        """
+        with self._lock:
+            return {
+                'total_seconds': round(time.perf_counter() - self._started, 3),
+                'stages': {name: round(seconds, 3) for name, seconds in self._stages.items()},
+                'videos': {step: summarize(values) for step, values in self._steps.items()},
+                'counts': {name: (counts or {}).get(name, 0) for name in OUTCOME_COUNTERS}
+            }
@@ -0,0 +1,213 @@
+"""Per-novel manifest of rendered descriptions"""
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.config import config
+from src.models.database import get_db, get_db_session
+from src.models.manifest import DescriptionManifest
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the timestamps when rendering the description for its sections hash
+SECTIONS_HASH_PLACEHOLDER = '\x00timestamps\x00'
+
+
+def compute_sections_hash(rendered_template: str) -> str:
+    """
+    Hash the novel-level content of a description.
+    
+    Pass the description rendered with SECTIONS_HASH_PLACEHOLDER instead of
+    real timestamps: the hash then covers the sections, playlist URL and the
+    template itself, and changes whenever any of them would change the
+    output.
+    
+    Args:
+        rendered_template: Description rendered without real timestamps
+    
+    Returns:
+        Hex sha256 digest
+    """
+    return hashlib.sha256(rendered_template.encode('utf-8')).hexdigest()
+
+
+class NovelManifest:
+    """
+    A novel's manifest: what each existing description was rendered from.
+    
+    A job loads it with one query and re-renders only the videos whose
+    timestamp file ETag or sections hash differs from their entry. Saved
+    videos are recorded and flushed every MANIFEST_BATCH_SIZE records (and
+    on close) as one multi-row INSERT ... ON CONFLICT DO UPDATE, so tracking
+    thousands of videos costs a handful of statements. A failed flush keeps
+    its entries for the next attempt; losing them only means those videos
+    are rendered again by the next job.
+    
+    Usage:
+        with NovelManifest(novel_name, sections_hash) as manifest:
+            if manifest.is_stale(file_info):
+                ...
+            manifest.record(video_name, timestamp_etag)
+    """
+    
+    def __init__(
+        self,
+        novel_name: str,
+        sections_hash: str,
+        load: bool = True,
+        batch_size: int = None,
+        auto_flush: bool = True
+    ):
+        """
+        Args:
+            novel_name: Name of the novel
+            sections_hash: Hash from compute_sections_hash() for this job's content
+            load: Load the stored entries (False when every video is rendered anyway)
+            batch_size: Entries per upsert (defaults to MANIFEST_BATCH_SIZE)
+            auto_flush: Flush from record() when a batch is full; pass False when
+                the owner schedules flushes itself (e.g. off an event loop via is_due())
+        """
+        self.novel_name = novel_name
+        self.sections_hash = sections_hash
+        self.batch_size = max(1, batch_size or config.MANIFEST_BATCH_SIZE)
+        self.auto_flush = auto_flush
+        self.entries: Dict[str, Tuple[str, str]] = self._load() if load else {}
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, str] = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
+    def is_stale(self, file_info: Dict[str, str]) -> bool:
+        """
+        Whether a tracked video changed since its description was rendered.
+        
+        Args:
+            file_info: Timestamp file info with 'video_name' and 'etag'
+        
+        Returns:
+            True if the timestamp file or the sections differ from the entry;
+            False for up-to-date and for untracked videos
+        """
+        entry = self.entries.get(file_info['video_name'])
+        return entry is not None and entry != (file_info['etag'], self.sections_hash)
+    
+    def keep_existing(self, file_info: Dict[str, str], exists: bool) -> bool:
+        """
+        Decide whether a video that is not stale can be skipped.
+        
+        Descriptions rendered before the manifest existed are kept, as they
+        always were, and tracked from now on.
+        
+        Args:
+            file_info: Timestamp file info with 'video_name' and 'etag'
+            exists: Whether the description object exists
+        
+        Returns:
+            True to skip the video
+        """
+        if not exists:
+            return False
+        if file_info['video_name'] not in self.entries:
+            self.record(file_info['video_name'], file_info['etag'])
+        return True
+    
+    def record(self, video_name: str, timestamp_etag: str):
+        """
+        Record that a video's description is current for this job's content.
+        
+        Args:
+            video_name: Name of the video
+            timestamp_etag: ETag of the timestamp file it was rendered from
+        """
+        with self._lock:
+            self._pending[video_name] = timestamp_etag
+            due = self.auto_flush and len(self._pending) >= self.batch_size
+        
+        if due:
+            try:
+                self.flush()
+            except Exception:
+                # Already logged; entries are kept for the next flush
+                pass
+    
+    def is_due(self) -> bool:
+        """Whether a full batch is waiting"""
+        with self._lock:
+            return len(self._pending) >= self.batch_size
+    
+    def flush(self):
+        """Upsert buffered entries now (no-op when nothing is pending)"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            
+            if not pending:
+                return
+            
+            now = datetime.now(timezone.utc)
+            rows = [
+                {
+                    'novel_name': self.novel_name,
+                    'video_name': video_name,
+                    'timestamp_etag': timestamp_etag,
+                    'sections_hash': self.sections_hash,
+                    'updated_at': now
+                }
+                for video_name, timestamp_etag in pending.items()
+            ]
+            
+            try:
+                with get_db_session() as session:
+                    dialect = postgresql if session.get_bind().dialect.name == 'postgresql' else sqlite
+                    for start in range(0, len(rows), self.batch_size):
+                        statement = dialect.insert(DescriptionManifest).values(rows[start:start + self.batch_size])
+                        session.execute(statement.on_conflict_do_update(
+                            index_elements=['novel_name', 'video_name'],
+                            set_={
+                                'timestamp_etag': statement.excluded.timestamp_etag,
+                                'sections_hash': statement.excluded.sections_hash,
+                                'updated_at': statement.excluded.updated_at
+                            }
+                        ))
+            except Exception as e:
+                logger.error(f"Error writing manifest for {self.novel_name}: {e}")
+                with self._lock:
+                    # Newer entries recorded meanwhile win
+                    self._pending = {**pending, **self._pending}
+                raise
+    
+    def close(self):
+        """Final flush; call on completion and on failure"""
+        try:
+            self.flush()
+        except Exception:
+            # Already logged; a failed final flush must not mask the job outcome
+            pass
+    
+    def _load(self) -> Dict[str, Tuple[str, str]]:
+        """Load the stored entries with one column-only query"""
+        session = get_db()
+        try:
+            rows = session.query(
+                DescriptionManifest.video_name,
+                DescriptionManifest.timestamp_etag,
+                DescriptionManifest.sections_hash
+            )\
+                .filter_by(novel_name=self.novel_name)\
+                .all()
+            
+            logger.info(f"Loaded manifest for {self.novel_name} ({len(rows)} videos)")
+            return {row.video_name: (row.timestamp_etag, row.sections_hash) for row in rows}
+        finally:
+            session.close()
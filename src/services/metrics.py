@@ -0,0 +1,100 @@
+"""Prometheus metrics"""
+import logging
+import os
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server
+)
+
+logger = logging.getLogger(__name__)
+
+# Set by gunicorn.conf.py: every gunicorn worker writes its samples to files
+# in this directory and /metrics sums them, whichever worker serves it
+MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+LLM_SECTIONS_SECONDS = Histogram(
+    'description_llm_sections_seconds',
+    'generate_all_sections latency (source: model or cache)',
+    ['source'],
+    buckets=(0.05, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+
+S3_OPERATION_SECONDS = Histogram(
+    'description_s3_operation_seconds',
+    'S3 request latency including retries, by API operation',
+    ['operation'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+DB_CONNECTION_SECONDS = Histogram(
+    'description_db_connection_seconds',
+    'Time a database connection is checked out of the pool (session lifetime)',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10, 60)
+)
+
+VIDEO_SECONDS = Histogram(
+    'description_video_seconds',
+    'Per-video time from pickup to upload (outcome: written, unchanged, skipped, failed)',
+    ['outcome'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+JOBS = Counter(
+    'description_jobs',
+    'Description jobs by status reached (processing, completed, failed)',
+    ['status']
+)
+
+ACTIVE_JOBS = Gauge(
+    'description_jobs_active',
+    'Description jobs currently running',
+    multiprocess_mode='livesum'
+)
+
+
+def registry():
+    """
+    Registry to expose.
+    
+    Returns:
+        A registry aggregating every process's samples in multiprocess
+        mode, else the process's default registry
+    """
+    if not MULTIPROC_DIR:
+        return REGISTRY
+    
+    collector_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collector_registry)
+    return collector_registry
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+    
+    Returns:
+        (body, content type)
+    """
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int):
+    """
+    Serve /metrics from a background thread (job worker processes).
+    
+    Args:
+        port: Port to listen on
+    """
+    start_http_server(port, registry=registry())
+    logger.info(f"Serving metrics on port {port}")
@@ -0,0 +1,160 @@
+"""Cross-process notifications via PostgreSQL LISTEN/NOTIFY"""
+import logging
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from src.models.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def notify(session, channel: str, payload: str = ''):
+    """
+    Queue a notification on the session's transaction.
+    
+    PostgreSQL delivers it to every listening process when the transaction
+    commits; on other databases this is a no-op.
+    
+    Args:
+        session: Open database session
+        channel: Notification channel
+        payload: Short payload string (e.g. a prompt name or job id)
+    """
+    if session.get_bind().dialect.name != 'postgresql':
+        return
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {'channel': channel, 'payload': payload}
+    )
+
+
+class NotificationListener:
+    """
+    One LISTEN connection per process, dispatching payloads to callbacks.
+    
+    The listener thread is started lazily by the first subscribe() in each
+    process, so it is safe with gunicorn forking workers. After every
+    (re)connect callbacks receive None, meaning notifications may have been
+    missed and any derived state should be dropped.
+    """
+    
+    def __init__(self, poll_timeout: float = 5.0, reconnect_delay: float = 5.0):
+        """
+        Args:
+            poll_timeout: Seconds to wait for a notification before re-checking state
+            reconnect_delay: Seconds to wait before reconnecting after an error
+        """
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._lock = threading.Lock()
+        self._callbacks: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._pid = None
+        self._thread = None
+        self._listening = set()
+    
+    def is_listening(self, channel: str) -> bool:
+        """
+        Whether this process currently receives notifications for a channel.
+        
+        Args:
+            channel: Notification channel
+        
+        Returns:
+            True while a live LISTEN connection covers the channel
+        """
+        return self._pid == os.getpid() and channel in self._listening
+    
+    def subscribe(self, channel: str, callback: Callable[[Optional[str]], None]):
+        """
+        Register a callback for a channel and make sure the listener runs.
+        
+        Args:
+            channel: Notification channel
+            callback: Called with the payload, or None after a reconnect
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # First use in this process (or first use after a fork)
+                self._callbacks = {}
+                self._listening = set()
+                self._thread = None
+                self._pid = os.getpid()
+            
+            self._callbacks.setdefault(channel, []).append(callback)
+            
+            if engine.dialect.name != 'postgresql':
+                return
+            
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="notification-listener",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def _dispatch(self, channel: str, payload: Optional[str]):
+        """Call every callback registered for a channel"""
+        with self._lock:
+            callbacks = list(self._callbacks.get(channel, []))
+        
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.error(f"Error handling notification on {channel}: {e}")
+    
+    def _run(self):
+        """Listener loop; reconnects forever"""
+        while True:
+            connection = None
+            try:
+                raw = engine.raw_connection()
+                # Keep this connection out of the pool for the life of the listener
+                raw.detach()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                
+                while True:
+                    with self._lock:
+                        channels = set(self._callbacks) - self._listening
+                    
+                    if channels:
+                        with connection.cursor() as cursor:
+                            for channel in channels:
+                                cursor.execute(f'LISTEN "{channel}"')
+                        self._listening = self._listening | channels
+                        logger.info(f"Listening for notifications on: {', '.join(sorted(channels))}")
+                        # Anything sent before LISTEN took effect was missed
+                        for channel in channels:
+                            self._dispatch(channel, None)
+                    
+                    if select.select([connection], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        self._dispatch(notification.channel, notification.payload)
+            
+            except Exception as e:
+                logger.error(f"Notification listener error: {e}")
+            
+            finally:
+                self._listening = set()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+            
+            time.sleep(self.reconnect_delay)
+
+
+# Process-wide listener shared by all subscribers
+notification_listener = NotificationListener()
@@ -0,0 +1,76 @@
+"""Cluster-wide per-novel locks (Postgres advisory locks)"""
+import hashlib
+import logging
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+
+from src.models.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class NovelBusyError(Exception):
+    """Raised when another worker is already running a job for the novel"""
+
+
+def novel_lock_key(novel_name: str) -> int:
+    """
+    Stable signed 64-bit advisory lock key for a novel.
+    
+    Args:
+        novel_name: Name of the novel
+    
+    Returns:
+        Key for pg_try_advisory_lock
+    """
+    digest = hashlib.sha256(f"novel:{novel_name}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+@contextmanager
+def novel_lock(novel_name: str) -> Iterator[None]:
+    """
+    Hold a novel's advisory lock for the duration of the block.
+    
+    The lock is session-level and lives on a dedicated connection, so no
+    transaction stays open while the job runs; if the process dies, Postgres
+    drops the connection and the lock with it. Other databases (SQLite in
+    local runs) have a single process and no advisory locks: the block runs
+    unlocked.
+    
+    Usage:
+        with novel_lock(novel_name):
+            ...
+    
+    Args:
+        novel_name: Name of the novel
+    
+    Raises:
+        NovelBusyError: If another session holds the lock
+    """
+    if engine.dialect.name != 'postgresql':
+        yield
+        return
+    
+    key = novel_lock_key(novel_name)
+    connection = engine.connect()
+    try:
+        acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': key}).scalar()
+        connection.commit()
+        if not acquired:
+            raise NovelBusyError(f"Another worker is running a job for novel: {novel_name}")
+        
+        try:
+            yield
+        finally:
+            try:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': key})
+                connection.commit()
+            except Exception as e:
+                # Never return a connection that may still hold the lock to the pool
+                logger.error(f"Error releasing lock for novel {novel_name}: {e}")
+                connection.invalidate()
+    finally:
+        connection.close()
@@ -1,32 +1,50 @@
 """Azure OpenAI service for generating descriptions"""
+import asyncio
 import logging
-from typing import Optional
-from openai import AzureOpenAI, OpenAI
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import httpx
 
 from src.config import config
-from src.models.ai_prompt import AIPrompt
-from src.models.database import get_db
+from src.services.clients import get_async_openai_client, get_openai_client
+from src.services.metrics import LLM_SECTIONS_SECONDS
+from src.services.prompt_cache import prompt_cache
+from src.services.rate_limiter import llm_rate_limiter
+from src.services.resilience import openai_dependency
+from src.services.section_cache import section_cache
+from src.utils.section_parser import SectionStreamParser
 
 logger = logging.getLogger(__name__)
 
+# Ask for a final chunk with response.usage so rate limit reservations can be reconciled
+STREAM_OPTIONS = {'include_usage': True}
+
+# Longest TAGS section kept
+MAX_TAGS_LENGTH = 500
+
+
+def _limit_tags(tags: str) -> str:
+    """Truncate tags to MAX_TAGS_LENGTH characters"""
+    if len(tags) > MAX_TAGS_LENGTH:
+        logger.warning(f"Tags too long ({len(tags)} chars), truncating to {MAX_TAGS_LENGTH}")
+        tags = tags[:MAX_TAGS_LENGTH - 3] + "..."
+    return tags
+
 
 class OpenAIService:
     """Service for interacting with Azure OpenAI or standard OpenAI"""
     
     def __init__(self):
-        """Initialize OpenAI client based on configuration"""
+        """Initialize OpenAI service with the shared per-process client"""
+        self.client = get_openai_client()
         if config.USE_AZURE_OPENAI:
             logger.info(f"Using Azure OpenAI with deployment: {config.AZURE_OPENAI_DEPLOYMENT}")
-            self.client = AzureOpenAI(
-                api_key=config.OPENAI_API_KEY,
-                api_version="2024-10-21",  # Updated API version for newer features
-                azure_endpoint=config.AZURE_OPENAI_ENDPOINT
-            )
             self.model = config.AZURE_OPENAI_DEPLOYMENT
             self.is_azure = True
         else:
             logger.info(f"Using standard OpenAI with model: {config.OPENAI_MODEL}")
-            self.client = OpenAI(api_key=config.OPENAI_API_KEY)
             self.model = config.OPENAI_MODEL
             self.is_azure = False
         
@@ -38,7 +56,7 @@ class OpenAIService:
     
     def _get_prompt_template(self, prompt_name: str, prompt_type: str = 'user') -> str:
         """
-        Load prompt template from database.
+        Load prompt template (cached per process, see PromptCache).
         
         Args:
             prompt_name: Name of the prompt (e.g., 'what_to_expect', 'seo_tags', 'description_system')
@@ -50,138 +68,568 @@ class OpenAIService:
         Raises:
             ValueError: If prompt not found
         """
-        session = get_db()
-        try:
-            prompt = session.query(AIPrompt).filter_by(name=prompt_name, prompt_type=prompt_type).first()
-            if not prompt:
-                raise ValueError(f"Prompt '{prompt_name}' (type: {prompt_type}) not found in database")
-            return prompt.prompt_text
-        finally:
-            session.close()
+        return prompt_cache.get(prompt_name, prompt_type)
     
-    def generate_all_sections(self, novel_name: str, novel_context: str) -> dict:
+    def generate_all_sections(
+        self,
+        novel_name: str,
+        novel_context: str,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> dict:
         """
         Generate all description sections in one API call.
         
+        Identical inputs (novel name, context, both prompts and model) are
+        served from the section cache instead of calling the model again.
+        Every attempt first waits for the cluster-wide rate limiter; 429s,
+        5xx responses and stalled streams are retried through
+        openai_dependency (a retried stream may report sections again).
+        
         Args:
             novel_name: Name of the novel
             novel_context: User-provided context about the novel
-            
+            use_cache: Set False to bypass the section cache and regenerate
+            stream: Stream the completion (defaults to OPENAI_STREAM)
+            on_section: Called with (section_name, text) as each section completes
+                while streaming; the returned dict is authoritative
+        
         Returns:
             Dict with 'about', 'what_to_expect', and 'tags' keys
         """
+        if stream is None:
+            stream = config.OPENAI_STREAM
+        
         try:
-            # Load system prompt from database (defines output format)
-            system_prompt = self._get_prompt_template('description_system', 'system')
+            started = time.perf_counter()
+            api_params, cache_key = self._build_request(novel_name, novel_context)
             
-            # Load user prompt template from database
-            user_prompt_template = self._get_prompt_template('full_description', 'user')
-            
-            # Fill in user prompt variables
-            user_prompt = user_prompt_template.format(
-                novel_name=novel_name,
-                novel_context=novel_context
-            )
+            if use_cache:
+                cached = section_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached sections for novel: {novel_name}")
+                    LLM_SECTIONS_SECONDS.labels('cache').observe(time.perf_counter() - started)
+                    return cached
             
             logger.info(f"Generating all sections for novel: {novel_name}")
             logger.info(f"Using system prompt: description_system")
             
-            # Build API call parameters
-            api_params = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt
-                    }
-                ]
-            }
-            
-            # Use correct token parameter based on model (increased to 10000)
-            if self.uses_max_completion_tokens:
-                api_params["max_completion_tokens"] = 10000
-            else:
-                api_params["max_tokens"] = 10000
-            
-            response = self.client.chat.completions.create(**api_params)
+            content = openai_dependency.call(self._call_model, api_params, stream, on_section)
+            LLM_SECTIONS_SECONDS.labels('model').observe(time.perf_counter() - started)
             
-            # Extract content
-            if not response.choices or len(response.choices) == 0:
-                raise ValueError("No choices in OpenAI response")
+            sections = self._parse_sections(content)
             
-            content = response.choices[0].message.content
-            if content is None or not content.strip():
-                logger.error(f"Empty response from OpenAI. Response object: {response}")
-                raise ValueError("OpenAI returned empty content")
+            # Only cache fully parsed output so a bad completion is retried next run
+            if all(sections.values()):
+                section_cache.put(cache_key, novel_name, self.model, sections)
             
-            full_content = content.strip()
-            logger.info(f"Generated full content ({len(full_content)} chars)")
+            return sections
+        
+        except Exception as e:
+            logger.error(f"Error generating description sections: {e}")
+            raise
+    
+    async def agenerate_all_sections(
+        self,
+        novel_name: str,
+        novel_context: str,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> dict:
+        """
+        Async generate_all_sections for the asyncio job engine.
+        
+        Uses the shared AsyncOpenAI client; prompt and section cache lookups
+        (which may query the database) and on_section run in worker threads.
+        
+        Args:
+            novel_name: Name of the novel
+            novel_context: User-provided context about the novel
+            use_cache: Set False to bypass the section cache and regenerate
+            stream: Stream the completion (defaults to OPENAI_STREAM)
+            on_section: Called with (section_name, text) as each section completes
+                while streaming; the returned dict is authoritative
+        
+        Returns:
+            Dict with 'about', 'what_to_expect', 'subscribe' and 'tags' keys
+        """
+        if stream is None:
+            stream = config.OPENAI_STREAM
+        
+        try:
+            started = time.perf_counter()
+            api_params, cache_key = await asyncio.to_thread(self._build_request, novel_name, novel_context)
             
-            # Parse the four sections
-            # Expected format: "ABOUT:\n[content]\n\nWHAT_TO_EXPECT:\n[content]\n\nSUBSCRIBE:\n[content]\n\nTAGS:\n[content]"
-            about = ""
-            what_to_expect = ""
-            subscribe = ""
-            tags = ""
+            if use_cache:
+                cached = await asyncio.to_thread(section_cache.get, cache_key)
+                if cached is not None:
+                    logger.info(f"Using cached sections for novel: {novel_name}")
+                    LLM_SECTIONS_SECONDS.labels('cache').observe(time.perf_counter() - started)
+                    return cached
             
-            try:
-                # Log first 300 chars for debugging
-                logger.info(f"Content preview: {full_content[:300]}...")
-                
-                # Split by section headers (case-insensitive)
-                content_upper = full_content.upper()
-                
-                # Find section positions
-                about_start = 0
-                wte_start = content_upper.find("WHAT_TO_EXPECT:")
-                subscribe_start = content_upper.find("SUBSCRIBE:")
-                tags_start = content_upper.find("TAGS:")
-                
-                logger.info(f"Section positions - WTE: {wte_start}, SUBSCRIBE: {subscribe_start}, TAGS: {tags_start}")
-                
-                if wte_start > 0 and subscribe_start > 0 and tags_start > 0:
-                    # Extract all four sections
-                    about_section = full_content[about_start:wte_start]
-                    about = about_section.replace("ABOUT:", "").replace("About:", "").strip()
-                    
-                    wte_section = full_content[wte_start:subscribe_start]
-                    what_to_expect = wte_section.replace("WHAT_TO_EXPECT:", "").replace("What_to_Expect:", "").strip()
-                    
-                    subscribe_section = full_content[subscribe_start:tags_start]
-                    subscribe = subscribe_section.replace("SUBSCRIBE:", "").replace("Subscribe:", "").strip()
-                    
-                    tags_section = full_content[tags_start:]
-                    tags = tags_section.replace("TAGS:", "").replace("Tags:", "").strip()
-                    
-                    # Ensure tags are under 500 characters
-                    if len(tags) > 500:
-                        logger.warning(f"Tags too long ({len(tags)} chars), truncating to 500")
-                        tags = tags[:497] + "..."
-                    
-                    logger.info(f"✅ Parsed all 4 sections successfully")
-                else:
-                    # Fallback parsing
-                    logger.warning(f"Could not find all section markers. Found - WTE: {wte_start > 0}, SUBSCRIBE: {subscribe_start > 0}, TAGS: {tags_start > 0}")
-                    about = full_content.replace("ABOUT:", "").strip()
+            logger.info(f"Generating all sections for novel: {novel_name} (async)")
             
-            except Exception as parse_error:
-                logger.error(f"Error parsing sections: {parse_error}", exc_info=True)
-                # Fallback: use full content as about
-                about = full_content
+            client = get_async_openai_client()
+            content = await openai_dependency.acall(
+                lambda: self._acall_model(client, api_params, stream, on_section)
+            )
+            LLM_SECTIONS_SECONDS.labels('model').observe(time.perf_counter() - started)
             
-            logger.info(f"Final sections - About: {len(about)} chars, WTE: {len(what_to_expect)} chars, Subscribe: {len(subscribe)} chars, Tags: {len(tags)} chars")
+            sections = self._parse_sections(content)
             
-            return {
-                'about': about,
-                'what_to_expect': what_to_expect,
-                'subscribe': subscribe,
-                'tags': tags
-            }
+            if all(sections.values()):
+                await asyncio.to_thread(section_cache.put, cache_key, novel_name, self.model, sections)
             
+            return sections
+        
         except Exception as e:
             logger.error(f"Error generating description sections: {e}")
             raise
+    
+    def _build_request(self, novel_name: str, novel_context: str) -> Tuple[dict, str]:
+        """
+        Load the prompts and build the chat completion parameters.
+        
+        Args:
+            novel_name: Name of the novel
+            novel_context: User-provided context about the novel
+            
+        Returns:
+            (api_params, section cache key)
+        """
+        # Load system prompt from database (defines output format)
+        system_prompt = self._get_prompt_template('description_system', 'system')
+        
+        # Load user prompt template from database
+        user_prompt_template = self._get_prompt_template('full_description', 'user')
+        
+        # Fill in user prompt variables
+        user_prompt = user_prompt_template.format(
+            novel_name=novel_name,
+            novel_context=novel_context
+        )
+        
+        cache_key = section_cache.make_key(novel_name, novel_context, system_prompt, user_prompt, self.model)
+        
+        # Build API call parameters
+        api_params = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ]
+        }
+        
+        # Use correct token parameter based on model (increased to 10000)
+        if self.uses_max_completion_tokens:
+            api_params["max_completion_tokens"] = 10000
+        else:
+            api_params["max_tokens"] = 10000
+        
+        return api_params, cache_key
+    
+    def _parse_sections(self, content: str) -> dict:
+        """
+        Split a completion into its four sections.
+        
+        Args:
+            content: Completion text
+        
+        Returns:
+            Dict with 'about', 'what_to_expect', 'subscribe' and 'tags' keys
+        """
+        full_content = content.strip()
+        logger.info(f"Generated full content ({len(full_content)} chars)")
+        
+        # Parse the four sections
+        # Expected format: "ABOUT:\n[content]\n\nWHAT_TO_EXPECT:\n[content]\n\nSUBSCRIBE:\n[content]\n\nTAGS:\n[content]"
+        about = ""
+        what_to_expect = ""
+        subscribe = ""
+        tags = ""
+        
+        try:
+            # Log first 300 chars for debugging
+            logger.info(f"Content preview: {full_content[:300]}...")
+            
+            # Split by section headers (case-insensitive)
+            content_upper = full_content.upper()
+            
+            # Find section positions
+            about_start = 0
+            wte_start = content_upper.find("WHAT_TO_EXPECT:")
+            subscribe_start = content_upper.find("SUBSCRIBE:")
+            tags_start = content_upper.find("TAGS:")
+            
+            logger.info(f"Section positions - WTE: {wte_start}, SUBSCRIBE: {subscribe_start}, TAGS: {tags_start}")
+            
+            if wte_start > 0 and subscribe_start > 0 and tags_start > 0:
+                # Extract all four sections
+                about_section = full_content[about_start:wte_start]
+                about = about_section.replace("ABOUT:", "").replace("About:", "").strip()
+                
+                wte_section = full_content[wte_start:subscribe_start]
+                what_to_expect = wte_section.replace("WHAT_TO_EXPECT:", "").replace("What_to_Expect:", "").strip()
+                
+                subscribe_section = full_content[subscribe_start:tags_start]
+                subscribe = subscribe_section.replace("SUBSCRIBE:", "").replace("Subscribe:", "").strip()
+                
+                tags_section = full_content[tags_start:]
+                tags = tags_section.replace("TAGS:", "").replace("Tags:", "").strip()
+                
+                # Ensure tags are under 500 characters
+                tags = _limit_tags(tags)
+                
+                logger.info(f"✅ Parsed all 4 sections successfully")
+            else:
+                # Fallback parsing
+                logger.warning(f"Could not find all section markers. Found - WTE: {wte_start > 0}, SUBSCRIBE: {subscribe_start > 0}, TAGS: {tags_start > 0}")
+                about = full_content.replace("ABOUT:", "").strip()
+        
+        except Exception as parse_error:
+            logger.error(f"Error parsing sections: {parse_error}", exc_info=True)
+            # Fallback: use full content as about
+            about = full_content
+        
+        logger.info(f"Final sections - About: {len(about)} chars, WTE: {len(what_to_expect)} chars, Subscribe: {len(subscribe)} chars, Tags: {len(tags)} chars")
+        
+        return {
+            'about': about,
+            'what_to_expect': what_to_expect,
+            'subscribe': subscribe,
+            'tags': tags
+        }
+    
+    def _call_model(
+        self,
+        api_params: dict,
+        stream: bool,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> str:
+        """
+        One rate-limited completion attempt.
+        
+        Reserves a request and the estimated tokens with llm_rate_limiter
+        and settles the reservation with the tokens the response reports.
+        
+        Args:
+            api_params: Parameters for chat.completions.create
+            stream: Stream the completion
+            on_section: Called with (section_name, text) as each section completes
+        
+        Returns:
+            Completion text
+        """
+        reservation = llm_rate_limiter.acquire(self._rate_limit_key(), self._estimate_tokens(api_params))
+        used_tokens = None
+        try:
+            if stream:
+                content, used_tokens = self._stream_completion(api_params, on_section)
+            else:
+                content, used_tokens = self._complete(api_params)
+            return content
+        finally:
+            reservation.settle(used_tokens)
+    
+    async def _acall_model(
+        self,
+        client,
+        api_params: dict,
+        stream: bool,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> str:
+        """
+        Async _call_model.
+        
+        Args:
+            client: AsyncOpenAI or AsyncAzureOpenAI client
+            api_params: Parameters for chat.completions.create
+            stream: Stream the completion
+            on_section: Called (in a worker thread) with (section_name, text) as each section completes
+        
+        Returns:
+            Completion text
+        """
+        reservation = await llm_rate_limiter.aacquire(self._rate_limit_key(), self._estimate_tokens(api_params))
+        used_tokens = None
+        try:
+            if stream:
+                content, used_tokens = await self._astream_completion(client, api_params, on_section)
+            else:
+                response = await client.chat.completions.create(**api_params)
+                used_tokens = self._total_tokens(response)
+                content = self._response_content(response)
+            return content
+        finally:
+            await reservation.asettle(used_tokens)
+    
+    def _rate_limit_key(self) -> str:
+        """Rate limit bucket of this model deployment"""
+        return f"openai:{self.model}"
+    
+    @staticmethod
+    def _estimate_tokens(api_params: dict) -> int:
+        """
+        Estimate a call's total tokens before sending it.
+        
+        Roughly 4 characters per prompt token, plus the expected completion
+        (OPENAI_COMPLETION_TOKENS_ESTIMATE, at most the request's token cap).
+        The reservation is corrected with response.usage afterwards.
+        
+        Args:
+            api_params: Parameters for chat.completions.create
+        
+        Returns:
+            Estimated prompt + completion tokens
+        """
+        prompt_chars = sum(len(message['content']) for message in api_params['messages'])
+        completion = config.OPENAI_COMPLETION_TOKENS_ESTIMATE
+        max_tokens = api_params.get('max_completion_tokens') or api_params.get('max_tokens')
+        if max_tokens:
+            completion = min(completion, max_tokens)
+        return prompt_chars // 4 + 4 * len(api_params['messages']) + completion
+    
+    @staticmethod
+    def _total_tokens(response) -> Optional[int]:
+        """Total tokens reported by a completion or final stream chunk (None if absent)"""
+        usage = getattr(response, 'usage', None)
+        return usage.total_tokens if usage is not None else None
+    
+    def _complete(self, api_params: dict) -> Tuple[str, Optional[int]]:
+        """
+        Run a blocking chat completion.
+        
+        Args:
+            api_params: Parameters for chat.completions.create
+        
+        Returns:
+            (completion text, total tokens used)
+        """
+        response = self.client.chat.completions.create(**api_params)
+        return self._response_content(response), self._total_tokens(response)
+    
+    @staticmethod
+    def _response_content(response) -> str:
+        """
+        Extract the text of a (non-streaming) chat completion.
+        
+        Args:
+            response: ChatCompletion
+        
+        Returns:
+            Completion text
+        """
+        if not response.choices or len(response.choices) == 0:
+            raise ValueError("No choices in OpenAI response")
+        
+        content = response.choices[0].message.content
+        if content is None or not content.strip():
+            logger.error(f"Empty response from OpenAI. Response object: {response}")
+            raise ValueError("OpenAI returned empty content")
+        
+        return content
+    
+    def _stream_completion(
+        self,
+        api_params: dict,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Run a streaming chat completion, reporting sections as they complete.
+        
+        A watchdog closes the stream if no content arrives within
+        OPENAI_FIRST_TOKEN_TIMEOUT seconds, or if the stream then goes quiet
+        for longer than OPENAI_STREAM_IDLE_TIMEOUT seconds.
+        
+        Args:
+            api_params: Parameters for chat.completions.create
+            on_section: Called with (section_name, text) as each section completes
+        
+        Returns:
+            (completion text, total tokens used from the final usage chunk)
+        
+        Raises:
+            TimeoutError: If the stream stalls
+        """
+        first_token_timeout = config.OPENAI_FIRST_TOKEN_TIMEOUT
+        idle_timeout = config.OPENAI_STREAM_IDLE_TIMEOUT
+        
+        # No single socket read may block longer than the first-token budget
+        client = self.client.with_options(timeout=httpx.Timeout(first_token_timeout, connect=10.0))
+        
+        started = time.monotonic()
+        timing = {'last_chunk': started, 'first_token': None}
+        stalled = []
+        done = threading.Event()
+        
+        response = client.chat.completions.create(**api_params, stream=True, stream_options=STREAM_OPTIONS)
+        
+        def watchdog():
+            """Close the stream when it stalls"""
+            while not done.wait(0.5):
+                now = time.monotonic()
+                if timing['first_token'] is None:
+                    if now - started > first_token_timeout:
+                        stalled.append(f"no content within {first_token_timeout:.0f}s")
+                elif now - timing['last_chunk'] > idle_timeout:
+                    stalled.append(f"no content for {idle_timeout:.0f}s")
+                
+                if stalled:
+                    response.close()
+                    return
+        
+        threading.Thread(target=watchdog, name="openai-stream-watchdog", daemon=True).start()
+        
+        parser = SectionStreamParser()
+        parts = []
+        used_tokens = None
+        
+        def report(sections):
+            """Forward completed sections to the caller"""
+            for name, text in sections:
+                if name == 'tags':
+                    text = _limit_tags(text)
+                logger.info(f"Streamed section '{name}' ({len(text)} chars)")
+                if on_section:
+                    try:
+                        on_section(name, text)
+                    except Exception as e:
+                        logger.error(f"Error handling streamed section '{name}': {e}")
+        
+        try:
+            for chunk in response:
+                timing['last_chunk'] = time.monotonic()
+                if chunk.usage is not None:
+                    used_tokens = chunk.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                if timing['first_token'] is None:
+                    timing['first_token'] = timing['last_chunk']
+                    logger.info(f"First token after {timing['first_token'] - started:.1f}s")
+                
+                parts.append(delta)
+                report(parser.feed(delta))
+        
+        except Exception as e:
+            if stalled:
+                raise TimeoutError(f"OpenAI stream stalled: {stalled[0]}") from e
+            raise
+        
+        finally:
+            done.set()
+            response.close()
+        
+        if stalled:
+            raise TimeoutError(f"OpenAI stream stalled: {stalled[0]}")
+        
+        content = ''.join(parts)
+        if not content.strip():
+            raise ValueError("OpenAI returned empty content")
+        
+        # TAGS only completes when the stream ends
+        report(parser.close())
+        return content, used_tokens
+    
+    async def _astream_completion(
+        self,
+        client,
+        api_params: dict,
+        on_section: Optional[Callable[[str, str], None]] = None
+    ) -> Tuple[str, Optional[int]]:
+        """
+        Async _stream_completion: the same first-token and idle limits,
+        enforced with asyncio timeouts instead of a watchdog thread.
+        
+        Args:
+            client: AsyncOpenAI or AsyncAzureOpenAI client
+            api_params: Parameters for chat.completions.create
+            on_section: Called (in a worker thread) with (section_name, text) as each section completes
+        
+        Returns:
+            (completion text, total tokens used from the final usage chunk)
+        
+        Raises:
+            TimeoutError: If the stream stalls
+        """
+        first_token_timeout = config.OPENAI_FIRST_TOKEN_TIMEOUT
+        idle_timeout = config.OPENAI_STREAM_IDLE_TIMEOUT
+        started = time.monotonic()
+        
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(**api_params, stream=True, stream_options=STREAM_OPTIONS),
+                timeout=first_token_timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"OpenAI stream stalled: no content within {first_token_timeout:.0f}s")
+        
+        parser = SectionStreamParser()
+        parts = []
+        used_tokens = None
+        chunks = response.__aiter__()
+        
+        async def report(sections):
+            """Forward completed sections to the caller"""
+            for name, text in sections:
+                if name == 'tags':
+                    text = _limit_tags(text)
+                logger.info(f"Streamed section '{name}' ({len(text)} chars)")
+                if on_section:
+                    try:
+                        await asyncio.to_thread(on_section, name, text)
+                    except Exception as e:
+                        logger.error(f"Error handling streamed section '{name}': {e}")
+        
+        try:
+            while True:
+                if parts:
+                    timeout, stall = idle_timeout, f"no content for {idle_timeout:.0f}s"
+                else:
+                    timeout = max(0.0, first_token_timeout - (time.monotonic() - started))
+                    stall = f"no content within {first_token_timeout:.0f}s"
+                
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"OpenAI stream stalled: {stall}")
+                
+                if chunk.usage is not None:
+                    used_tokens = chunk.usage.total_tokens
+                if not chunk.choices:
+                    continue
+                
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                if not parts:
+                    logger.info(f"First token after {time.monotonic() - started:.1f}s")
+                
+                parts.append(delta)
+                await report(parser.feed(delta))
+        
+        finally:
+            await response.close()
+        
+        content = ''.join(parts)
+        if not content.strip():
+            raise ValueError("OpenAI returned empty content")
+        
+        # TAGS only completes when the stream ends
+        await report(parser.close())
+        return content, used_tokens
@@ -0,0 +1,250 @@
+"""Staged pipeline for per-video description work"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from src.config import config
+from src.services.job_timings import JobTimings
+from src.services.metrics import VIDEO_SECONDS
+from src.services.progress_service import JobProgressWriter
+from src.services.s3_service import S3Service
+from src.services.template_service import TemplateService
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling a stage that its upstream has finished
+_DONE = object()
+
+
+class DescriptionPipeline:
+    """
+    Read -> render -> write pipeline for the videos of one novel.
+    
+    A pool of reader threads prefetches timestamp files, a single render
+    thread builds descriptions and a pool of writer threads uploads them.
+    Stages are joined by bounded queues, so at most a few dozen videos are
+    held in memory and wall-clock time follows the slowest stage instead of
+    the sum of all S3 round trips.
+    """
+    
+    def __init__(
+        self,
+        s3_service: S3Service,
+        novel_name: str,
+        render: Callable[[str], str],
+        validate: Callable[[str], Tuple[bool, str]] = TemplateService.validate_description,
+        should_skip: Optional[Callable[[Dict[str, str]], bool]] = None,
+        on_saved: Optional[Callable[[Dict[str, str]], None]] = None,
+        existing_etag: Optional[Callable[[Dict[str, str]], Optional[str]]] = None,
+        progress: Optional[JobProgressWriter] = None,
+        timings: Optional[JobTimings] = None,
+        read_workers: Optional[int] = None,
+        write_workers: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Args:
+            s3_service: S3 service shared by all stages
+            novel_name: Name of the novel
+            render: Builds a description from timestamp file content
+            validate: Returns (is_valid, error) for a rendered description
+            should_skip: Returns True for files that need no work (runs in reader threads)
+            on_saved: Called with the file info after its description was saved
+            existing_etag: Returns the stored description's ETag (None if absent) so
+                identical descriptions are not uploaded again (runs in writer threads)
+            progress: Receives counter increments for every listed and processed video
+            timings: Receives per-video read, render, write and end-to-end durations
+            read_workers: Reader pool size (defaults to PIPELINE_READ_WORKERS)
+            write_workers: Writer pool size (defaults to PIPELINE_WRITE_WORKERS)
+            queue_size: Capacity of each inter-stage queue (defaults to PIPELINE_QUEUE_SIZE)
+        """
+        self.s3_service = s3_service
+        self.novel_name = novel_name
+        self.render = render
+        self.validate = validate
+        self.should_skip = should_skip
+        self.on_saved = on_saved
+        self.existing_etag = existing_etag
+        self.progress = progress
+        self.timings = timings
+        self.read_workers = max(1, read_workers or config.PIPELINE_READ_WORKERS)
+        self.write_workers = max(1, write_workers or config.PIPELINE_WRITE_WORKERS)
+        queue_size = max(1, queue_size or config.PIPELINE_QUEUE_SIZE)
+        
+        self._read_queue = queue.Queue(maxsize=queue_size)
+        self._render_queue = queue.Queue(maxsize=queue_size)
+        self._write_queue = queue.Queue(maxsize=queue_size)
+        
+        self._lock = threading.Lock()
+        self._counts = {
+            'total_videos': 0,
+            'descriptions_generated': 0,
+            'written': 0,
+            'unchanged': 0,
+            'skipped': 0,
+            'failed': 0,
+            'listing_complete': False
+        }
+    
+    def run(self, timestamp_files: Iterable[Dict[str, str]]) -> Dict[str, int]:
+        """
+        Process every timestamp file and block until all stages have drained.
+        
+        Args:
+            timestamp_files: Dicts with 'key' and 'video_name'; generators are consumed
+                lazily, so processing starts before the listing has finished
+        
+        Returns:
+            Final counters: total_videos, descriptions_generated (written, unchanged
+            and skipped), failed and listing_complete
+        """
+        threads = [
+            threading.Thread(target=self._read_worker, name=f"pipeline-read-{i}", daemon=True)
+            for i in range(self.read_workers)
+        ]
+        threads.append(threading.Thread(target=self._render_worker, name="pipeline-render", daemon=True))
+        threads.extend(
+            threading.Thread(target=self._write_worker, name=f"pipeline-write-{i}", daemon=True)
+            for i in range(self.write_workers)
+        )
+        
+        for thread in threads:
+            thread.start()
+        
+        try:
+            # Feed the readers from the calling thread; put() blocks when the
+            # readers fall behind, which keeps the listing from running ahead
+            for file_info in timestamp_files:
+                self._record(total_videos=1)
+                self._read_queue.put(file_info)
+            with self._lock:
+                self._counts['listing_complete'] = True
+            if self.progress:
+                self.progress.set(listing_complete=True)
+        finally:
+            for _ in range(self.read_workers):
+                self._read_queue.put(_DONE)
+            for thread in threads:
+                thread.join()
+        
+        with self._lock:
+            return dict(self._counts)
+    
+    def _record(self, started: Optional[float] = None, **increments):
+        """
+        Update counters and report progress.
+        
+        Args:
+            started: perf_counter() when the video was picked up; given once
+                per video, with the increments of its outcome
+            **increments: Counter increments
+        """
+        if started is not None:
+            outcome = next(name for name in ('failed', 'skipped', 'written', 'unchanged') if name in increments)
+            elapsed = time.perf_counter() - started
+            VIDEO_SECONDS.labels(outcome).observe(elapsed)
+            if self.timings:
+                self.timings.observe('video', elapsed)
+        
+        with self._lock:
+            for name, value in increments.items():
+                self._counts[name] += value
+        
+        if self.progress:
+            try:
+                self.progress.increment(**increments)
+            except Exception as e:
+                logger.error(f"Error reporting progress: {e}")
+    
+    def _observe(self, step: str, since: float):
+        """Record a per-video step that began at `since` (perf_counter())"""
+        if self.timings:
+            self.timings.observe(step, time.perf_counter() - since)
+    
+    def _read_worker(self):
+        """Stage 1: skip check and timestamp file download"""
+        while True:
+            file_info = self._read_queue.get()
+            if file_info is _DONE:
+                self._render_queue.put(_DONE)
+                return
+            
+            video_name = file_info['video_name']
+            started = time.perf_counter()
+            try:
+                if self.should_skip and self.should_skip(file_info):
+                    logger.info(f"Description already exists for {video_name}, skipping")
+                    self._record(started, descriptions_generated=1, skipped=1)
+                    continue
+                
+                read_started = time.perf_counter()
+                timestamps = self.s3_service.read_timestamp_file(self.novel_name, video_name)
+                self._observe('read', read_started)
+                self._render_queue.put((file_info, timestamps, started))
+            
+            except Exception as e:
+                logger.error(f"Error processing video {video_name}: {e}")
+                self._record(started, failed=1)
+    
+    def _render_worker(self):
+        """Stage 2: build and validate descriptions"""
+        finished_readers = 0
+        while finished_readers < self.read_workers:
+            item = self._render_queue.get()
+            if item is _DONE:
+                finished_readers += 1
+                continue
+            
+            file_info, timestamps, started = item
+            video_name = file_info['video_name']
+            try:
+                render_started = time.perf_counter()
+                description = self.render(timestamps)
+                
+                is_valid, error = self.validate(description)
+                self._observe('render', render_started)
+                if not is_valid:
+                    logger.error(f"Invalid description for {video_name}: {error}")
+                    self._record(started, failed=1)
+                    continue
+                
+                self._write_queue.put((file_info, description, started))
+            
+            except Exception as e:
+                logger.error(f"Error processing video {video_name}: {e}")
+                self._record(started, failed=1)
+        
+        for _ in range(self.write_workers):
+            self._write_queue.put(_DONE)
+    
+    def _write_worker(self):
+        """Stage 3: upload descriptions"""
+        while True:
+            item = self._write_queue.get()
+            if item is _DONE:
+                return
+            
+            file_info, description, started = item
+            video_name = file_info['video_name']
+            try:
+                write_started = time.perf_counter()
+                existing_etag = self.existing_etag(file_info) if self.existing_etag else None
+                written = self.s3_service.save_description(self.novel_name, video_name, description, existing_etag)
+                self._observe('write', write_started)
+                if written:
+                    self._record(started, descriptions_generated=1, written=1)
+                else:
+                    self._record(started, descriptions_generated=1, unchanged=1)
+            
+            except Exception as e:
+                logger.error(f"Error processing video {video_name}: {e}")
+                self._record(started, failed=1)
+                continue
+            
+            if self.on_saved:
+                try:
+                    self.on_saved(file_info)
+                except Exception as e:
+                    logger.error(f"Error recording saved description for {video_name}: {e}")
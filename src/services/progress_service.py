@@ -0,0 +1,228 @@
+"""Coalesced job progress writer"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import text
+
+from src.config import config
+from src.models.database import get_db_session
+from src.services.job_events import publish_job_update
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressWriter:
+    """
+    Batches per-video progress into periodic database writes.
+    
+    Counters are kept in memory and flushed at most every
+    PROGRESS_FLUSH_INTERVAL seconds or every PROGRESS_FLUSH_EVERY updates,
+    whichever comes first. Each flush is a single atomic UPDATE that adds
+    the pending deltas to the stored counters, so there is no
+    read-modify-write of progress_data and concurrent flushes cannot lose
+    increments.
+    
+    Usage:
+        with JobProgressWriter(job_id) as progress:
+            progress.increment(descriptions_generated=1)
+    """
+    
+    # Counters that may be incremented (bound as parameters, never interpolated)
+    COUNTERS = ('total_videos', 'descriptions_generated', 'written', 'unchanged', 'skipped', 'failed')
+    
+    def __init__(self, job_id: str, flush_interval: float = None, flush_every: int = None, auto_flush: bool = True):
+        """
+        Args:
+            job_id: Job whose progress_data is updated
+            flush_interval: Max seconds between flushes (defaults to PROGRESS_FLUSH_INTERVAL)
+            flush_every: Max updates between flushes (defaults to PROGRESS_FLUSH_EVERY)
+            auto_flush: Flush from increment()/set() when due; pass False when the
+                owner schedules flushes itself (e.g. off an event loop via is_due())
+        """
+        self.job_id = job_id
+        self.flush_interval = config.PROGRESS_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self.flush_every = config.PROGRESS_FLUSH_EVERY if flush_every is None else flush_every
+        self.auto_flush = auto_flush
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._deltas = {}
+        self._values = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+    
+    def increment(self, **deltas: int):
+        """
+        Add to one or more counters.
+        
+        Args:
+            **deltas: Counter name -> amount (see COUNTERS)
+        """
+        for name in deltas:
+            if name not in self.COUNTERS:
+                raise ValueError(f"Unknown progress counter: {name}")
+        
+        with self._lock:
+            for name, value in deltas.items():
+                self._deltas[name] = self._deltas.get(name, 0) + value
+            self._pending += 1
+            due = self.auto_flush and self._is_due()
+        
+        if due:
+            self.flush()
+    
+    def set(self, **values: Any):
+        """
+        Overwrite non-counter fields (e.g. listing_complete).
+        
+        percent_complete is derived from the counters on every flush unless
+        it is set explicitly here.
+        
+        Args:
+            **values: Field name -> JSON-serializable value
+        """
+        with self._lock:
+            self._values.update(values)
+            self._pending += 1
+            due = self.auto_flush and self._is_due()
+        
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Write pending updates now (no-op when nothing is pending)"""
+        with self._flush_lock:
+            with self._lock:
+                deltas, values = self._deltas, self._values
+                self._deltas, self._values = {}, {}
+                self._pending = 0
+                self._last_flush = time.monotonic()
+            
+            if not deltas and not values:
+                return
+            
+            try:
+                with get_db_session() as session:
+                    dialect = session.get_bind().dialect.name
+                    for statement, params in self._build_statements(dialect, deltas, values):
+                        session.execute(statement, params)
+                    publish_job_update(session, self.job_id)
+            except Exception as e:
+                logger.error(f"Error flushing progress for job {self.job_id}: {e}")
+                # Keep the updates so the next flush (or close) retries them
+                with self._lock:
+                    for name, value in deltas.items():
+                        self._deltas[name] = self._deltas.get(name, 0) + value
+                    self._values = {**values, **self._values}
+                    self._pending += 1
+                raise
+    
+    def close(self):
+        """Final flush; call on completion and on failure"""
+        try:
+            self.flush()
+        except Exception:
+            # Already logged; a failed final flush must not mask the job outcome
+            pass
+    
+    def is_due(self) -> bool:
+        """Whether the count or time threshold for the next flush has been reached"""
+        with self._lock:
+            return self._is_due()
+    
+    def _is_due(self) -> bool:
+        """Whether the count or time threshold has been reached (caller holds _lock)"""
+        return (
+            self._pending >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+    
+    def _build_statements(self, dialect: str, deltas: Dict[str, int], values: Dict[str, Any]):
+        """
+        Build the UPDATE statements for one flush.
+        
+        Args:
+            dialect: SQLAlchemy dialect name of the bound engine
+            deltas: Counter increments
+            values: Fields to overwrite
+        
+        Returns:
+            List of (statement, params) to run in one transaction
+        """
+        params = {'job_id': self.job_id, 'values': json.dumps(values)}
+        recompute_percent = 'percent_complete' not in values
+        
+        if dialect == 'postgresql':
+            pairs = []
+            for i, name in enumerate(deltas):
+                params[f'name_{i}'] = name
+                params[f'delta_{i}'] = deltas[name]
+                pairs.append(
+                    f"CAST(:name_{i} AS text), "
+                    f"COALESCE((progress_data->>CAST(:name_{i} AS text))::numeric, 0) + :delta_{i}"
+                )
+            counters = f"jsonb_build_object({', '.join(pairs)})" if pairs else "'{}'::jsonb"
+            
+            increment = text(f"""
+                UPDATE workflow_description_state
+                SET progress_data = COALESCE(progress_data::jsonb, '{{}}'::jsonb)
+                        || {counters}
+                        || CAST(:values AS jsonb),
+                    version = COALESCE(version, 1) + 1,
+                    updated_at = NOW()
+                WHERE job_id = :job_id
+            """)
+            percent = text("""
+                UPDATE workflow_description_state
+                SET progress_data = progress_data::jsonb || jsonb_build_object(
+                    'percent_complete',
+                    CASE WHEN COALESCE((progress_data->>'total_videos')::numeric, 0) > 0
+                        THEN LEAST(100, ROUND(
+                            COALESCE((progress_data->>'descriptions_generated')::numeric, 0) * 100
+                            / (progress_data->>'total_videos')::numeric, 2))
+                        ELSE 0 END)
+                WHERE job_id = :job_id
+            """)
+        else:
+            # SQLite JSON1 equivalent (local runs and benchmarks)
+            expression = "COALESCE(progress_data, '{}')"
+            for i, name in enumerate(deltas):
+                params[f'path_{i}'] = f'$.{name}'
+                params[f'delta_{i}'] = deltas[name]
+                expression = (
+                    f"json_set({expression}, :path_{i}, "
+                    f"COALESCE(json_extract(progress_data, :path_{i}), 0) + :delta_{i})"
+                )
+            
+            increment = text(f"""
+                UPDATE workflow_description_state
+                SET progress_data = json_patch({expression}, :values),
+                    version = COALESCE(version, 1) + 1,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = :job_id
+            """)
+            percent = text("""
+                UPDATE workflow_description_state
+                SET progress_data = json_set(progress_data, '$.percent_complete',
+                    CASE WHEN COALESCE(json_extract(progress_data, '$.total_videos'), 0) > 0
+                        THEN MIN(100, ROUND(
+                            COALESCE(json_extract(progress_data, '$.descriptions_generated'), 0) * 100.0
+                            / json_extract(progress_data, '$.total_videos'), 2))
+                        ELSE 0 END)
+                WHERE job_id = :job_id
+            """)
+        
+        statements = [(increment, params)]
+        if recompute_percent:
+            statements.append((percent, {'job_id': self.job_id}))
+        return statements
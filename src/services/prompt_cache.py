@@ -0,0 +1,160 @@
+"""Process-wide cache of AI prompt templates"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.config import config
+from src.models.ai_prompt import AIPrompt
+from src.models.database import get_db
+from src.services.notification_service import notification_listener, notify
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel used to invalidate prompts in every worker process
+PROMPTS_CHANNEL = 'ai_prompts_changed'
+
+
+class PromptCache:
+    """
+    Caches prompt text keyed by (name, prompt_type).
+    
+    While the LISTEN connection is up, PATCH /admin/prompts NOTIFYs every
+    worker and cached prompts are served without touching the database,
+    apart from a safety revalidation every PROMPT_CACHE_TTL seconds. Without
+    notifications (listener down, or not on PostgreSQL), every lookup
+    revalidates with a single-column updated_at query, so edits still take
+    effect on the next request.
+    """
+    
+    def __init__(self, ttl: float = None):
+        """
+        Args:
+            ttl: Seconds between revalidations while notifications are live
+        """
+        self.ttl = config.PROMPT_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], dict] = {}
+        # Bumped by invalidate() (per prompt name, and for everything), so a
+        # load that raced an invalidation does not store what it read
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+        self._subscribed_pid = None
+    
+    def get(self, prompt_name: str, prompt_type: str = 'user') -> str:
+        """
+        Get prompt text, loading or revalidating it when needed.
+        
+        Args:
+            prompt_name: Name of the prompt
+            prompt_type: Type of prompt ('user' or 'system')
+        
+        Returns:
+            Prompt template text
+        
+        Raises:
+            ValueError: If prompt not found
+        """
+        self._ensure_subscribed()
+        key = (prompt_name, prompt_type)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+        
+        if entry is not None:
+            fresh = time.monotonic() - entry['checked_at'] < self.ttl
+            if fresh and notification_listener.is_listening(PROMPTS_CHANNEL):
+                return entry['prompt_text']
+            
+            if self._current_updated_at(prompt_name, prompt_type) == entry['updated_at']:
+                with self._lock:
+                    entry['checked_at'] = time.monotonic()
+                return entry['prompt_text']
+        
+        return self._load(prompt_name, prompt_type)
+    
+    def invalidate(self, prompt_name: Optional[str] = None):
+        """
+        Drop cached prompts.
+        
+        Args:
+            prompt_name: Prompt to drop (all types); None drops everything
+        """
+        with self._lock:
+            if prompt_name is None:
+                self._entries.clear()
+                self._generation += 1
+            else:
+                for key in [key for key in self._entries if key[0] == prompt_name]:
+                    del self._entries[key]
+                self._generations[prompt_name] = self._generations.get(prompt_name, 0) + 1
+    
+    def publish_change(self, session, prompt_name: str):
+        """
+        Invalidate a prompt here and, on commit, in every other worker.
+        
+        Args:
+            session: Session of the transaction that changes the prompt
+            prompt_name: Name of the changed prompt
+        """
+        self.invalidate(prompt_name)
+        notify(session, PROMPTS_CHANNEL, prompt_name)
+    
+    def _ensure_subscribed(self):
+        """Subscribe to invalidations once per process"""
+        # Cached entries and the subscription do not survive a fork
+        if self._subscribed_pid != os.getpid():
+            self._subscribed_pid = os.getpid()
+            with self._lock:
+                self._entries.clear()
+            # None (reconnect) clears everything, a name clears that prompt
+            notification_listener.subscribe(PROMPTS_CHANNEL, self.invalidate)
+    
+    def _current_updated_at(self, prompt_name: str, prompt_type: str):
+        """Fetch only updated_at for a prompt (None if it no longer exists)"""
+        session = get_db()
+        try:
+            row = session.query(AIPrompt.updated_at)\
+                .filter_by(name=prompt_name, prompt_type=prompt_type)\
+                .first()
+            return row.updated_at if row else None
+        finally:
+            session.close()
+    
+    def _generation_of(self, prompt_name: str) -> Tuple[int, int]:
+        """Invalidation counters covering a prompt (lock held)"""
+        return self._generation, self._generations.get(prompt_name, 0)
+    
+    def _load(self, prompt_name: str, prompt_type: str) -> str:
+        """Load a prompt from the database into the cache"""
+        with self._lock:
+            generation = self._generation_of(prompt_name)
+        
+        session = get_db()
+        try:
+            prompt = session.query(AIPrompt).filter_by(name=prompt_name, prompt_type=prompt_type).first()
+            if not prompt:
+                raise ValueError(f"Prompt '{prompt_name}' (type: {prompt_type}) not found in database")
+            
+            with self._lock:
+                if self._generation_of(prompt_name) != generation:
+                    # Invalidated while we read: the text may predate the change,
+                    # so serve it this once and let the next get() reload
+                    logger.info(f"Prompt '{prompt_name}' ({prompt_type}) changed while loading, not caching")
+                    return prompt.prompt_text
+                
+                self._entries[(prompt_name, prompt_type)] = {
+                    'prompt_text': prompt.prompt_text,
+                    'updated_at': prompt.updated_at,
+                    'checked_at': time.monotonic()
+                }
+            
+            logger.info(f"Loaded prompt '{prompt_name}' ({prompt_type}) into cache")
+            return prompt.prompt_text
+        finally:
+            session.close()
+
+
+# Process-wide cache shared by all OpenAIService instances
+prompt_cache = PromptCache()
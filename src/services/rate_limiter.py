@@ -0,0 +1,273 @@
+"""Cluster-wide requests/tokens-per-minute limiter for LLM calls"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.config import config
+from src.models.database import get_db_session
+from src.models.rate_limit import LLMRateLimit
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call would have to wait longer than OPENAI_RATE_LIMIT_MAX_WAIT"""
+
+
+def _take(
+    requests: float,
+    tokens: float,
+    elapsed: float,
+    rpm: int,
+    tpm: int,
+    cost: float
+) -> Tuple[float, float, float]:
+    """
+    Refill both buckets and try to take one request and `cost` tokens.
+    
+    A limit of 0 disables that bucket.
+    
+    Args:
+        requests: Requests available at the last refill
+        tokens: Tokens available at the last refill
+        elapsed: Seconds since the last refill
+        rpm: Requests per minute (bucket capacity)
+        tpm: Tokens per minute (bucket capacity)
+        cost: Tokens to reserve
+    
+    Returns:
+        (requests, tokens, wait): the new bucket levels, and 0 if the call
+        was admitted or else the seconds until it could be
+    """
+    elapsed = max(0.0, elapsed)
+    wait = 0.0
+    
+    if rpm > 0:
+        requests = min(float(rpm), requests + elapsed * rpm / 60)
+        if requests < 1:
+            wait = max(wait, (1 - requests) * 60 / rpm)
+    
+    if tpm > 0:
+        tokens = min(float(tpm), tokens + elapsed * tpm / 60)
+        # A call larger than the whole bucket waits for a full bucket instead of forever
+        cost = min(cost, tpm)
+        if tokens < cost:
+            wait = max(wait, (cost - tokens) * 60 / tpm)
+    
+    if wait:
+        return requests, tokens, wait
+    
+    return requests - (1 if rpm > 0 else 0), tokens - (cost if tpm > 0 else 0), 0.0
+
+
+class LocalBucketStore:
+    """In-process buckets: single-process runs, tests, and the fallback while the database is unreachable"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, List[float]] = {}
+    
+    def take(self, name: str, rpm: int, tpm: int, cost: float) -> float:
+        """Try to take one request and `cost` tokens; returns seconds to wait (0 = admitted)"""
+        now = time.time()
+        with self._lock:
+            requests, tokens, refilled_at = self._buckets.get(name, (float(rpm), float(tpm), now))
+            requests, tokens, wait = _take(requests, tokens, now - refilled_at, rpm, tpm, cost)
+            self._buckets[name] = [requests, tokens, now]
+        return wait
+    
+    def adjust(self, name: str, tpm: int, delta: float):
+        """Return (positive) or charge (negative) tokens after a call"""
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is not None:
+                bucket[1] = min(float(tpm), bucket[1] + delta)
+
+
+class PostgresBucketStore:
+    """
+    Buckets in the llm_rate_limits table, shared by every worker and replica.
+    
+    Each take() is one short transaction holding the bucket's row lock
+    (SELECT ... FOR UPDATE), so concurrent callers are serialized per
+    model without any coordinator process.
+    """
+    
+    def take(self, name: str, rpm: int, tpm: int, cost: float) -> float:
+        """Try to take one request and `cost` tokens; returns seconds to wait (0 = admitted)"""
+        with get_db_session() as session:
+            bucket = self._lock_bucket(session, name, rpm, tpm)
+            now = time.time()
+            bucket.requests, bucket.tokens, wait = _take(
+                bucket.requests,
+                bucket.tokens,
+                now - bucket.refilled_at,
+                rpm,
+                tpm,
+                cost
+            )
+            bucket.refilled_at = now
+        return wait
+    
+    def adjust(self, name: str, tpm: int, delta: float):
+        """Return (positive) or charge (negative) tokens after a call"""
+        with get_db_session() as session:
+            session.query(LLMRateLimit)\
+                .filter_by(name=name)\
+                .update({
+                    'tokens': LLMRateLimit.tokens + delta
+                }, synchronize_session=False)
+            if delta > 0:
+                # Never refund above capacity
+                session.query(LLMRateLimit)\
+                    .filter(LLMRateLimit.name == name, LLMRateLimit.tokens > tpm)\
+                    .update({'tokens': float(tpm)}, synchronize_session=False)
+    
+    @staticmethod
+    def _lock_bucket(session, name: str, rpm: int, tpm: int) -> LLMRateLimit:
+        """Lock the bucket row, creating a full bucket on first use"""
+        bucket = session.query(LLMRateLimit).filter_by(name=name).with_for_update().first()
+        if bucket is not None:
+            return bucket
+        
+        dialect = postgresql if session.get_bind().dialect.name == 'postgresql' else sqlite
+        session.execute(
+            dialect.insert(LLMRateLimit)
+            .values(name=name, requests=float(rpm), tokens=float(tpm), refilled_at=time.time())
+            .on_conflict_do_nothing(index_elements=['name'])
+        )
+        return session.query(LLMRateLimit).filter_by(name=name).with_for_update().one()
+
+
+class Reservation:
+    """Tokens reserved for one call, reconciled with the real usage afterwards"""
+    
+    def __init__(self, limiter: 'LLMRateLimiter', name: str, tokens: float):
+        self.limiter = limiter
+        self.name = name
+        self.tokens = tokens
+    
+    def settle(self, used_tokens: Optional[int]):
+        """
+        Reconcile the reservation with response.usage.
+        
+        Args:
+            used_tokens: Total tokens the call used; None (unknown, e.g. the
+                call failed) keeps the estimate charged
+        """
+        if used_tokens is None or self.limiter is None:
+            return
+        self.limiter._adjust(self.name, self.tokens - used_tokens)
+    
+    async def asettle(self, used_tokens: Optional[int]):
+        """Async settle(): the database update runs in a worker thread"""
+        if used_tokens is None or self.limiter is None:
+            return
+        await asyncio.to_thread(self.limiter._adjust, self.name, self.tokens - used_tokens)
+
+
+class LLMRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute token buckets for LLM calls.
+    
+    Every completion first reserves one request and its estimated tokens,
+    waiting until both buckets allow it, and settles the reservation with
+    the tokens response.usage reports. Buckets live in Postgres by default
+    (OPENAI_RATE_LIMIT_BACKEND=postgres), so the limits hold across all
+    workers and replicas; if the database cannot be reached the process
+    falls back to local buckets rather than failing the call.
+    """
+    
+    def __init__(self, rpm: int = None, tpm: int = None, backend: str = None, max_wait: float = None):
+        """
+        Args:
+            rpm: Requests per minute, 0 for no limit (defaults to OPENAI_RPM_LIMIT)
+            tpm: Tokens per minute, 0 for no limit (defaults to OPENAI_TPM_LIMIT)
+            backend: 'postgres' or 'local' (defaults to OPENAI_RATE_LIMIT_BACKEND)
+            max_wait: Longest wait before RateLimitTimeout (defaults to OPENAI_RATE_LIMIT_MAX_WAIT)
+        """
+        self.rpm = config.OPENAI_RPM_LIMIT if rpm is None else rpm
+        self.tpm = config.OPENAI_TPM_LIMIT if tpm is None else tpm
+        self.max_wait = config.OPENAI_RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+        backend = (backend or config.OPENAI_RATE_LIMIT_BACKEND).lower()
+        
+        self._local = LocalBucketStore()
+        self._store = PostgresBucketStore() if backend == 'postgres' else self._local
+    
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 or self.tpm > 0
+    
+    def acquire(self, name: str, tokens: float) -> Reservation:
+        """
+        Block until one request and `tokens` tokens are available, and reserve them.
+        
+        Args:
+            name: Bucket name (one per model deployment)
+            tokens: Estimated total tokens of the call
+        
+        Returns:
+            Reservation to settle with the actual usage
+        
+        Raises:
+            RateLimitTimeout: If the wait would exceed max_wait
+        """
+        if not self.enabled:
+            return Reservation(None, name, tokens)
+        
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait = self._take(name, tokens)
+            if not wait:
+                return Reservation(self, name, tokens)
+            time.sleep(self._backoff(name, wait, deadline))
+    
+    async def aacquire(self, name: str, tokens: float) -> Reservation:
+        """Async acquire(): bucket updates run in a worker thread, waits on the event loop"""
+        if not self.enabled:
+            return Reservation(None, name, tokens)
+        
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            wait = await asyncio.to_thread(self._take, name, tokens)
+            if not wait:
+                return Reservation(self, name, tokens)
+            await asyncio.sleep(self._backoff(name, wait, deadline))
+    
+    def _backoff(self, name: str, wait: float, deadline: float) -> float:
+        """Jittered sleep before the next attempt, so waiters across the cluster don't retry in lockstep"""
+        if time.monotonic() + wait > deadline:
+            raise RateLimitTimeout(f"Rate limit for {name} would need a {wait:.0f}s wait (max {self.max_wait:.0f}s)")
+        logger.info(f"Rate limit reached for {name}, waiting {wait:.1f}s")
+        return wait + random.uniform(0, min(1.0, wait * 0.1))
+    
+    def _take(self, name: str, tokens: float) -> float:
+        """Try the configured store, falling back to local buckets on database errors"""
+        try:
+            return self._store.take(name, self.rpm, self.tpm, tokens)
+        except Exception as e:
+            if self._store is self._local:
+                raise
+            logger.warning(f"Rate limit store unavailable, using local buckets: {e}")
+            return self._local.take(name, self.rpm, self.tpm, tokens)
+    
+    def _adjust(self, name: str, delta: float):
+        """Apply a settled reservation (errors are logged, never raised)"""
+        if not delta or self.tpm <= 0:
+            return
+        try:
+            self._store.adjust(name, self.tpm, delta)
+        except Exception as e:
+            logger.warning(f"Could not reconcile rate limit tokens for {name}: {e}")
+        if self._store is not self._local:
+            # The local buckets may have admitted calls during a database outage
+            self._local.adjust(name, self.tpm, delta)
+
+
+# Process-wide limiter for OpenAI completions
+llm_rate_limiter = LLMRateLimiter()
@@ -0,0 +1,358 @@
+"""Retries, backoff and circuit breakers for OpenAI and S3"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import openai
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, HTTPClientError
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Error classes (see classify_error)
+THROTTLED = 'throttled'
+UNAVAILABLE = 'unavailable'
+
+# S3/R2 error codes that mean "slow down" or "try again"
+_S3_THROTTLE_CODES = {'SlowDown', 'Throttling', 'ThrottlingException', 'TooManyRequests', 'RequestLimitExceeded'}
+_S3_UNAVAILABLE_CODES = {'InternalError', 'ServiceUnavailable', 'RequestTimeout', 'RequestTimeTooSkewed'}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open"""
+    
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} is unavailable (circuit open, retrying in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Decide whether an error is worth retrying.
+    
+    Args:
+        error: Exception raised by an OpenAI or S3 call
+    
+    Returns:
+        THROTTLED (429 / SlowDown), UNAVAILABLE (5xx, connection errors,
+        timeouts) or None for errors a retry cannot fix (4xx, bad input)
+    """
+    if isinstance(error, openai.RateLimitError):
+        return THROTTLED
+    if isinstance(error, openai.APIStatusError):
+        return UNAVAILABLE if error.status_code >= 500 or error.status_code == 408 else None
+    if isinstance(error, openai.APIConnectionError):
+        return UNAVAILABLE
+    
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+        if status == 429 or code in _S3_THROTTLE_CODES:
+            return THROTTLED
+        if status >= 500 or code in _S3_UNAVAILABLE_CODES:
+            return UNAVAILABLE
+        return None
+    if isinstance(error, (BotoConnectionError, HTTPClientError, httpx.TransportError)):
+        return UNAVAILABLE
+    
+    # Stalled OpenAI streams (see OpenAIService._stream_completion)
+    if isinstance(error, TimeoutError):
+        return UNAVAILABLE
+    
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """
+    Read the server's requested delay from an error response.
+    
+    Understands Azure's retry-after-ms and Retry-After as seconds or an
+    HTTP date.
+    
+    Args:
+        error: Exception raised by an OpenAI or S3 call
+    
+    Returns:
+        Seconds to wait, or None if the response did not say
+    """
+    headers = {}
+    if isinstance(error, openai.APIStatusError):
+        headers = error.response.headers
+    elif isinstance(error, ClientError):
+        headers = error.response.get('ResponseMetadata', {}).get('HTTPHeaders') or {}
+    
+    for name, scale in (('retry-after-ms', 0.001), ('x-ms-retry-after-ms', 0.001), ('retry-after', 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    
+    return None
+
+
+class Dependency:
+    """
+    Resilience policy and counters for one external dependency.
+    
+    call()/acall() retry transient errors with full-jitter exponential
+    backoff. A Retry-After from the server replaces the backoff and also
+    pauses every other caller of the dependency until it has passed, so a
+    throttled backend sees fewer requests instead of a retry storm.
+    
+    Consecutive UNAVAILABLE failures open the circuit breaker: calls then
+    fail immediately with CircuitOpenError for CIRCUIT_RESET_TIMEOUT
+    seconds, after which a single trial call decides whether it closes
+    again. Throttling never opens the circuit, since the backend is up
+    and only asking for fewer requests.
+    
+    Counters are per process.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = None,
+        base_delay: float = None,
+        max_delay: float = None,
+        failure_threshold: int = None,
+        reset_timeout: float = None
+    ):
+        """
+        Args:
+            name: Dependency name used in logs, errors and /admin/dependencies
+            max_attempts: Attempts per call (defaults to RETRY_MAX_ATTEMPTS)
+            base_delay: First backoff cap in seconds (defaults to RETRY_BASE_DELAY)
+            max_delay: Largest backoff/Retry-After honored (defaults to RETRY_MAX_DELAY)
+            failure_threshold: Consecutive failures that open the circuit
+                (defaults to CIRCUIT_FAILURE_THRESHOLD)
+            reset_timeout: Seconds the circuit stays open (defaults to CIRCUIT_RESET_TIMEOUT)
+        """
+        self.name = name
+        self.max_attempts = max(1, max_attempts or config.RETRY_MAX_ATTEMPTS)
+        self.base_delay = config.RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = config.RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.failure_threshold = max(1, failure_threshold or config.CIRCUIT_FAILURE_THRESHOLD)
+        self.reset_timeout = config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._paused_until = 0.0
+        self._counters = {
+            'calls': 0,
+            'errors': 0,
+            'throttled': 0,
+            'retries': 0,
+            'gave_up': 0,
+            'rejected': 0,
+            'circuit_opened': 0
+        }
+    
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Call func(*args, **kwargs), retrying transient errors.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error once retries are exhausted, or any
+                non-transient error right away
+        """
+        attempt = 1
+        while True:
+            pause = self._before_attempt()
+            if pause:
+                time.sleep(pause)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            
+            self._after_success()
+            return result
+    
+    async def acall(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async call(): awaits func() (a fresh awaitable per attempt).
+        
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The last error once retries are exhausted, or any
+                non-transient error right away
+        """
+        attempt = 1
+        while True:
+            pause = self._before_attempt()
+            if pause:
+                await asyncio.sleep(pause)
+            try:
+                result = await func()
+            except Exception as e:
+                delay = self._after_failure(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            
+            self._after_success()
+            return result
+    
+    def snapshot(self) -> Dict:
+        """
+        Current breaker state and counters.
+        
+        Returns:
+            Dict with 'state', 'consecutive_failures', 'paused_for' (seconds
+            left of a Retry-After pause) and the counters
+        """
+        with self._lock:
+            self._refresh_state()
+            return {
+                'state': self._state,
+                'consecutive_failures': self._consecutive_failures,
+                'paused_for': round(max(0.0, self._paused_until - time.monotonic()), 3),
+                **self._counters
+            }
+    
+    def reset(self):
+        """Close the circuit and zero the counters"""
+        with self._lock:
+            self._state = 'closed'
+            self._consecutive_failures = 0
+            self._trial_running = False
+            self._paused_until = 0.0
+            for name in self._counters:
+                self._counters[name] = 0
+    
+    def _refresh_state(self):
+        """Move an open circuit to half-open once its timeout has passed (lock held)"""
+        if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = 'half_open'
+            self._trial_running = False
+    
+    def _before_attempt(self) -> float:
+        """
+        Admit an attempt through the breaker.
+        
+        Returns:
+            Seconds to wait first (a shared Retry-After pause)
+        
+        Raises:
+            CircuitOpenError: If the circuit is open or its trial call is running
+        """
+        with self._lock:
+            self._refresh_state()
+            
+            if self._state == 'open' or (self._state == 'half_open' and self._trial_running):
+                self._counters['rejected'] += 1
+                retry_in = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+                raise CircuitOpenError(self.name, retry_in)
+            
+            if self._state == 'half_open':
+                self._trial_running = True
+            
+            self._counters['calls'] += 1
+            return max(0.0, self._paused_until - time.monotonic())
+    
+    def _after_success(self):
+        """Close the circuit after a successful attempt"""
+        with self._lock:
+            if self._state != 'closed':
+                logger.info(f"{self.name} recovered, closing circuit")
+            self._state = 'closed'
+            self._consecutive_failures = 0
+            self._trial_running = False
+    
+    def _after_failure(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Record a failed attempt and decide whether to retry.
+        
+        Args:
+            error: The exception
+            attempt: 1-based attempt number
+        
+        Returns:
+            Seconds to wait before the next attempt, or None to raise
+        """
+        kind = classify_error(error)
+        
+        with self._lock:
+            if self._state == 'half_open':
+                self._trial_running = False
+            
+            if kind is None:
+                # The backend answered; the request itself was wrong
+                if self._state == 'half_open':
+                    self._state = 'closed'
+                    self._consecutive_failures = 0
+                return None
+            
+            self._counters['errors'] += 1
+            wait = None
+            
+            if kind == THROTTLED:
+                self._counters['throttled'] += 1
+                wait = retry_after(error)
+                if wait is not None:
+                    wait = min(wait, self.max_delay)
+                    self._paused_until = max(self._paused_until, time.monotonic() + wait)
+            else:
+                self._consecutive_failures += 1
+                if self._state == 'half_open' or (
+                    self._state == 'closed' and self._consecutive_failures >= self.failure_threshold
+                ):
+                    self._state = 'open'
+                    self._opened_at = time.monotonic()
+                    self._counters['circuit_opened'] += 1
+                    logger.error(
+                        f"{self.name} failed {self._consecutive_failures} times in a row, "
+                        f"opening circuit for {self.reset_timeout:.0f}s: {error}"
+                    )
+                    self._counters['gave_up'] += 1
+                    return None
+            
+            if attempt >= self.max_attempts:
+                self._counters['gave_up'] += 1
+                return None
+            
+            self._counters['retries'] += 1
+        
+        if wait is None:
+            # Full jitter: uniform in [0, min(max_delay, base * 2^(attempt - 1))]
+            wait = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        
+        logger.warning(f"{self.name} {kind} (attempt {attempt}/{self.max_attempts}), retrying in {wait:.2f}s: {error}")
+        return wait
+
+
+# Process-wide policies shared by the sync and async services
+openai_dependency = Dependency('openai')
+s3_dependency = Dependency('s3')
+
+dependencies = {
+    dependency.name: dependency
+    for dependency in (openai_dependency, s3_dependency)
+}
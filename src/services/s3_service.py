@@ -1,67 +1,86 @@
 """S3/R2 storage service"""
+import base64
+import hashlib
 import logging
-from typing import List, Optional, Dict
-import boto3
+from typing import Callable, Iterator, List, Optional, Dict, Tuple, TypeVar
 from botocore.exceptions import ClientError
 
 from src.config import config
+from src.services.clients import get_s3_client
+from src.services.description_cache import description_cache
+from src.services.metrics import S3_OPERATION_SECONDS
+from src.services.resilience import s3_dependency
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 class S3Service:
-    """Service for interacting with S3/R2 storage"""
+    """
+    Service for interacting with S3/R2 storage.
+    
+    Every request goes through _call: s3_dependency retries throttling and
+    transient errors and fails fast while the circuit breaker is open, and
+    S3_OPERATION_SECONDS records its latency.
+    """
     
     def __init__(self):
-        """Initialize S3 client"""
-        self.client = boto3.client(
-            's3',
-            endpoint_url=config.S3_ENDPOINT,
-            aws_access_key_id=config.S3_ACCESS_KEY_ID,
-            aws_secret_access_key=config.S3_SECRET_ACCESS_KEY,
-            region_name=config.S3_REGION
-        )
+        """Initialize S3 service with the shared per-process client"""
+        self.client = get_s3_client()
         self.bucket = config.S3_BUCKET_NAME
     
-    def fetch_timestamp_files(self, novel_name: str) -> List[Dict[str, str]]:
+    def fetch_timestamp_files(self, novel_name: str, start_after: Optional[str] = None) -> List[Dict[str, str]]:
         """
         Fetch all timestamp files for a novel.
         
         Args:
             novel_name: Name of the novel
-            
+            start_after: Only return videos listed after this video name
+        
         Returns:
-            List of dicts with 'key' and 'video_name' for each timestamp file
+            List of dicts with 'key', 'video_name', 'size' and 'etag' for each timestamp file
+        """
+        files = list(self.iter_timestamp_files(novel_name, start_after=start_after))
+        
+        if not files:
+            logger.warning(f"No timestamp files found for novel: {novel_name}")
+        
+        logger.info(f"Found {len(files)} timestamp files")
+        return files
+    
+    def iter_timestamp_files(self, novel_name: str, start_after: Optional[str] = None) -> Iterator[Dict[str, str]]:
+        """
+        Lazily list timestamp files for a novel, one listing page at a time.
+        
+        Later pages are only requested once the caller has consumed the
+        earlier ones, so work can start on the first page immediately.
+        
+        Args:
+            novel_name: Name of the novel
+            start_after: Only yield videos listed after this video name
+        
+        Yields:
+            Dicts with 'key', 'video_name', 'size' and 'etag' for each timestamp file
         """
         try:
             prefix = f"{novel_name}/Timestamps/"
             logger.info(f"Fetching timestamp files from: {prefix}")
             
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                logger.warning(f"No timestamp files found for novel: {novel_name}")
-                return []
-            
-            files = []
-            for obj in response['Contents']:
+            for obj in self._iter_objects(prefix, start_after=start_after):
                 key = obj['Key']
                 # Extract video name from key (remove prefix and extension)
                 video_name = key.replace(prefix, '').replace('.txt', '')
                 
                 # Skip empty or directory entries
                 if video_name:
-                    files.append({
+                    yield {
                         'key': key,
-                        'video_name': video_name
-                    })
-            
-            logger.info(f"Found {len(files)} timestamp files")
-            return files
-            
+                        'video_name': video_name,
+                        'size': obj.get('Size'),
+                        'etag': obj.get('ETag', '').strip('"')
+                    }
+        
         except ClientError as e:
             logger.error(f"Error fetching timestamp files: {e}")
             raise
@@ -81,12 +100,9 @@ class S3Service:
             key = f"{novel_name}/Timestamps/{video_name}.txt"
             logger.info(f"Reading timestamp file: {key}")
             
-            response = self.client.get_object(
-                Bucket=self.bucket,
-                Key=key
-            )
+            _, body = self._get_object(Bucket=self.bucket, Key=key)
             
-            content = response['Body'].read().decode('utf-8')
+            content = body.decode('utf-8')
             logger.info(f"Read timestamp file ({len(content)} chars)")
             
             return content
@@ -95,29 +111,51 @@ class S3Service:
             logger.error(f"Error reading timestamp file: {e}")
             raise
     
-    def save_description(self, novel_name: str, video_name: str, description: str) -> bool:
+    def save_description(
+        self,
+        novel_name: str,
+        video_name: str,
+        description: str,
+        existing_etag: Optional[str] = None
+    ) -> bool:
         """
-        Save description to S3.
+        Save description to S3, skipping the upload if it is already stored.
         
         Args:
             novel_name: Name of the novel
             video_name: Name of the video (without extension)
             description: Description content to save
-            
+            existing_etag: ETag of the stored description (from a listing or
+                description_etag()); None uploads unconditionally
+        
         Returns:
-            True if successful
+            True if the description was uploaded, False if the stored object
+            already had identical content
         """
         try:
             key = f"{novel_name}/Youtube/{video_name}.txt"
+            body = description.encode('utf-8')
+            digest = hashlib.md5(body)
+            
+            # Single-part uploads have the hex MD5 of the body as their ETag
+            if existing_etag and existing_etag.strip('"') == digest.hexdigest():
+                logger.info(f"Description unchanged, skipping upload: {key}")
+                return False
+            
             logger.info(f"Saving description to: {key}")
             
-            self.client.put_object(
+            self._call(
+                'PutObject',
+                self.client.put_object,
                 Bucket=self.bucket,
                 Key=key,
-                Body=description.encode('utf-8'),
-                ContentType='text/plain'
+                Body=body,
+                ContentType='text/plain',
+                ContentMD5=base64.b64encode(digest.digest()).decode('ascii')
             )
             
+            description_cache.invalidate(novel_name, video_name)
+            
             logger.info(f"Successfully saved description ({len(description)} chars)")
             return True
             
@@ -125,6 +163,36 @@ class S3Service:
             logger.error(f"Error saving description: {e}")
             raise
     
+    def description_etag(self, novel_name: str, video_name: str) -> Optional[str]:
+        """
+        Get the ETag of a description file with a HEAD request.
+        
+        Args:
+            novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+        
+        Returns:
+            ETag without quotes, or None if the description does not exist
+        """
+        try:
+            key = f"{novel_name}/Youtube/{video_name}.txt"
+            
+            response = self._call(
+                'HeadObject',
+                self.client.head_object,
+                Bucket=self.bucket,
+                Key=key
+            )
+            
+            return response.get('ETag', '').strip('"')
+        
+        except ClientError as e:
+            if e.response['Error']['Code'] == '404':
+                return None
+            else:
+                logger.error(f"Error checking description ETag: {e}")
+                raise
+    
     def description_exists(self, novel_name: str, video_name: str) -> bool:
         """
         Check if a description file already exists.
@@ -139,7 +207,9 @@ class S3Service:
         try:
             key = f"{novel_name}/Youtube/{video_name}.txt"
             
-            self.client.head_object(
+            self._call(
+                'HeadObject',
+                self.client.head_object,
                 Bucket=self.bucket,
                 Key=key
             )
@@ -167,14 +237,10 @@ class S3Service:
         try:
             key = f"{novel_name}/Youtube/{video_name}.txt"
             
-            response = self.client.get_object(
-                Bucket=self.bucket,
-                Key=key
-            )
-            
-            content = response['Body'].read().decode('utf-8')
-            return content
+            _, body = self._get_object(Bucket=self.bucket, Key=key)
             
+            return body.decode('utf-8')
+        
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
                 return None
@@ -182,39 +248,167 @@ class S3Service:
                 logger.error(f"Error getting description: {e}")
                 raise
     
-    def list_descriptions(self, novel_name: str) -> List[str]:
+    def get_description_object(
+        self,
+        novel_name: str,
+        video_name: str,
+        if_none_match: Optional[str] = None
+    ) -> Optional[Dict[str, Optional[str]]]:
         """
-        List all description files for a novel.
+        Get description content and ETag, optionally only if it changed.
         
         Args:
             novel_name: Name of the novel
+            video_name: Name of the video (without extension)
+            if_none_match: ETag the caller already has; a matching object is
+                answered with a body-less 304
+        
+        Returns:
+            Dict with 'etag' and 'description' ('description' is None when the
+            object still matches if_none_match), or None if not found
+        """
+        try:
+            key = f"{novel_name}/Youtube/{video_name}.txt"
+            params = {'Bucket': self.bucket, 'Key': key}
+            if if_none_match:
+                params['IfNoneMatch'] = f'"{if_none_match}"'
+            
+            response, body = self._get_object(**params)
+            
+            return {
+                'etag': response.get('ETag', '').strip('"'),
+                'description': body.decode('utf-8')
+            }
+        
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code in ('304', 'NotModified'):
+                return {'etag': if_none_match, 'description': None}
+            if code == 'NoSuchKey':
+                return None
+            logger.error(f"Error getting description: {e}")
+            raise
+    
+    def _get_object(self, **params) -> Tuple[Dict, bytes]:
+        """
+        GET an object and read its body as one retried operation.
+        
+        Args:
+            **params: Parameters for get_object
+        
+        Returns:
+            (response, body bytes)
+        """
+        def get():
+            response = self.client.get_object(**params)
+            return response, response['Body'].read()
+        
+        return self._call('GetObject', get)
+    
+    @staticmethod
+    def _call(operation: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run one S3 request through s3_dependency and time it.
+        
+        Args:
+            operation: S3 API operation name (metric label)
+            func: Client method (or wrapper) making the request
+            *args, **kwargs: Arguments for func
+        
+        Returns:
+            func's result
+        """
+        with S3_OPERATION_SECONDS.labels(operation).time():
+            return s3_dependency.call(func, *args, **kwargs)
+    
+    def _iter_objects(self, prefix: str, start_after: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterate over all objects under a prefix, following continuation tokens.
+        
+        Args:
+            prefix: Key prefix to list
+            start_after: Video name (without extension) to resume the listing after
+        
+        Yields:
+            Raw object entries from list_objects_v2
+        """
+        params = {
+            'Bucket': self.bucket,
+            'Prefix': prefix
+        }
+        if start_after:
+            params['StartAfter'] = f"{prefix}{start_after}.txt"
+        
+        while True:
+            response = self._call('ListObjectsV2', self.client.list_objects_v2, **params)
+            
+            yield from response.get('Contents', [])
             
+            if not response.get('IsTruncated'):
+                return
+            
+            params['ContinuationToken'] = response['NextContinuationToken']
+            # StartAfter is ignored once a continuation token is sent
+            params.pop('StartAfter', None)
+    
+    def list_descriptions(self, novel_name: str, start_after: Optional[str] = None) -> List[str]:
+        """
+        List all description files for a novel.
+        
+        Args:
+            novel_name: Name of the novel
+            start_after: Only return videos listed after this video name
+        
         Returns:
             List of video names that have descriptions
         """
+        return [info['video_name'] for info in self.iter_descriptions(novel_name, start_after=start_after)]
+    
+    def iter_descriptions(self, novel_name: str, start_after: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily list description files for a novel, one listing page at a time.
+        
+        Args:
+            novel_name: Name of the novel
+            start_after: Only yield videos listed after this video name
+        
+        Yields:
+            Dicts with 'key', 'video_name', 'size' and 'etag' for each description
+        """
         try:
             prefix = f"{novel_name}/Youtube/"
             
-            response = self.client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=prefix
-            )
-            
-            if 'Contents' not in response:
-                return []
-            
-            video_names = []
-            for obj in response['Contents']:
+            for obj in self._iter_objects(prefix, start_after=start_after):
                 key = obj['Key']
                 # Extract video name from key
                 video_name = key.replace(prefix, '').replace('.txt', '')
                 
                 if video_name:
-                    video_names.append(video_name)
-            
-            return video_names
-            
+                    yield {
+                        'key': key,
+                        'video_name': video_name,
+                        'size': obj.get('Size'),
+                        'etag': obj.get('ETag', '').strip('"')
+                    }
+        
         except ClientError as e:
             logger.error(f"Error listing descriptions: {e}")
             raise
-
+    
+    def snapshot_descriptions(self, novel_name: str) -> Dict[str, Dict]:
+        """
+        Snapshot all existing descriptions for a novel.
+        
+        Lets a job decide which videos to skip with a dict lookup instead of
+        one HEAD request per video.
+        
+        Args:
+            novel_name: Name of the novel
+        
+        Returns:
+            Dict of video name -> {'key', 'video_name', 'size', 'etag'}
+        """
+        snapshot = {info['video_name']: info for info in self.iter_descriptions(novel_name)}
+        
+        logger.info(f"Found {len(snapshot)} existing descriptions for novel: {novel_name}")
+        return snapshot
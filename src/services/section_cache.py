@@ -0,0 +1,176 @@
+"""Content-addressed cache for AI-generated novel sections"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from src.config import config
+from src.models.database import get_db
+from src.models.section_cache import AISectionCache
+from src.services.notification_service import notification_listener, notify
+from src.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel used to drop overwritten entries in every worker process
+SECTIONS_CHANNEL = 'ai_sections_changed'
+
+
+class SectionCache:
+    """
+    Caches parsed about/what_to_expect/subscribe/tags sections.
+    
+    Entries are keyed by a hash of every input that shapes the completion,
+    so a changed prompt, context or model is simply a different key. Postgres
+    holds the entries durably; a per-process LRU sits in front of it. The
+    only overwrite is a bypass_cache regeneration, which NOTIFYs every worker
+    to drop its copy; without notifications (listener down, or not on
+    PostgreSQL) lookups skip the LRU and read the table.
+    """
+    
+    def __init__(self, maxsize: int = None):
+        """
+        Args:
+            maxsize: In-memory LRU entries (defaults to SECTION_CACHE_SIZE)
+        """
+        self._memory = LRUCache(maxsize=config.SECTION_CACHE_SIZE if maxsize is None else maxsize)
+        self._lock = threading.Lock()
+        # Bumped by invalidate(), so a read that raced an overwrite does not
+        # store what it read
+        self._generation = 0
+        self._subscribed_pid = None
+    
+    @staticmethod
+    def make_key(novel_name: str, novel_context: str, system_prompt: str, user_prompt: str, model: str) -> str:
+        """
+        Hash the inputs of a section generation.
+        
+        Args:
+            novel_name: Name of the novel
+            novel_context: User-provided context
+            system_prompt: System prompt text
+            user_prompt: User prompt text (after filling variables)
+            model: Model or deployment name
+        
+        Returns:
+            Hex sha256 digest
+        """
+        payload = json.dumps(
+            [novel_name, novel_context, system_prompt, user_prompt, model],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, cache_key: str) -> Optional[Dict[str, str]]:
+        """
+        Look up cached sections.
+        
+        Args:
+            cache_key: Key from make_key()
+        
+        Returns:
+            Sections dict or None on a miss
+        """
+        self._ensure_subscribed()
+        
+        if notification_listener.is_listening(SECTIONS_CHANNEL):
+            sections = self._memory.get(cache_key)
+            if sections is not None:
+                return dict(sections)
+        
+        with self._lock:
+            generation = self._generation
+        
+        session = get_db()
+        try:
+            entry = session.query(AISectionCache).filter_by(cache_key=cache_key).first()
+            if not entry:
+                return None
+            sections = entry.to_sections()
+        except Exception as e:
+            # The cache is an optimization; a lookup failure is just a miss
+            logger.error(f"Error reading section cache entry: {e}")
+            return None
+        finally:
+            session.close()
+        
+        with self._lock:
+            if self._generation == generation:
+                self._memory.set(cache_key, sections)
+        return dict(sections)
+    
+    def put(self, cache_key: str, novel_name: str, model: str, sections: Dict[str, str]):
+        """
+        Store sections, replacing any earlier entry for the same key.
+        
+        A regeneration with bypass_cache overwrites the entry, so the next
+        cached run reuses the newest output; other workers are told to drop
+        their copy once the overwrite commits.
+        
+        Args:
+            cache_key: Key from make_key()
+            novel_name: Name of the novel
+            model: Model or deployment name
+            sections: Parsed sections
+        """
+        self._ensure_subscribed()
+        self.invalidate(cache_key)
+        
+        session = get_db()
+        try:
+            entry = session.query(AISectionCache).filter_by(cache_key=cache_key).first()
+            if entry:
+                notify(session, SECTIONS_CHANNEL, cache_key)
+            else:
+                entry = AISectionCache(cache_key=cache_key, novel_name=novel_name, model=model)
+                session.add(entry)
+            
+            entry.about = sections['about']
+            entry.what_to_expect = sections['what_to_expect']
+            entry.subscribe = sections['subscribe']
+            entry.tags = sections['tags']
+            session.commit()
+        except IntegrityError:
+            # A concurrent run stored the same key first; the next get() reads theirs
+            session.rollback()
+            return
+        except Exception as e:
+            # The cache is an optimization; never fail a job over it
+            session.rollback()
+            logger.error(f"Error storing section cache entry: {e}")
+            return
+        finally:
+            session.close()
+        
+        self._memory.set(cache_key, dict(sections))
+    
+    def invalidate(self, cache_key: Optional[str] = None):
+        """
+        Drop in-memory entries.
+        
+        Args:
+            cache_key: Entry to drop; None drops everything
+        """
+        with self._lock:
+            if cache_key is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(cache_key)
+            self._generation += 1
+    
+    def _ensure_subscribed(self):
+        """Subscribe to invalidations once per process"""
+        # Cached entries and the subscription do not survive a fork
+        if self._subscribed_pid != os.getpid():
+            self._subscribed_pid = os.getpid()
+            self._memory.clear()
+            # None (reconnect) clears everything, a key clears that entry
+            notification_listener.subscribe(SECTIONS_CHANNEL, self.invalidate)
+
+
+# Process-wide cache shared by all OpenAIService instances
+section_cache = SectionCache()
@@ -1,12 +1,231 @@
 """Template service for building YouTube descriptions"""
 import logging
+from string import Formatter
+from typing import Dict, Optional
+
+from src.services.prompt_cache import prompt_cache
 
 logger = logging.getLogger(__name__)
 
+# ai_prompts.prompt_type of description templates
+TEMPLATE_PROMPT_TYPE = 'template'
+
+# Template used when no template is requested
+DEFAULT_TEMPLATE_NAME = 'description_template'
+
+# YouTube's description limit
+MAX_DESCRIPTION_LENGTH = 5000
+
+# Placeholders a template may use; {timestamps} must appear exactly once, without a format spec
+TEMPLATE_FIELDS = (
+    'playlist_url',
+    'novel_name',
+    'about',
+    'what_to_expect',
+    'subscribe',
+    'timestamps',
+    'seo_tags'
+)
+
+# Built-in copy of the default template (seeded by migration 017); used
+# when the database has no DEFAULT_TEMPLATE_NAME row
+DEFAULT_TEMPLATE = """Full Playlist: {playlist_url}
+
+📚 About "{novel_name}"
+
+{about}
+
+⭐ What to Expect
+
+{what_to_expect}
+
+🔔 Subscribe for More
+
+{subscribe}
+
+⏰ Timestamps:
+
+{timestamps}
+
+Tags:
+{seo_tags}"""
+
+
+class CompiledTemplate:
+    """
+    A template with every novel-level field filled in.
+    
+    Only the timestamps differ between the videos of a job, so compiling
+    leaves a fixed prefix and suffix around the timestamp slot: rendering
+    a video is one concatenation and validating it is a length check.
+    """
+    
+    def __init__(self, prefix: str, suffix: str):
+        """
+        Args:
+            prefix: Text before the timestamps
+            suffix: Text after the timestamps
+        """
+        self.prefix = prefix
+        self.suffix = suffix
+        # Room left for timestamps within MAX_DESCRIPTION_LENGTH
+        self.max_timestamps_length = MAX_DESCRIPTION_LENGTH - len(prefix) - len(suffix)
+    
+    def render(self, timestamps: str) -> str:
+        """
+        Build the description for one video.
+        
+        Args:
+            timestamps: Timestamp content from S3
+        
+        Returns:
+            Complete formatted description
+        """
+        return f"{self.prefix}{timestamps}{self.suffix}"
+    
+    def validate(self, description: str) -> tuple[bool, str]:
+        """
+        Validate a description rendered from this template.
+        
+        The fixed parts were validated by TemplateService.compile(), so only
+        the length can still be wrong.
+        
+        Args:
+            description: Output of render()
+        
+        Returns:
+            (is_valid, error_message)
+        """
+        if len(description) > MAX_DESCRIPTION_LENGTH:
+            return False, f"Description exceeds YouTube's {MAX_DESCRIPTION_LENGTH} character limit"
+        
+        return True, ""
+
 
 class TemplateService:
     """Service for building YouTube descriptions from components"""
     
+    @staticmethod
+    def load_template(template_name: Optional[str] = None) -> str:
+        """
+        Load template text from ai_prompts (prompt_type 'template').
+        
+        Args:
+            template_name: Template to load (defaults to DEFAULT_TEMPLATE_NAME)
+        
+        Returns:
+            Template text
+        
+        Raises:
+            ValueError: If a non-default template does not exist
+        """
+        template_name = template_name or DEFAULT_TEMPLATE_NAME
+        try:
+            return prompt_cache.get(template_name, TEMPLATE_PROMPT_TYPE)
+        except ValueError:
+            if template_name != DEFAULT_TEMPLATE_NAME:
+                raise
+            logger.warning(f"Template '{template_name}' not in database, using built-in default")
+            return DEFAULT_TEMPLATE
+    
+    @staticmethod
+    def check_template(template_text: str) -> Optional[str]:
+        """
+        Check a template's structure.
+        
+        Args:
+            template_text: Template with {placeholders} (literal braces doubled)
+        
+        Returns:
+            Error message, or None if the template is valid
+        """
+        try:
+            placeholders = [
+                (field, spec, conversion)
+                for _, field, spec, conversion in Formatter().parse(template_text)
+                if field is not None
+            ]
+        except ValueError as e:
+            return f"Invalid template syntax: {e}"
+        
+        for field, spec, conversion in placeholders:
+            if field not in TEMPLATE_FIELDS:
+                return f"Unknown template placeholder: {{{field}}} (allowed: {', '.join(TEMPLATE_FIELDS)})"
+            # Timestamps are spliced in verbatim by CompiledTemplate.render(),
+            # so a format spec or conversion would be silently ignored
+            if field == 'timestamps' and (spec or conversion):
+                return "{timestamps} does not take a format spec or conversion"
+        
+        fields = [field for field, _, _ in placeholders]
+        if fields.count('timestamps') != 1:
+            return "Template must contain {timestamps} exactly once"
+        
+        return None
+    
+    @staticmethod
+    def compile(
+        template_text: str,
+        playlist_url: str,
+        novel_name: str,
+        about: str,
+        what_to_expect: str,
+        subscribe: str,
+        seo_tags: str
+    ) -> CompiledTemplate:
+        """
+        Fill in the novel-level fields of a template once per job.
+        
+        Args:
+            template_text: Template from load_template()
+            playlist_url: Full playlist URL
+            novel_name: Name of the novel
+            about: AI-generated "About" section (8-13 lines)
+            what_to_expect: AI-generated "What to Expect" section (3-6 sentences)
+            subscribe: AI-generated subscribe call-to-action (2-3 sentences)
+            seo_tags: AI-generated SEO hashtags (500 chars)
+        
+        Returns:
+            Compiled template
+        
+        Raises:
+            ValueError: If the template is malformed or leaves no room for timestamps
+        """
+        error = TemplateService.check_template(template_text)
+        if error:
+            raise ValueError(error)
+        
+        values: Dict[str, str] = {
+            'playlist_url': playlist_url,
+            'novel_name': novel_name,
+            'about': about,
+            'what_to_expect': what_to_expect,
+            'subscribe': subscribe,
+            'seo_tags': seo_tags
+        }
+        
+        formatter = Formatter()
+        parts = {'prefix': [], 'suffix': []}
+        current = parts['prefix']
+        for literal, field, spec, conversion in formatter.parse(template_text):
+            current.append(literal)
+            if field == 'timestamps':
+                current = parts['suffix']
+            elif field is not None:
+                value = formatter.convert_field(values[field], conversion)
+                current.append(formatter.format_field(value, spec or ''))
+        
+        compiled = CompiledTemplate(''.join(parts['prefix']), ''.join(parts['suffix']))
+        
+        if not (compiled.prefix + compiled.suffix).strip():
+            raise ValueError("Template renders an empty description")
+        if compiled.max_timestamps_length < 0:
+            raise ValueError(
+                f"Description without timestamps exceeds YouTube's {MAX_DESCRIPTION_LENGTH} character limit"
+            )
+        
+        logger.info(f"Compiled template ({len(compiled.prefix) + len(compiled.suffix)} fixed chars)")
+        return compiled
+    
     @staticmethod
     def build_description(
         playlist_url: str,
@@ -18,7 +237,9 @@ class TemplateService:
         seo_tags: str
     ) -> str:
         """
-        Build complete YouTube description from template.
+        Build complete YouTube description from the built-in default template.
+        
+        Jobs compile their template once with compile() instead.
         
         Args:
             playlist_url: Full playlist URL
@@ -32,27 +253,15 @@ class TemplateService:
         Returns:
             Complete formatted description
         """
-        # Build the complete description
-        description = f"""Full Playlist: {playlist_url}
-
-📚 About "{novel_name}"
-
-{about}
-
-⭐ What to Expect
-
-{what_to_expect}
-
-🔔 Subscribe for More
-
-{subscribe}
-
-⏰ Timestamps:
-
-{timestamps}
-
-Tags:
-{seo_tags}"""
+        description = TemplateService.compile(
+            DEFAULT_TEMPLATE,
+            playlist_url=playlist_url,
+            novel_name=novel_name,
+            about=about,
+            what_to_expect=what_to_expect,
+            subscribe=subscribe,
+            seo_tags=seo_tags
+        ).render(timestamps)
         
         logger.info(f"Built description ({len(description)} chars)")
         
@@ -61,7 +270,7 @@ Tags:
     @staticmethod
     def validate_description(description: str) -> tuple[bool, str]:
         """
-        Validate a built description.
+        Validate a description built from the default template.
         
         Args:
             description: Complete description text
@@ -72,8 +281,8 @@ Tags:
         if not description:
             return False, "Description is empty"
         
-        if len(description) > 5000:
-            return False, "Description exceeds YouTube's 5000 character limit"
+        if len(description) > MAX_DESCRIPTION_LENGTH:
+            return False, f"Description exceeds YouTube's {MAX_DESCRIPTION_LENGTH} character limit"
         
         # Check for required sections
         required_sections = [
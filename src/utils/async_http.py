@@ -0,0 +1,65 @@
+"""Sharded async HTTP client"""
+import asyncio
+import math
+from typing import List
+
+import httpx
+
+
+class ShardedAsyncClient:
+    """
+    Spreads requests over several small httpx.AsyncClient pools.
+    
+    httpcore re-scans every connection of a pool whenever a request starts
+    or finishes, so one pool with hundreds of connections spends most of its
+    time on bookkeeping. Several small pools keep that scan short, and a
+    per-shard semaphore keeps waiting requests out of the pools entirely.
+    Each request goes to the least busy shard.
+    """
+    
+    def __init__(self, max_connections: int, connections_per_pool: int = 16, timeout: httpx.Timeout = None):
+        """
+        Args:
+            max_connections: Total in-flight requests across all shards
+            connections_per_pool: Connections per shard
+            timeout: Request timeout for every shard
+        """
+        self.connections_per_pool = max(1, min(connections_per_pool, max_connections))
+        shards = max(1, math.ceil(max_connections / self.connections_per_pool))
+        
+        self._clients: List[httpx.AsyncClient] = [
+            httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.connections_per_pool,
+                    max_keepalive_connections=self.connections_per_pool
+                ),
+                timeout=timeout
+            )
+            for _ in range(shards)
+        ]
+        self._in_flight = [0] * shards
+        # Created on first use, inside the event loop that owns the clients
+        self._slots = None
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the least busy shard (same arguments as httpx.AsyncClient.request).
+        
+        Returns:
+            httpx.Response with the body read
+        """
+        if self._slots is None:
+            self._slots = [asyncio.Semaphore(self.connections_per_pool) for _ in self._clients]
+        
+        shard = min(range(len(self._clients)), key=self._in_flight.__getitem__)
+        self._in_flight[shard] += 1
+        try:
+            async with self._slots[shard]:
+                return await self._clients[shard].request(method, url, **kwargs)
+        finally:
+            self._in_flight[shard] -= 1
+    
+    async def aclose(self):
+        """Close every shard"""
+        for client in self._clients:
+            await client.aclose()
@@ -0,0 +1,53 @@
+"""Short-lived tokens for GET /jobs/<job_id>/events
+
+A browser EventSource cannot send an Authorization header, so the stream
+also accepts ?token=<token> issued for that one job. Tokens are an expiry
+timestamp and an HMAC of job id and expiry, keyed with the API token; they
+grant nothing but the job's event stream.
+"""
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+from src.config import config
+
+
+def _signature(job_id: str, expires: int) -> str:
+    return hmac.new(
+        config.API_TOKEN.encode(),
+        f"job-events:{job_id}:{expires}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def issue_events_token(job_id: str, ttl: Optional[float] = None) -> tuple[str, int]:
+    """
+    Issue a token for a job's event stream.
+    
+    Args:
+        job_id: Job the token is valid for
+        ttl: Lifetime in seconds (defaults to JOB_EVENTS_TOKEN_TTL)
+    
+    Returns:
+        (token, expiry as a Unix timestamp)
+    """
+    expires = int(time.time() + (ttl if ttl is not None else config.JOB_EVENTS_TOKEN_TTL))
+    return f"{expires}.{_signature(job_id, expires)}", expires
+
+
+def verify_events_token(token: str, job_id: str) -> bool:
+    """
+    Check a token issued by issue_events_token().
+    
+    Args:
+        token: Token from the request
+        job_id: Job whose stream is requested
+    
+    Returns:
+        True if the token was issued for this job and has not expired
+    """
+    expires, _, signature = (token or '').partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(job_id, int(expires)))
@@ -0,0 +1,81 @@
+"""Thread-safe LRU cache"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Small in-memory LRU bounded by entry count and, optionally, total size.
+    
+    Usage:
+        cache = LRUCache(maxsize=128)
+        cache.set('key', value)
+        value = cache.get('key')
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = 128,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        """
+        Args:
+            maxsize: Maximum number of entries
+            max_bytes: Maximum total size of all entries (None for unbounded)
+            sizeof: Returns the size of a value (required with max_bytes)
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda value: 0)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it most recently used"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+    
+    def set(self, key: Hashable, value: Any):
+        """Insert or replace a value, evicting least recently used entries"""
+        size = self.sizeof(value)
+        
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            
+            # Values larger than the whole budget are not cached at all
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            
+            self._entries[key] = (value, size)
+            self._bytes += size
+            
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a value"""
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self._bytes -= size
+            return value
+    
+    def clear(self):
+        """Remove all values"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
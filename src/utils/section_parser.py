@@ -0,0 +1,84 @@
+"""Incremental parser for streamed ABOUT/WHAT_TO_EXPECT/SUBSCRIBE/TAGS output"""
+import re
+from typing import List, Tuple
+
+# Section names in the order the system prompt asks for them, with their markers
+SECTION_MARKERS = (
+    ('about', 'ABOUT:'),
+    ('what_to_expect', 'WHAT_TO_EXPECT:'),
+    ('subscribe', 'SUBSCRIBE:'),
+    ('tags', 'TAGS:'),
+)
+
+_MARKER_PATTERNS = [re.compile(re.escape(marker), re.IGNORECASE) for _, marker in SECTION_MARKERS]
+
+
+class SectionStreamParser:
+    """
+    Emits each section as soon as the marker of the following one arrives.
+    
+    Markers are matched case-insensitively and may be split across chunks.
+    The last section (TAGS) is only complete when the stream ends, so it is
+    emitted by close().
+    
+    Usage:
+        parser = SectionStreamParser()
+        for chunk in chunks:
+            for name, text in parser.feed(chunk):
+                ...
+        for name, text in parser.close():
+            ...
+    """
+    
+    def __init__(self):
+        self._buffer = ''
+        self._section = 0  # Index into SECTION_MARKERS of the open section
+        self._start = 0  # Buffer offset where the open section's text starts
+        self._closed = False
+    
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Add streamed text.
+        
+        Args:
+            chunk: Next piece of the completion
+        
+        Returns:
+            (section_name, text) for every section completed by this chunk
+        """
+        self._buffer += chunk
+        completed = []
+        
+        while self._section + 1 < len(SECTION_MARKERS):
+            match = _MARKER_PATTERNS[self._section + 1].search(self._buffer, self._start)
+            if not match:
+                break
+            
+            completed.append(self._emit(match.start()))
+            self._section += 1
+            self._start = match.end()
+        
+        return completed
+    
+    def close(self) -> List[Tuple[str, str]]:
+        """
+        Finish the stream.
+        
+        Returns:
+            The final open section, if it has any text
+        """
+        if self._closed:
+            return []
+        self._closed = True
+        
+        name, text = self._emit(len(self._buffer))
+        return [(name, text)] if text else []
+    
+    def _emit(self, end: int) -> Tuple[str, str]:
+        """Text of the open section up to end, without its own marker"""
+        name = SECTION_MARKERS[self._section][0]
+        text = self._buffer[self._start:end].strip()
+        match = _MARKER_PATTERNS[self._section].match(text)
+        if match:
+            text = text[match.end():].strip()
+        return name, text
@@ -38,6 +38,76 @@ def validate_generate_request(data: Dict[str, Any]) -> tuple[bool, Optional[str]
         if len(data['subscribe_text']) > 1000:
             return False, "subscribe_text too long: maximum 1000 characters"
     
+    # template is optional: name of a description template (prompt_type 'template')
+    if 'template' in data and data['template'] is not None:
+        if not isinstance(data['template'], str) or not data['template'] or len(data['template']) > 100:
+            return False, "Invalid template: must be a template name (maximum 100 characters)"
+    
+    # bypass_cache is optional: regenerate AI sections even if cached
+    if 'bypass_cache' in data and not isinstance(data['bypass_cache'], bool):
+        return False, "Invalid bypass_cache: must be a boolean"
+    
+    return True, None
+
+
+def validate_idempotency_key(key: Optional[str]) -> tuple[bool, Optional[str]]:
+    """
+    Validate an Idempotency-Key header.
+    
+    Args:
+        key: Header value (None if absent)
+    
+    Returns:
+        (is_valid, error_message)
+    """
+    if key is None:
+        return True, None
+    
+    if not key.strip() or len(key) > 255:
+        return False, "Invalid Idempotency-Key header: must be 1-255 characters"
+    
+    return True, None
+
+
+def validate_batch_request(data: Dict[str, Any], max_jobs: int) -> tuple[bool, Optional[str]]:
+    """
+    Validate generate-descriptions batch request data.
+    
+    Each entry of 'jobs' is validated like a single generate-descriptions
+    request; errors name the offending entry.
+    
+    Args:
+        data: Request JSON data
+        max_jobs: Maximum number of jobs in one batch
+    
+    Returns:
+        (is_valid, error_message)
+    """
+    jobs = data.get('jobs')
+    if not isinstance(jobs, list) or not jobs:
+        return False, "Missing required field: jobs (non-empty list)"
+    
+    if len(jobs) > max_jobs:
+        return False, f"Too many jobs: maximum {max_jobs} per batch"
+    
+    if 'max_concurrency' in data:
+        max_concurrency = data['max_concurrency']
+        if isinstance(max_concurrency, bool) or not isinstance(max_concurrency, int) or max_concurrency < 1:
+            return False, "Invalid max_concurrency: must be a positive integer"
+    
+    novel_names = set()
+    for index, job in enumerate(jobs):
+        if not isinstance(job, dict):
+            return False, f"jobs[{index}]: must be an object"
+        
+        is_valid, error = validate_generate_request(job)
+        if not is_valid:
+            return False, f"jobs[{index}]: {error}"
+        
+        if job['novel_name'] in novel_names:
+            return False, f"jobs[{index}]: duplicate novel_name '{job['novel_name']}'"
+        novel_names.add(job['novel_name'])
+    
     return True, None
 
 
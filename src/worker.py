@@ -0,0 +1,141 @@
+"""Description job worker process
+
+Usage:
+    python -m src.worker [--concurrency N]
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+
+from src.config import config
+from src.services.job_queue import JobQueue
+from src.services.job_service import run_queued_job
+from src.services.metrics import start_metrics_server
+from src.services.novel_lock import NovelBusyError
+
+logging.basicConfig(
+    level=getattr(logging, config.LOG_LEVEL),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Claims jobs from the queue and runs up to `concurrency` of them at once"""
+    
+    def __init__(self, concurrency: int = None):
+        """
+        Args:
+            concurrency: Jobs run in parallel (defaults to WORKER_CONCURRENCY)
+        """
+        self.concurrency = max(1, concurrency or config.WORKER_CONCURRENCY)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._running = set()
+    
+    def stop(self, *_):
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        if not self._stopping.is_set():
+            logger.info(f"Worker {self.worker_id} stopping after current jobs")
+        self._stopping.set()
+    
+    def run(self):
+        """Run until stopped"""
+        logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+        
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name="worker-heartbeat", daemon=True)
+        heartbeat.start()
+        
+        slots = [
+            threading.Thread(target=self._slot_loop, name=f"worker-slot-{i}")
+            for i in range(self.concurrency)
+        ]
+        for slot in slots:
+            slot.start()
+        for slot in slots:
+            slot.join()
+        
+        logger.info(f"Worker {self.worker_id} stopped")
+    
+    def _slot_loop(self):
+        """Claim and run jobs one at a time"""
+        while not self._stopping.is_set():
+            try:
+                entry = JobQueue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"Error claiming job: {e}")
+                entry = None
+            
+            if entry is None:
+                self._stopping.wait(config.WORKER_POLL_INTERVAL)
+                continue
+            
+            self._run_entry(entry)
+    
+    def _run_entry(self, entry: dict):
+        """Run one claimed job and settle its queue entry"""
+        logger.info(f"Running job {entry['job_id']} (attempt {entry['attempts']})")
+        
+        with self._lock:
+            self._running.add(entry['id'])
+        
+        try:
+            run_queued_job(entry['job_id'], entry['payload'])
+            JobQueue.complete(entry['id'], self.worker_id)
+        except NovelBusyError as e:
+            logger.warning(f"Deferring job {entry['job_id']}: {e}")
+            try:
+                JobQueue.defer(entry['id'], self.worker_id)
+            except Exception as defer_error:
+                logger.error(f"Error deferring job {entry['job_id']}: {defer_error}")
+        except Exception as e:
+            logger.error(f"Job {entry['job_id']} raised: {e}")
+            try:
+                JobQueue.fail(entry['id'], self.worker_id, str(e))
+            except Exception as fail_error:
+                # The lease expires and the job is retried by another worker
+                logger.error(f"Error recording failure for job {entry['job_id']}: {fail_error}")
+        finally:
+            with self._lock:
+                self._running.discard(entry['id'])
+    
+    def _heartbeat_loop(self):
+        """Renew leases on running jobs"""
+        while True:
+            with self._lock:
+                running = list(self._running)
+            try:
+                JobQueue.heartbeat(self.worker_id, running)
+            except Exception as e:
+                logger.error(f"Error sending heartbeat: {e}")
+            time.sleep(config.JOB_HEARTBEAT_INTERVAL)
+
+
+def main():
+    """Entry point for `python -m src.worker`"""
+    parser = argparse.ArgumentParser(description='Run description generation jobs from the queue')
+    parser.add_argument('--concurrency', type=int, default=None, help='Jobs to run in parallel')
+    args = parser.parse_args()
+    
+    if config.WORKER_METRICS_PORT:
+        try:
+            start_metrics_server(config.WORKER_METRICS_PORT)
+        except OSError as e:
+            # e.g. a second worker on the same host; jobs still run, unscraped
+            logger.warning(f"Could not serve metrics on port {config.WORKER_METRICS_PORT}: {e}")
+    
+    worker = Worker(concurrency=args.concurrency)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""Shared fixtures; database tests run against a throwaway SQLite file"""
+import importlib
+import os
+import pkgutil
+import tempfile
+
+import pytest
+
+# Set before anything imports src.models.database, which creates the engine
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='description-service-tests-'), 'test.db')}"
+
+
+@pytest.fixture
+def db():
+    """Create every table for one test and drop them afterwards"""
+    import src.models
+    from src.models.database import Base, SessionLocal, engine
+    
+    for module in pkgutil.iter_modules(src.models.__path__):
+        importlib.import_module(f"src.models.{module.name}")
+    Base.metadata.create_all(engine)
+    yield
+    SessionLocal.remove()
+    Base.metadata.drop_all(engine)
@@ -0,0 +1,238 @@
+"""Tests for the hand-signed requests of src.services.async_s3_service"""
+import asyncio
+import base64
+import hashlib
+import hmac
+from urllib.parse import quote, unquote
+from xml.sax.saxutils import escape
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+
+from src.config import config
+from src.services.async_s3_service import AsyncS3Service
+
+ACCESS_KEY = 'AKIDEXAMPLE'
+SECRET_KEY = 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY'
+BUCKET = 'test-bucket'
+REGION = 'us-east-1'
+
+
+def _hmac(key: bytes, message: str) -> bytes:
+    return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+
+def verify_signature(request: httpx.Request) -> str:
+    """
+    Check a request's SigV4 signature the way S3 does, from what was sent.
+    
+    Returns:
+        The object key the path decodes to ('' for bucket requests)
+    """
+    algorithm, _, fields = request.headers['authorization'].partition(' ')
+    assert algorithm == 'AWS4-HMAC-SHA256'
+    fields = dict(field.strip().split('=', 1) for field in fields.split(','))
+    access_key, date, region, service, terminator = fields['Credential'].split('/')
+    assert (access_key, region, service, terminator) == (ACCESS_KEY, REGION, 's3', 'aws4_request')
+    signed_headers = fields['SignedHeaders'].split(';')
+    assert 'host' in signed_headers and 'x-amz-content-sha256' in signed_headers
+    
+    # S3 decodes the path to find the key, then URI-encodes it once to sign
+    raw_path, _, raw_query = request.url.raw_path.decode('ascii').partition('?')
+    path = unquote(raw_path)
+    pairs = [pair.partition('=') for pair in raw_query.split('&') if pair]
+    query = '&'.join(sorted(
+        f"{quote(unquote(name), safe='~')}={quote(unquote(value), safe='~')}"
+        for name, _, value in pairs
+    ))
+    
+    payload_hash = request.headers['x-amz-content-sha256']
+    if payload_hash != 'UNSIGNED-PAYLOAD':
+        assert payload_hash == hashlib.sha256(request.content).hexdigest()
+    
+    canonical_request = '\n'.join([
+        request.method,
+        quote(path, safe='/~'),
+        query,
+        ''.join(f"{name}:{' '.join(request.headers[name].split())}\n" for name in signed_headers),
+        ';'.join(signed_headers),
+        payload_hash
+    ])
+    scope = f"{date}/{region}/{service}/{terminator}"
+    string_to_sign = '\n'.join([
+        algorithm,
+        request.headers['x-amz-date'],
+        scope,
+        hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    ])
+    
+    key = _hmac(f"AWS4{SECRET_KEY}".encode('utf-8'), date)
+    for part in (region, service, terminator):
+        key = _hmac(key, part)
+    assert hmac.compare_digest(fields['Signature'], hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest())
+    
+    bucket_prefix = f"/{BUCKET}/"
+    assert path.startswith(bucket_prefix)
+    return path[len(bucket_prefix):]
+
+
+class FakeS3:
+    """In-memory bucket behind an httpx.MockTransport that rejects bad signatures"""
+    
+    def __init__(self, page_size: int = 1000):
+        self.page_size = page_size
+        self.objects = {}
+        self.requests = []
+    
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        key = verify_signature(request)
+        self.requests.append(request)
+        
+        if request.method == 'PUT':
+            body = request.content
+            assert request.headers['content-md5'] == base64.b64encode(hashlib.md5(body).digest()).decode('ascii')
+            self.objects[key] = body
+            return httpx.Response(200, headers={'ETag': f'"{hashlib.md5(body).hexdigest()}"'})
+        
+        if not key:
+            return self._list(request.url.params)
+        
+        if key not in self.objects:
+            if request.method == 'HEAD':
+                return httpx.Response(404)
+            return httpx.Response(404, content=b'<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>')
+        
+        etag = f'"{hashlib.md5(self.objects[key]).hexdigest()}"'
+        if request.method == 'HEAD':
+            return httpx.Response(200, headers={'ETag': etag})
+        return httpx.Response(200, headers={'ETag': etag}, content=self.objects[key])
+    
+    def _list(self, params) -> httpx.Response:
+        assert params['list-type'] == '2'
+        keys = sorted(key for key in self.objects if key.startswith(params['prefix']))
+        if 'continuation-token' in params:
+            # Tokens are opaque base64 and may hold '+', '/' and '='
+            offset = int(base64.b64decode(params['continuation-token']).decode('ascii').split(':')[1])
+            assert 'start-after' not in params
+        else:
+            start_after = params.get('start-after', '')
+            offset = len([key for key in keys if key <= start_after])
+        
+        page = keys[offset:offset + self.page_size]
+        truncated = offset + self.page_size < len(keys)
+        contents = ''.join(
+            f"<Contents><Key>{escape(key)}</Key><Size>{len(self.objects[key])}</Size>"
+            f"<ETag>&quot;{hashlib.md5(self.objects[key]).hexdigest()}&quot;</ETag></Contents>"
+            for key in page
+        )
+        token = ''
+        if truncated:
+            token = base64.b64encode(f"offset:{offset + self.page_size}:??>>".encode('ascii')).decode('ascii')
+            token = f"<NextContinuationToken>{token}</NextContinuationToken>"
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<IsTruncated>{'true' if truncated else 'false'}</IsTruncated>{contents}{token}"
+            '</ListBucketResult>'
+        )
+        return httpx.Response(200, content=body.encode('utf-8'))
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    monkeypatch.setattr(config, 'S3_ENDPOINT', 'https://s3.example.test')
+    monkeypatch.setattr(config, 'S3_ACCESS_KEY_ID', ACCESS_KEY)
+    monkeypatch.setattr(config, 'S3_SECRET_ACCESS_KEY', SECRET_KEY)
+    monkeypatch.setattr(config, 'S3_BUCKET_NAME', BUCKET)
+    monkeypatch.setattr(config, 'S3_REGION', REGION)
+    return FakeS3()
+
+
+def make_service(fake: FakeS3) -> AsyncS3Service:
+    service = AsyncS3Service()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    return service
+
+
+@pytest.mark.parametrize('video_name', [
+    'Chapter 1',
+    'Chapitre 2 – Café',
+    '第三章',
+    'C++ & more=1+1 (final)',
+    "it's 100% ~done~"
+])
+def test_reserved_characters_in_keys(fake_s3, video_name):
+    service = make_service(fake_s3)
+    novel_name = 'My Novel+'
+    fake_s3.objects[f"{novel_name}/Timestamps/{video_name}.txt"] = '00:00 Start'.encode('utf-8')
+    
+    async def run():
+        assert await service.read_timestamp_file(novel_name, video_name) == '00:00 Start'
+        assert await service.save_description(novel_name, video_name, 'Déjà vu') is True
+        return await service.description_etag(novel_name, video_name)
+    
+    etag = asyncio.run(run())
+    # The object lands under the exact key, not an encoded or '+'-as-space variant
+    assert fake_s3.objects[f"{novel_name}/Youtube/{video_name}.txt"] == 'Déjà vu'.encode('utf-8')
+    assert etag == hashlib.md5('Déjà vu'.encode('utf-8')).hexdigest()
+
+
+def test_put_signs_content_md5_and_payload_hash(fake_s3):
+    service = make_service(fake_s3)
+    asyncio.run(service.save_description('Novel', 'Video', 'body'))
+    
+    request = fake_s3.requests[-1]
+    signed_headers = request.headers['authorization'].split('SignedHeaders=')[1].split(',')[0].split(';')
+    assert 'content-md5' in signed_headers
+    assert 'x-amz-content-sha256' in signed_headers
+
+
+def test_unchanged_description_is_not_uploaded(fake_s3):
+    service = make_service(fake_s3)
+    etag = hashlib.md5(b'body').hexdigest()
+    
+    assert asyncio.run(service.save_description('Novel', 'Video', 'body', existing_etag=f'"{etag}"')) is False
+    assert fake_s3.requests == []
+
+
+def test_listing_follows_continuation_tokens(fake_s3):
+    fake_s3.page_size = 2
+    names = ['A 1', 'B+2', 'C=3', 'Déjà 4', 'E&5', 'F?6', 'G/7']
+    for name in names:
+        fake_s3.objects[f"Novel/Timestamps/{name}.txt"] = b'00:00'
+    fake_s3.objects['Other/Timestamps/Z.txt'] = b'00:00'
+    service = make_service(fake_s3)
+    
+    async def collect(**kwargs):
+        return [info['video_name'] async for info in service.iter_timestamp_files('Novel', **kwargs)]
+    
+    assert asyncio.run(collect()) == names
+    assert len(fake_s3.requests) == 4
+    
+    assert asyncio.run(collect(start_after='B+2')) == names[2:]
+
+
+def test_listing_reports_sizes_and_etags(fake_s3):
+    fake_s3.objects['Novel/Youtube/Video.txt'] = b'body'
+    service = make_service(fake_s3)
+    
+    snapshot = asyncio.run(service.snapshot_descriptions('Novel'))
+    assert snapshot == {
+        'Video': {
+            'key': 'Novel/Youtube/Video.txt',
+            'video_name': 'Video',
+            'size': 4,
+            'etag': hashlib.md5(b'body').hexdigest()
+        }
+    }
+
+
+def test_missing_objects(fake_s3):
+    service = make_service(fake_s3)
+    
+    assert asyncio.run(service.description_etag('Novel', 'Missing')) is None
+    assert asyncio.run(service.description_exists('Novel', 'Missing')) is False
+    with pytest.raises(ClientError) as raised:
+        asyncio.run(service.read_timestamp_file('Novel', 'Missing'))
+    assert raised.value.response['Error']['Code'] == 'NoSuchKey'
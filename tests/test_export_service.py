@@ -0,0 +1,84 @@
+"""Tests for the streaming DescriptionExporter"""
+import io
+import json
+import zipfile
+
+from src.services.export_service import ZIP_ERRORS_MEMBER, DescriptionExporter
+
+
+class FakeS3Service:
+    """Descriptions in a dict; some downloads fail and the listing can break off"""
+    
+    def __init__(self, descriptions, failing=(), listing_fails_after=None):
+        self.descriptions = descriptions
+        self.failing = set(failing)
+        self.listing_fails_after = listing_fails_after
+    
+    def iter_descriptions(self, novel_name):
+        for i, video_name in enumerate(self.descriptions):
+            if i == self.listing_fails_after:
+                raise ConnectionError('listing failed')
+            yield {'video_name': video_name}
+    
+    def get_description(self, novel_name, video_name):
+        if video_name in self.failing:
+            raise ConnectionError(f'cannot read {video_name}')
+        return self.descriptions[video_name]
+
+
+def export(s3_service, export_format):
+    exporter = DescriptionExporter(s3_service, concurrency=2)
+    chunks = getattr(exporter, export_format)(exporter.iter_descriptions('Novel'))
+    if export_format == 'zip':
+        return zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+    return [json.loads(line) for line in ''.join(chunks).splitlines()]
+
+
+DESCRIPTIONS = {f'video-{i}': f'Description {i}' for i in range(7)}
+
+
+def test_ndjson_in_listing_order():
+    lines = export(FakeS3Service(dict(DESCRIPTIONS, deleted=None)), 'ndjson')
+    assert lines == [{'video_name': name, 'description': text} for name, text in DESCRIPTIONS.items()]
+
+
+def test_ndjson_reports_failed_downloads_per_video():
+    lines = export(FakeS3Service(DESCRIPTIONS, failing={'video-1', 'video-5'}), 'ndjson')
+    
+    assert [line['video_name'] for line in lines] == list(DESCRIPTIONS)
+    assert lines[1] == {'video_name': 'video-1', 'error': 'cannot read video-1'}
+    assert lines[5] == {'video_name': 'video-5', 'error': 'cannot read video-5'}
+    assert lines[6] == {'video_name': 'video-6', 'description': 'Description 6'}
+
+
+def test_ndjson_reports_a_listing_failure_last():
+    lines = export(FakeS3Service(DESCRIPTIONS, listing_fails_after=3), 'ndjson')
+    
+    assert [line.get('video_name') for line in lines] == ['video-0', 'video-1', 'video-2', None]
+    assert lines[-1] == {'error': 'listing failed'}
+
+
+def test_zip_members():
+    archive = export(FakeS3Service(DESCRIPTIONS), 'zip')
+    
+    assert archive.testzip() is None
+    assert archive.namelist() == [f'{name}.txt' for name in DESCRIPTIONS]
+    assert archive.read('video-3.txt').decode('utf-8') == 'Description 3'
+
+
+def test_zip_stays_valid_when_downloads_fail():
+    archive = export(FakeS3Service(DESCRIPTIONS, failing={'video-0', 'video-4'}), 'zip')
+    
+    assert archive.testzip() is None
+    assert 'video-0.txt' not in archive.namelist() and 'video-4.txt' not in archive.namelist()
+    assert archive.namelist()[-1] == ZIP_ERRORS_MEMBER
+    assert archive.read(ZIP_ERRORS_MEMBER).decode('utf-8') == 'video-0: cannot read video-0\nvideo-4: cannot read video-4\n'
+    assert archive.read('video-6.txt') == b'Description 6'
+
+
+def test_zip_is_finished_when_the_listing_fails():
+    archive = export(FakeS3Service(DESCRIPTIONS, listing_fails_after=2), 'zip')
+    
+    assert archive.testzip() is None
+    assert archive.namelist() == ['video-0.txt', 'video-1.txt', ZIP_ERRORS_MEMBER]
+    assert archive.read(ZIP_ERRORS_MEMBER).decode('utf-8') == 'Export stopped early: listing failed\n'
@@ -0,0 +1,55 @@
+"""Tests for the EventSource token of GET /jobs/<job_id>/events"""
+import pytest
+
+from src.app import app
+from src.config import config
+from src.models.database import get_db_session
+from src.models.description_state import WorkflowDescriptionState
+
+API_TOKEN = 'test-api-token'
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(config, 'API_TOKEN', API_TOKEN)
+    with get_db_session() as session:
+        for job_id in ('job-1', 'job-2'):
+            session.add(WorkflowDescriptionState(
+                job_id=job_id,
+                novel_name='Novel',
+                status='completed',
+                progress_data={'descriptions_generated': 3, 'total_videos': 3},
+                version=5
+            ))
+    return app.test_client()
+
+
+def issue_token(client, job_id):
+    return client.post(f'/jobs/{job_id}/events/token', headers={'Authorization': f'Bearer {API_TOKEN}'})
+
+
+def test_unknown_job_gets_404(client):
+    response = issue_token(client, 'no-such-job')
+    assert response.status_code == 404
+    assert response.get_json() == {'success': False, 'error': 'Job not found'}
+
+
+def test_issuing_requires_auth(client):
+    assert client.post('/jobs/job-1/events/token').status_code == 401
+
+
+def test_token_opens_the_job_stream(client):
+    body = issue_token(client, 'job-1').get_json()
+    assert body['events_url'] == f"/jobs/job-1/events?token={body['token']}"
+    
+    response = client.get(body['events_url'])
+    assert response.status_code == 200
+    assert 'event: complete' in response.get_data(as_text=True)
+
+
+def test_token_is_only_valid_for_its_job(client):
+    token = issue_token(client, 'job-1').get_json()['token']
+    
+    assert client.get(f'/jobs/job-2/events?token={token}').status_code == 401
+    assert client.get('/jobs/job-1/status', query_string={'token': token}).status_code == 401
+    assert client.get('/jobs/job-1/events?token=123.forged').status_code == 401
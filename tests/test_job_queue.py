@@ -0,0 +1,86 @@
+"""Tests for JobQueue leases"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.config import config
+from src.models.database import get_db_session
+from src.models.description_state import WorkflowDescriptionState
+from src.models.job_queue import DescriptionJobQueue
+from src.services.job_queue import JobQueue
+
+
+@pytest.fixture
+def queued_job(db, monkeypatch):
+    monkeypatch.setattr(config, 'JOB_MAX_ATTEMPTS', 2)
+    with get_db_session() as session:
+        session.add(WorkflowDescriptionState(job_id='job-1', novel_name='Novel', status='pending', progress_data={}))
+        JobQueue.enqueue(session, 'job-1', {'force': False})
+    return 'job-1'
+
+
+def queue_entry(job_id='job-1'):
+    with get_db_session() as session:
+        return session.query(DescriptionJobQueue).filter_by(job_id=job_id).one().to_dict()
+
+
+def job_status(job_id='job-1'):
+    with get_db_session() as session:
+        return session.query(WorkflowDescriptionState.status).filter_by(job_id=job_id).scalar()
+
+
+def expire_lease(job_id='job-1'):
+    """Make the entry look like its worker stopped sending heartbeats"""
+    stale = datetime.now(timezone.utc) - timedelta(seconds=config.JOB_VISIBILITY_TIMEOUT + 1)
+    with get_db_session() as session:
+        session.query(DescriptionJobQueue).filter_by(job_id=job_id).update({'heartbeat_at': stale})
+
+
+def test_complete_by_lease_holder(queued_job):
+    entry = JobQueue.claim('worker-a')
+    assert entry['locked_by'] == 'worker-a'
+    assert JobQueue.claim('worker-b') is None
+    
+    assert JobQueue.complete(entry['id'], 'worker-a') is True
+    assert queue_entry()['status'] == 'done'
+
+
+def test_lost_lease_cannot_complete_or_fail(queued_job):
+    entry = JobQueue.claim('worker-a')
+    expire_lease()
+    assert JobQueue.claim('worker-b')['attempts'] == 2
+    
+    # The stale worker finishes late; the new holder's attempt decides the outcome
+    assert JobQueue.complete(entry['id'], 'worker-a') is False
+    assert JobQueue.fail(entry['id'], 'worker-a', 'late failure') is False
+    JobQueue.defer(entry['id'], 'worker-a')
+    
+    current = queue_entry()
+    assert (current['status'], current['locked_by'], current['attempts'], current['last_error']) == ('running', 'worker-b', 2, None)
+    assert JobQueue.complete(entry['id'], 'worker-b') is True
+
+
+def test_fail_requeues_until_attempts_are_exhausted(queued_job):
+    entry = JobQueue.claim('worker-a')
+    assert JobQueue.fail(entry['id'], 'worker-a', 'first error') is True
+    
+    current = queue_entry()
+    assert (current['status'], current['locked_by'], current['last_error']) == ('queued', None, 'first error')
+    assert datetime.fromisoformat(current['available_at']).replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+    assert job_status() == 'pending'
+    
+    with get_db_session() as session:
+        session.query(DescriptionJobQueue).filter_by(id=entry['id']).update({'available_at': datetime.now(timezone.utc)})
+    entry = JobQueue.claim('worker-b')
+    assert JobQueue.fail(entry['id'], 'worker-b', 'second error') is True
+    
+    assert queue_entry()['status'] == 'failed'
+    assert job_status() == 'failed'
+
+
+def test_defer_does_not_count_the_attempt(queued_job):
+    entry = JobQueue.claim('worker-a')
+    JobQueue.defer(entry['id'], 'worker-a')
+    
+    current = queue_entry()
+    assert (current['status'], current['attempts'], current['locked_by']) == ('queued', 0, None)
@@ -0,0 +1,197 @@
+"""Tests for NovelManifest and the incremental re-rendering it drives"""
+import hashlib
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from src.config import config
+from src.models.ai_prompt import AIPrompt
+from src.models.database import get_db_session
+from src.models.description_state import WorkflowDescriptionState
+from src.models.manifest import DescriptionManifest
+from src.services import job_service, manifest_service
+from src.services.manifest_service import NovelManifest
+from src.services.prompt_cache import prompt_cache
+from src.services.template_service import TEMPLATE_PROMPT_TYPE
+
+SECTIONS = {'about': 'A story.', 'what_to_expect': 'Twists.', 'subscribe': 'Subscribe!', 'tags': '#novel #audiobook'}
+
+
+def file_info(video_name, etag):
+    return {'key': f'Novel/Timestamps/{video_name}.txt', 'video_name': video_name, 'etag': etag}
+
+
+def stored_entries(novel_name='Novel'):
+    """video name -> (timestamp_etag, sections_hash) as stored"""
+    with get_db_session() as session:
+        rows = session.query(DescriptionManifest).filter_by(novel_name=novel_name).all()
+        return {row.video_name: (row.timestamp_etag, row.sections_hash) for row in rows}
+
+
+def test_is_stale(db):
+    with NovelManifest('Novel', 'hash-1') as manifest:
+        manifest.record('tracked', 'etag-1')
+    
+    manifest = NovelManifest('Novel', 'hash-1')
+    assert not manifest.is_stale(file_info('tracked', 'etag-1'))
+    assert manifest.is_stale(file_info('tracked', 'etag-2'))
+    # Untracked videos are not stale; keep_existing() decides for them
+    assert not manifest.is_stale(file_info('untracked', 'etag-1'))
+    
+    assert NovelManifest('Novel', 'hash-2').is_stale(file_info('tracked', 'etag-1'))
+
+
+def test_keep_existing_adopts_untracked_descriptions(db):
+    with NovelManifest('Novel', 'hash-1') as manifest:
+        manifest.record('tracked', 'etag-1')
+    
+    with NovelManifest('Novel', 'hash-1') as manifest:
+        assert manifest.keep_existing(file_info('old', 'etag-old'), exists=True)
+        assert not manifest.keep_existing(file_info('missing', 'etag-missing'), exists=False)
+        assert manifest.keep_existing(file_info('tracked', 'etag-1'), exists=True)
+    
+    assert stored_entries() == {'tracked': ('etag-1', 'hash-1'), 'old': ('etag-old', 'hash-1')}
+
+
+def test_flush_upserts_in_batches(db):
+    with NovelManifest('Novel', 'hash-1', batch_size=2) as manifest:
+        for i in range(5):
+            manifest.record(f'video-{i}', f'etag-{i}')
+        # Full batches were written from record()
+        assert len(stored_entries()) == 4
+    
+    with NovelManifest('Novel', 'hash-2', batch_size=2) as manifest:
+        manifest.record('video-0', 'etag-new')
+    with NovelManifest('Other', 'hash-1') as manifest:
+        manifest.record('video-0', 'etag-other')
+    
+    entries = stored_entries()
+    assert len(entries) == 5
+    assert entries['video-0'] == ('etag-new', 'hash-2')
+    assert entries['video-1'] == ('etag-1', 'hash-1')
+    assert stored_entries('Other') == {'video-0': ('etag-other', 'hash-1')}
+
+
+def test_failed_flush_keeps_entries(db, monkeypatch):
+    manifest = NovelManifest('Novel', 'hash-1')
+    manifest.record('video-0', 'etag-0')
+    
+    @contextmanager
+    def unavailable():
+        raise ConnectionError('database unavailable')
+        yield
+    
+    monkeypatch.setattr(manifest_service, 'get_db_session', unavailable)
+    with pytest.raises(ConnectionError):
+        manifest.flush()
+    manifest.close()
+    
+    manifest.record('video-1', 'etag-1')
+    monkeypatch.setattr(manifest_service, 'get_db_session', get_db_session)
+    manifest.close()
+    
+    assert stored_entries() == {'video-0': ('etag-0', 'hash-1'), 'video-1': ('etag-1', 'hash-1')}
+
+
+class FakeS3Service:
+    """Timestamp files and descriptions of one bucket, shared by every instance"""
+    
+    timestamps = {}
+    descriptions = {}
+    saved = []
+    
+    def iter_timestamp_files(self, novel_name, start_after=None):
+        for video_name in sorted(self.timestamps):
+            yield file_info(video_name, hashlib.md5(self.timestamps[video_name].encode('utf-8')).hexdigest())
+    
+    def read_timestamp_file(self, novel_name, video_name):
+        return self.timestamps[video_name]
+    
+    def snapshot_descriptions(self, novel_name):
+        return {
+            video_name: {'video_name': video_name, 'etag': hashlib.md5(description.encode('utf-8')).hexdigest()}
+            for video_name, description in self.descriptions.items()
+        }
+    
+    def save_description(self, novel_name, video_name, description, existing_etag=None):
+        self.saved.append(video_name)
+        self.descriptions[video_name] = description
+        return True
+
+
+class FakeOpenAIService:
+    """Returns the same sections for every novel"""
+    
+    def generate_all_sections(self, novel_name, novel_context, use_cache=True, on_section=None):
+        return dict(SECTIONS)
+
+
+@pytest.fixture
+def job_env(db, monkeypatch):
+    monkeypatch.setattr(job_service, 'S3Service', FakeS3Service)
+    monkeypatch.setattr(job_service, 'OpenAIService', FakeOpenAIService)
+    monkeypatch.setattr(config, 'JOB_ENGINE', 'threads')
+    monkeypatch.setattr(config, 'S3_BULK_EXISTENCE_CHECK', True)
+    monkeypatch.setattr(FakeS3Service, 'timestamps', {f'video-{i}': f'00:00 Part {i}' for i in range(4)})
+    monkeypatch.setattr(FakeS3Service, 'descriptions', {})
+    monkeypatch.setattr(FakeS3Service, 'saved', [])
+    yield FakeS3Service
+    prompt_cache.invalidate()
+
+
+def run_job(template_name=None, force=False):
+    """Run a job and return the videos it rendered"""
+    FakeS3Service.saved = []
+    job_id = str(uuid.uuid4())
+    with get_db_session() as session:
+        session.add(WorkflowDescriptionState(job_id=job_id, novel_name='Novel', status='pending', progress_data={}))
+    job_service.generate_descriptions_task(
+        job_id,
+        'Novel',
+        'context',
+        'https://youtube.com/playlist?list=1',
+        'Subscribe!',
+        force=force,
+        template_name=template_name
+    )
+    return sorted(FakeS3Service.saved)
+
+
+def test_only_changed_videos_are_rendered_again(job_env):
+    assert run_job() == ['video-0', 'video-1', 'video-2', 'video-3']
+    assert run_job() == []
+    
+    job_env.timestamps['video-2'] = '00:00 Part 2 (fixed)'
+    assert run_job() == ['video-2']
+    assert '00:00 Part 2 (fixed)' in job_env.descriptions['video-2']
+    assert run_job() == []
+    
+    # force re-renders everything regardless of the manifest
+    assert run_job(force=True) == ['video-0', 'video-1', 'video-2', 'video-3']
+
+
+def test_template_change_renders_every_video_again(job_env):
+    assert len(run_job()) == 4
+    
+    with get_db_session() as session:
+        session.add(AIPrompt(
+            name='short_template',
+            prompt_type=TEMPLATE_PROMPT_TYPE,
+            prompt_text='{novel_name}\n\n{timestamps}\n\n{seo_tags}',
+            updated_at=datetime.now(timezone.utc)
+        ))
+    assert run_job(template_name='short_template') == ['video-0', 'video-1', 'video-2', 'video-3']
+    assert run_job(template_name='short_template') == []
+    assert job_env.descriptions['video-0'] == 'Novel\n\n00:00 Part 0\n\n#novel #audiobook'
+
+
+def test_descriptions_from_before_the_manifest_are_kept(job_env):
+    job_env.descriptions['video-1'] = 'Written before manifests existed'
+    
+    assert run_job() == ['video-0', 'video-2', 'video-3']
+    assert job_env.descriptions['video-1'] == 'Written before manifests existed'
+    # Now tracked: a changed timestamp file re-renders it
+    job_env.timestamps['video-1'] = '00:00 Part 1 (fixed)'
+    assert run_job() == ['video-1']
@@ -0,0 +1,204 @@
+"""Tests for the read -> render -> write DescriptionPipeline"""
+import threading
+
+import pytest
+
+from src.services.pipeline_service import DescriptionPipeline
+
+
+class FakeS3Service:
+    """Timestamp files and descriptions held in dicts"""
+    
+    def __init__(self, timestamps, stored=None, fail_reads=(), fail_writes=()):
+        self.timestamps = timestamps
+        self.stored = dict(stored or {})
+        self.fail_reads = set(fail_reads)
+        self.fail_writes = set(fail_writes)
+        self.writes = []
+        self._lock = threading.Lock()
+    
+    def read_timestamp_file(self, novel_name, video_name):
+        if video_name in self.fail_reads:
+            raise ConnectionError(f'cannot read {video_name}')
+        return self.timestamps[video_name]
+    
+    def save_description(self, novel_name, video_name, description, existing_etag=None):
+        if video_name in self.fail_writes:
+            raise ConnectionError(f'cannot write {video_name}')
+        with self._lock:
+            if self.stored.get(video_name) == description:
+                return False
+            self.stored[video_name] = description
+            self.writes.append(video_name)
+        return True
+
+
+class FakeProgress:
+    """Collects what the pipeline reports to a JobProgressWriter"""
+    
+    def __init__(self):
+        self.counts = {}
+        self.fields = {}
+        self._lock = threading.Lock()
+    
+    def increment(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self.counts[name] = self.counts.get(name, 0) + value
+    
+    def set(self, **fields):
+        self.fields.update(fields)
+
+
+def files(*video_names):
+    return [{'key': f'Novel/Timestamps/{name}.txt', 'video_name': name} for name in video_names]
+
+
+def render(timestamps):
+    if timestamps == 'explode':
+        raise ValueError('bad timestamps')
+    return f'Description\n{timestamps}'
+
+
+def validate(description):
+    if 'too long' in description:
+        return False, 'Description too long'
+    return True, ''
+
+
+def make_pipeline(s3_service, **kwargs):
+    options = {'render': render, 'validate': validate, 'read_workers': 3, 'write_workers': 2, 'queue_size': 1}
+    return DescriptionPipeline(s3_service, 'Novel', **{**options, **kwargs})
+
+
+def run_pipeline(pipeline, timestamp_files, timeout=10):
+    """Run the pipeline in a thread so a deadlock fails the test instead of hanging it"""
+    result = {}
+    
+    def target():
+        try:
+            result['counts'] = pipeline.run(timestamp_files)
+        except Exception as e:
+            result['error'] = e
+    
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'pipeline did not drain'
+    return result
+
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+
+
+def test_counts_match_outcomes():
+    s3_service = FakeS3Service(
+        timestamps={
+            'new': '00:00 Start',
+            'same': '00:00 Same',
+            'unreadable': '',
+            'broken': 'explode',
+            'invalid': 'too long',
+            'unwritable': '00:00 Nope'
+        },
+        stored={'same': 'Description\n00:00 Same'},
+        fail_reads={'unreadable'},
+        fail_writes={'unwritable'}
+    )
+    progress = FakeProgress()
+    saved = []
+    pipeline = make_pipeline(
+        s3_service,
+        should_skip=lambda file_info: file_info['video_name'] == 'done',
+        on_saved=lambda file_info: saved.append(file_info['video_name']),
+        progress=progress
+    )
+    
+    result = run_pipeline(pipeline, files('new', 'same', 'unreadable', 'broken', 'invalid', 'unwritable', 'done'))
+    
+    assert result['counts'] == {
+        'total_videos': 7,
+        'descriptions_generated': 3,
+        'written': 1,
+        'unchanged': 1,
+        'skipped': 1,
+        'failed': 4,
+        'listing_complete': True
+    }
+    assert s3_service.writes == ['new']
+    assert sorted(saved) == ['new', 'same']
+    # Progress saw exactly the same increments
+    assert progress.counts == {name: value for name, value in result['counts'].items() if name != 'listing_complete'}
+    assert progress.fields == {'listing_complete': True}
+
+
+def test_render_and_validation_failures_count_as_failed():
+    s3_service = FakeS3Service(timestamps={'broken': 'explode', 'invalid': 'too long', 'ok': '00:00'})
+    
+    counts = run_pipeline(make_pipeline(s3_service), files('broken', 'invalid', 'ok'))['counts']
+    
+    assert counts['failed'] == 2
+    assert counts['written'] == 1
+    assert s3_service.writes == ['ok']
+
+
+def test_reader_exceptions_do_not_deadlock():
+    names = [f'video-{i}' for i in range(20)]
+    s3_service = FakeS3Service(timestamps={name: '00:00' for name in names}, fail_reads=names[::2])
+    
+    def should_skip(file_info):
+        if file_info['video_name'] == 'video-1':
+            raise RuntimeError('skip check failed')
+        return False
+    
+    counts = run_pipeline(make_pipeline(s3_service, should_skip=should_skip), files(*names))['counts']
+    
+    assert counts['failed'] == 11
+    assert counts['written'] == 9
+    assert counts['total_videos'] == 20
+    assert pipeline_threads() == []
+
+
+def test_listing_error_drains_every_stage():
+    names = [f'video-{i}' for i in range(10)]
+    s3_service = FakeS3Service(timestamps={name: '00:00' for name in names})
+    progress = FakeProgress()
+    pipeline = make_pipeline(s3_service, progress=progress)
+    
+    def listing():
+        yield from files(*names[:5])
+        raise ConnectionError('listing failed')
+    
+    result = run_pipeline(pipeline, listing())
+    
+    assert isinstance(result['error'], ConnectionError)
+    assert pipeline_threads() == []
+    assert pipeline._read_queue.empty() and pipeline._render_queue.empty() and pipeline._write_queue.empty()
+    # Everything listed before the error was still processed
+    assert sorted(s3_service.writes) == names[:5]
+    assert 'listing_complete' not in progress.fields
+
+
+def test_on_saved_errors_do_not_fail_the_video():
+    s3_service = FakeS3Service(timestamps={'a': '00:00', 'b': '00:01'})
+    
+    def on_saved(file_info):
+        raise RuntimeError('manifest unavailable')
+    
+    counts = run_pipeline(make_pipeline(s3_service, on_saved=on_saved), files('a', 'b'))['counts']
+    
+    assert counts['written'] == 2
+    assert counts['failed'] == 0
+
+
+@pytest.mark.parametrize('read_workers, write_workers', [(1, 1), (4, 1), (1, 4), (8, 8)])
+def test_pool_sizes(read_workers, write_workers):
+    names = [f'video-{i}' for i in range(25)]
+    s3_service = FakeS3Service(timestamps={name: name for name in names})
+    pipeline = make_pipeline(s3_service, read_workers=read_workers, write_workers=write_workers)
+    
+    counts = run_pipeline(pipeline, iter(files(*names)))['counts']
+    
+    assert counts['written'] == 25
+    assert sorted(s3_service.writes) == sorted(names)
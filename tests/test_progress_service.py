@@ -0,0 +1,169 @@
+"""Tests for the coalesced JobProgressWriter (SQLite JSON1 statements)"""
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from src.models.database import get_db_session
+from src.models.description_state import WorkflowDescriptionState
+from src.services import progress_service
+from src.services.progress_service import JobProgressWriter
+
+
+@pytest.fixture
+def job(db):
+    with get_db_session() as session:
+        session.add(WorkflowDescriptionState(job_id='job-1', novel_name='Novel', status='processing', progress_data={}, version=1))
+    return 'job-1'
+
+
+def stored(job_id):
+    """(progress_data, version) as stored"""
+    with get_db_session() as session:
+        state = session.query(WorkflowDescriptionState).filter_by(job_id=job_id).one()
+        return state.progress_data, state.version
+
+
+def writer(job_id, **kwargs):
+    options = {'flush_interval': 3600, 'flush_every': 1000}
+    return JobProgressWriter(job_id, **{**options, **kwargs})
+
+
+def test_updates_are_coalesced_until_flushed(job):
+    progress = writer(job)
+    progress.increment(total_videos=4)
+    for _ in range(3):
+        progress.increment(descriptions_generated=1, written=1)
+    
+    assert stored(job) == ({}, 1)
+    
+    progress.flush()
+    data, version = stored(job)
+    assert data == {'total_videos': 4, 'descriptions_generated': 3, 'written': 3, 'percent_complete': 75.0}
+    # One UPDATE per flush
+    assert version == 2
+    
+    progress.flush()
+    assert stored(job)[1] == 2
+
+
+def test_flushes_add_to_stored_counters(job):
+    # Two writers (e.g. a retried job's old and new attempt) never overwrite each other
+    first, second = writer(job), writer(job)
+    first.increment(total_videos=10, failed=1)
+    second.increment(descriptions_generated=2, skipped=2)
+    first.flush()
+    second.flush()
+    first.increment(descriptions_generated=1, written=1)
+    first.flush()
+    
+    data, version = stored(job)
+    assert data == {
+        'total_videos': 10,
+        'failed': 1,
+        'descriptions_generated': 3,
+        'skipped': 2,
+        'written': 1,
+        'percent_complete': 30.0
+    }
+    assert version == 4
+
+
+def test_flush_when_due(job):
+    progress = writer(job, flush_every=3)
+    progress.increment(total_videos=1)
+    progress.increment(descriptions_generated=1)
+    assert stored(job)[0] == {}
+    
+    progress.set(listing_complete=True)
+    assert stored(job)[0] == {
+        'total_videos': 1,
+        'descriptions_generated': 1,
+        'listing_complete': True,
+        'percent_complete': 100.0
+    }
+
+
+def test_is_due_without_auto_flush(job):
+    progress = writer(job, flush_every=2, auto_flush=False)
+    progress.increment(total_videos=1)
+    assert not progress.is_due()
+    progress.increment(total_videos=1)
+    assert progress.is_due()
+    assert stored(job)[0] == {}
+
+
+def test_percent_complete(job):
+    progress = writer(job)
+    progress.increment(descriptions_generated=1)
+    progress.flush()
+    # No total yet
+    assert stored(job)[0]['percent_complete'] == 0
+    
+    progress.increment(total_videos=3)
+    progress.flush()
+    assert stored(job)[0]['percent_complete'] == pytest.approx(33.33)
+    
+    # Never above 100, even if a retry counts a video twice
+    progress.increment(descriptions_generated=5)
+    progress.flush()
+    assert stored(job)[0]['percent_complete'] == 100
+    
+    # An explicit value wins over the recomputed one
+    progress.set(percent_complete=50)
+    progress.flush()
+    assert stored(job)[0]['percent_complete'] == 50
+
+
+def test_unknown_counter_is_rejected(job):
+    with pytest.raises(ValueError):
+        writer(job).increment(descriptions=1)
+
+
+def test_concurrent_increments_are_not_lost(job):
+    progress = writer(job, flush_every=7)
+    
+    def work():
+        for _ in range(250):
+            progress.increment(descriptions_generated=1, written=1)
+    
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    progress.close()
+    
+    data, _ = stored(job)
+    assert data['descriptions_generated'] == 2000
+    assert data['written'] == 2000
+
+
+def test_failed_flush_keeps_deltas_for_the_next_one(job, monkeypatch):
+    progress = writer(job)
+    progress.increment(total_videos=2, descriptions_generated=1)
+    progress.set(listing_complete=False)
+    
+    @contextmanager
+    def unavailable():
+        raise ConnectionError('database unavailable')
+        yield
+    
+    monkeypatch.setattr(progress_service, 'get_db_session', unavailable)
+    with pytest.raises(ConnectionError):
+        progress.flush()
+    # close() logs instead of raising
+    progress.close()
+    
+    # Updates made while the database was down merge with the kept ones
+    progress.increment(descriptions_generated=1)
+    progress.set(listing_complete=True)
+    monkeypatch.setattr(progress_service, 'get_db_session', get_db_session)
+    progress.flush()
+    
+    assert stored(job) == ({
+        'total_videos': 2,
+        'descriptions_generated': 2,
+        'listing_complete': True,
+        'percent_complete': 100.0
+    }, 2)
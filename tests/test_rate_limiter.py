@@ -0,0 +1,195 @@
+"""Tests for the RPM/TPM token buckets in src.services.rate_limiter"""
+import pytest
+
+from src.services import rate_limiter
+from src.services.rate_limiter import LLMRateLimiter, LocalBucketStore, RateLimitTimeout, _take
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances time() and monotonic()"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def time(self):
+        return self.now
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class BrokenStore:
+    """Bucket store whose database is unreachable"""
+    
+    def take(self, *args):
+        raise ConnectionError('database unavailable')
+    
+    def adjust(self, *args):
+        raise ConnectionError('database unavailable')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    monkeypatch.setattr(rate_limiter.random, 'uniform', lambda low, high: 0.0)
+    return fake
+
+
+def local_tokens(limiter, name='gpt'):
+    """Tokens left in a limiter's local bucket"""
+    return limiter._local._buckets[name][1]
+
+
+def test_take_admits_and_consumes():
+    assert _take(60, 1000, 0, rpm=60, tpm=1000, cost=400) == (59, 600, 0.0)
+
+
+def test_take_refills_over_time():
+    # Half a minute refills half of each bucket
+    requests, tokens, wait = _take(0, 0, 30, rpm=60, tpm=1000, cost=100)
+    assert wait == 0.0
+    assert requests == pytest.approx(29)
+    assert tokens == pytest.approx(400)
+
+
+def test_take_refill_is_capped_at_capacity():
+    requests, tokens, wait = _take(50, 900, 3600, rpm=60, tpm=1000, cost=100)
+    assert (requests, tokens, wait) == (59, 900, 0.0)
+
+
+def test_take_denies_with_wait_for_requests():
+    requests, tokens, wait = _take(0.5, 1000, 0, rpm=60, tpm=1000, cost=100)
+    # Half a request missing at one per second
+    assert wait == pytest.approx(0.5)
+    # A denied call takes nothing
+    assert (requests, tokens) == (0.5, 1000)
+
+
+def test_take_denies_with_wait_for_tokens():
+    requests, tokens, wait = _take(60, 100, 0, rpm=60, tpm=600, cost=400)
+    # 300 tokens missing at 10 tokens per second
+    assert wait == pytest.approx(30)
+    assert (requests, tokens) == (60, 100)
+
+
+def test_take_waits_for_the_slower_bucket():
+    _, _, wait = _take(0, 100, 0, rpm=60, tpm=600, cost=400)
+    assert wait == pytest.approx(30)
+
+
+def test_take_caps_oversized_calls_at_a_full_bucket():
+    # A call larger than the bucket is admitted once the bucket is full
+    assert _take(60, 500, 0, rpm=60, tpm=1000, cost=5000)[2] == pytest.approx(30)
+    assert _take(60, 1000, 0, rpm=60, tpm=1000, cost=5000) == (59, 0, 0.0)
+
+
+def test_take_zero_limit_disables_bucket():
+    assert _take(0, 1000, 0, rpm=0, tpm=1000, cost=100) == (0, 900, 0.0)
+    assert _take(5, 0, 0, rpm=60, tpm=0, cost=100) == (4, 0, 0.0)
+
+
+def test_local_store_refills_between_calls(clock):
+    store = LocalBucketStore()
+    assert store.take('gpt', 60, 0, 0) == 0.0
+    
+    for _ in range(59):
+        store.take('gpt', 60, 0, 0)
+    assert store.take('gpt', 60, 0, 0) == pytest.approx(1.0)
+    
+    clock.now += 1
+    assert store.take('gpt', 60, 0, 0) == 0.0
+
+
+def test_acquire_waits_for_refill(clock):
+    limiter = LLMRateLimiter(rpm=60, tpm=0, backend='local', max_wait=10)
+    for _ in range(60):
+        limiter.acquire('gpt', 100)
+    assert clock.slept == []
+    
+    limiter.acquire('gpt', 100)
+    assert sum(clock.slept) == pytest.approx(1.0)
+
+
+def test_acquire_times_out_instead_of_waiting_past_max_wait(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=600, backend='local', max_wait=10)
+    limiter.acquire('gpt', 600)
+    
+    # 600 tokens take a minute to come back
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire('gpt', 600)
+
+
+def test_disabled_limiter_admits_everything(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=0, backend='local')
+    reservation = limiter.acquire('gpt', 10 ** 9)
+    reservation.settle(5)
+    assert reservation.limiter is None
+    assert clock.slept == []
+
+
+def test_settle_refunds_unused_tokens(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, backend='local')
+    reservation = limiter.acquire('gpt', 400)
+    assert local_tokens(limiter) == 600
+    
+    reservation.settle(100)
+    assert local_tokens(limiter) == 900
+
+
+def test_settle_charges_extra_usage(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, backend='local')
+    reservation = limiter.acquire('gpt', 400)
+    
+    reservation.settle(700)
+    assert local_tokens(limiter) == 300
+
+
+def test_settle_never_refunds_above_capacity(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, backend='local')
+    reservation = limiter.acquire('gpt', 400)
+    clock.now += 60
+    limiter.acquire('gpt', 0)
+    
+    reservation.settle(0)
+    assert local_tokens(limiter) == 1000
+
+
+def test_settle_without_usage_keeps_the_estimate(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, backend='local')
+    limiter.acquire('gpt', 400).settle(None)
+    assert local_tokens(limiter) == 600
+
+
+def test_falls_back_to_local_buckets_when_database_fails(clock):
+    limiter = LLMRateLimiter(rpm=60, tpm=1000, backend='postgres')
+    limiter._store = BrokenStore()
+    
+    reservation = limiter.acquire('gpt', 400)
+    assert local_tokens(limiter) == 600
+    
+    # The refund still reaches the local buckets; the database error is not raised
+    reservation.settle(100)
+    assert local_tokens(limiter) == 900
+
+
+def test_local_fallback_still_limits(clock):
+    limiter = LLMRateLimiter(rpm=0, tpm=1000, backend='postgres', max_wait=1)
+    limiter._store = BrokenStore()
+    limiter.acquire('gpt', 1000)
+    
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire('gpt', 1000)
+
+
+def test_local_backend_errors_are_raised(clock):
+    limiter = LLMRateLimiter(rpm=60, tpm=1000, backend='local')
+    limiter._store = limiter._local = BrokenStore()
+    
+    with pytest.raises(ConnectionError):
+        limiter.acquire('gpt', 100)
@@ -0,0 +1,269 @@
+"""Tests for the retry policy and circuit breaker in src.services.resilience"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import openai
+import pytest
+from botocore.exceptions import ClientError
+
+from src.services import resilience
+from src.services.resilience import THROTTLED, UNAVAILABLE, CircuitOpenError, Dependency, classify_error, retry_after
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic() and time()"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def time(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience, 'time', fake)
+    return fake
+
+
+def openai_error(status, headers=None):
+    """OpenAI SDK error for an HTTP status"""
+    request = httpx.Request('POST', 'https://api.openai.com/v1/chat/completions')
+    response = httpx.Response(status, headers=headers, request=request)
+    error_class = {429: openai.RateLimitError, 400: openai.BadRequestError}.get(status, openai.InternalServerError)
+    return error_class('error', response=response, body=None)
+
+
+def s3_error(code, status, headers=None):
+    """botocore ClientError as raised by S3"""
+    return ClientError({
+        'Error': {'Code': code, 'Message': code},
+        'ResponseMetadata': {'HTTPStatusCode': status, 'HTTPHeaders': headers or {}}
+    }, 'GetObject')
+
+
+def failing(error):
+    """Callable raising `error`, counting its calls"""
+    def func():
+        func.calls += 1
+        raise error
+    func.calls = 0
+    return func
+
+
+def make_dependency(**kwargs):
+    options = {'max_attempts': 1, 'base_delay': 0, 'max_delay': 30, 'failure_threshold': 3, 'reset_timeout': 60}
+    return Dependency('test', **{**options, **kwargs})
+
+
+def test_classify_error():
+    assert classify_error(openai_error(429)) == THROTTLED
+    assert classify_error(openai_error(503)) == UNAVAILABLE
+    assert classify_error(openai_error(400)) is None
+    assert classify_error(s3_error('SlowDown', 503)) == THROTTLED
+    assert classify_error(s3_error('InternalError', 500)) == UNAVAILABLE
+    assert classify_error(s3_error('NoSuchKey', 404)) is None
+    assert classify_error(httpx.ConnectError('refused')) == UNAVAILABLE
+    assert classify_error(ValueError('bad input')) is None
+
+
+def test_retry_after_seconds():
+    assert retry_after(openai_error(429, {'retry-after': '7'})) == 7.0
+    assert retry_after(s3_error('SlowDown', 503, {'retry-after': '2'})) == 2.0
+
+
+def test_retry_after_milliseconds():
+    assert retry_after(openai_error(429, {'retry-after-ms': '250'})) == pytest.approx(0.25)
+    assert retry_after(openai_error(429, {'x-ms-retry-after-ms': '1500'})) == pytest.approx(1.5)
+    # The millisecond header is more precise and wins
+    assert retry_after(openai_error(429, {'retry-after-ms': '250', 'retry-after': '1'})) == pytest.approx(0.25)
+
+
+def test_retry_after_http_date():
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert retry_after(openai_error(429, {'retry-after': when})) == pytest.approx(30, abs=2)
+    
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert retry_after(openai_error(429, {'retry-after': past})) == 0.0
+
+
+def test_retry_after_missing_or_invalid():
+    assert retry_after(openai_error(429)) is None
+    assert retry_after(openai_error(429, {'retry-after': 'soon'})) is None
+    assert retry_after(ValueError('not an HTTP error')) is None
+
+
+def test_retries_transient_errors_then_succeeds(clock):
+    dependency = make_dependency(max_attempts=4, base_delay=1)
+    outcomes = [openai_error(503), openai_error(503), 'ok']
+    
+    def func():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    assert dependency.call(func) == 'ok'
+    snapshot = dependency.snapshot()
+    assert snapshot['retries'] == 2
+    assert snapshot['consecutive_failures'] == 0
+    assert snapshot['state'] == 'closed'
+    # Full jitter stays within base * 2^(attempt - 1)
+    assert 0 <= clock.slept[0] <= 1 and 0 <= clock.slept[1] <= 2
+
+
+def test_non_transient_error_is_not_retried(clock):
+    dependency = make_dependency(max_attempts=4)
+    func = failing(openai_error(400))
+    
+    with pytest.raises(openai.BadRequestError):
+        dependency.call(func)
+    assert func.calls == 1
+    assert dependency.snapshot()['consecutive_failures'] == 0
+
+
+def test_opens_after_failure_threshold(clock):
+    dependency = make_dependency(failure_threshold=3)
+    func = failing(openai_error(503))
+    
+    for _ in range(2):
+        with pytest.raises(openai.InternalServerError):
+            dependency.call(func)
+        assert dependency.snapshot()['state'] == 'closed'
+    
+    with pytest.raises(openai.InternalServerError):
+        dependency.call(func)
+    assert dependency.snapshot()['state'] == 'open'
+    assert dependency.snapshot()['circuit_opened'] == 1
+    
+    # Open: rejected without calling the backend
+    with pytest.raises(CircuitOpenError) as raised:
+        dependency.call(func)
+    assert func.calls == 3
+    assert raised.value.retry_in == pytest.approx(60)
+    assert dependency.snapshot()['rejected'] == 1
+
+
+def test_half_open_admits_one_trial_and_closes_on_success(clock):
+    dependency = make_dependency(failure_threshold=1, reset_timeout=60)
+    with pytest.raises(openai.InternalServerError):
+        dependency.call(failing(openai_error(503)))
+    
+    clock.now += 59
+    assert dependency.snapshot()['state'] == 'open'
+    clock.now += 1
+    assert dependency.snapshot()['state'] == 'half_open'
+    
+    def trial():
+        # A second caller while the trial runs is rejected
+        with pytest.raises(CircuitOpenError):
+            dependency.call(lambda: 'concurrent')
+        return 'trial'
+    
+    assert dependency.call(trial) == 'trial'
+    assert dependency.snapshot()['state'] == 'closed'
+    assert dependency.call(lambda: 'after') == 'after'
+
+
+def test_half_open_trial_failure_reopens(clock):
+    dependency = make_dependency(failure_threshold=1, reset_timeout=60)
+    func = failing(openai_error(503))
+    with pytest.raises(openai.InternalServerError):
+        dependency.call(func)
+    
+    clock.now += 60
+    with pytest.raises(openai.InternalServerError):
+        dependency.call(func)
+    
+    snapshot = dependency.snapshot()
+    assert snapshot['state'] == 'open'
+    assert snapshot['circuit_opened'] == 2
+    with pytest.raises(CircuitOpenError):
+        dependency.call(func)
+
+
+def test_client_error_closes_half_open_circuit(clock):
+    dependency = make_dependency(failure_threshold=1, reset_timeout=60)
+    with pytest.raises(openai.InternalServerError):
+        dependency.call(failing(openai_error(503)))
+    
+    clock.now += 60
+    # The backend answered (400), so it is up again
+    with pytest.raises(openai.BadRequestError):
+        dependency.call(failing(openai_error(400)))
+    
+    assert dependency.snapshot()['state'] == 'closed'
+    assert dependency.call(lambda: 'ok') == 'ok'
+
+
+def test_throttling_never_opens_circuit(clock):
+    dependency = make_dependency(failure_threshold=1)
+    func = failing(openai_error(429))
+    
+    for _ in range(5):
+        with pytest.raises(openai.RateLimitError):
+            dependency.call(func)
+    
+    snapshot = dependency.snapshot()
+    assert snapshot['state'] == 'closed'
+    assert snapshot['throttled'] == 5
+    assert snapshot['circuit_opened'] == 0
+    assert snapshot['consecutive_failures'] == 0
+
+
+def test_retry_after_pauses_every_caller(clock):
+    dependency = make_dependency(max_attempts=1, max_delay=10)
+    with pytest.raises(openai.RateLimitError):
+        dependency.call(failing(openai_error(429, {'retry-after': '5'})))
+    assert dependency.snapshot()['paused_for'] == pytest.approx(5)
+    
+    # The next caller waits out the pause before its first attempt
+    assert dependency.call(lambda: 'ok') == 'ok'
+    assert clock.slept == [pytest.approx(5)]
+    
+    # Retry-After is capped at max_delay
+    with pytest.raises(openai.RateLimitError):
+        dependency.call(failing(openai_error(429, {'retry-after': '3600'})))
+    assert dependency.snapshot()['paused_for'] == pytest.approx(10)
+
+
+def test_retry_after_replaces_backoff(clock):
+    dependency = make_dependency(max_attempts=2, base_delay=100)
+    outcomes = [openai_error(429, {'retry-after-ms': '1500'}), 'ok']
+    
+    def func():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    
+    assert dependency.call(func) == 'ok'
+    # 1.5s retry delay, then the (already elapsed) shared pause
+    assert clock.slept == [pytest.approx(1.5)]
+
+
+def test_acall_uses_the_same_breaker(clock):
+    dependency = make_dependency(failure_threshold=1)
+    
+    async def fail():
+        raise openai_error(503)
+    
+    async def run():
+        with pytest.raises(openai.InternalServerError):
+            await dependency.acall(fail)
+        with pytest.raises(CircuitOpenError):
+            await dependency.acall(fail)
+    
+    asyncio.run(run())
+    assert dependency.snapshot()['state'] == 'open'
@@ -0,0 +1,97 @@
+"""Tests for compiled description templates"""
+import pytest
+
+from src.services.template_service import DEFAULT_TEMPLATE, MAX_DESCRIPTION_LENGTH, TemplateService
+
+SECTIONS = {
+    'playlist_url': 'https://www.youtube.com/playlist?list=PL123',
+    'novel_name': 'The {Curly} Novel',
+    'about': 'A story about 100% effort.\nSecond line.',
+    'what_to_expect': 'Magic, "quotes" and {braces}.',
+    'subscribe': 'Subscribe! 🔔',
+    'seo_tags': '#novel #audiobook'
+}
+
+
+def legacy_description(playlist_url, novel_name, about, what_to_expect, subscribe, timestamps, seo_tags):
+    """The f-string TemplateService.build_description() used before templates were compiled"""
+    return f"""Full Playlist: {playlist_url}
+
+📚 About "{novel_name}"
+
+{about}
+
+⭐ What to Expect
+
+{what_to_expect}
+
+🔔 Subscribe for More
+
+{subscribe}
+
+⏰ Timestamps:
+
+{timestamps}
+
+Tags:
+{seo_tags}"""
+
+
+@pytest.mark.parametrize('timestamps', [
+    '00:00 Chapter 1\n12:34 Chapter 2',
+    '',
+    '00:00 {not a placeholder} 100%',
+    '\n'.join(f'{i:02d}:00 Part {i}' for i in range(60))
+])
+def test_default_template_matches_legacy_output(timestamps):
+    compiled = TemplateService.compile(DEFAULT_TEMPLATE, **SECTIONS)
+    expected = legacy_description(timestamps=timestamps, **SECTIONS)
+    
+    assert compiled.render(timestamps) == expected
+    assert TemplateService.build_description(timestamps=timestamps, **SECTIONS) == expected
+
+
+def test_validation_matches_legacy_at_the_length_limit():
+    compiled = TemplateService.compile(DEFAULT_TEMPLATE, **SECTIONS)
+    room = MAX_DESCRIPTION_LENGTH - len(compiled.render(''))
+    assert compiled.max_timestamps_length == room
+    
+    for length in (0, room - 1, room, room + 1, room + 500):
+        description = compiled.render('x' * length)
+        assert compiled.validate(description) == TemplateService.validate_description(description)
+        assert compiled.validate(description)[0] == (len(description) <= MAX_DESCRIPTION_LENGTH)
+
+
+def test_custom_template_with_format_specs():
+    compiled = TemplateService.compile(
+        '{novel_name!r:.10}\n{{literal}}\n{timestamps}\n{seo_tags:>20}',
+        **SECTIONS
+    )
+    assert compiled.render('00:00 Start') == "'The {Curl\n{literal}\n00:00 Start\n   #novel #audiobook"
+
+
+@pytest.mark.parametrize('template_text, error', [
+    ('{about}', 'exactly once'),
+    ('{timestamps}\n{timestamps}', 'exactly once'),
+    ('{timestamps}\n{views}', 'Unknown template placeholder: {views}'),
+    ('{timestamps', 'Invalid template syntax'),
+    ('{timestamps:>80}', 'format spec'),
+    ('{timestamps!r}', 'format spec'),
+    ('{timestamps:.100}', 'format spec')
+])
+def test_check_template_rejects(template_text, error):
+    assert error in TemplateService.check_template(template_text)
+    with pytest.raises(ValueError):
+        TemplateService.compile(template_text, **SECTIONS)
+
+
+def test_check_template_accepts_the_default():
+    assert TemplateService.check_template(DEFAULT_TEMPLATE) is None
+
+
+def test_compile_rejects_templates_without_room_for_timestamps():
+    with pytest.raises(ValueError, match='character limit'):
+        TemplateService.compile('{about}{timestamps}', **{**SECTIONS, 'about': 'x' * (MAX_DESCRIPTION_LENGTH + 1)})
+    
+    with pytest.raises(ValueError, match='empty'):
+        TemplateService.compile('  {timestamps}\n', **SECTIONS)